@@ -1,21 +1,21 @@
 import os
 import sys
 import random
-import json
 from datetime import datetime, timedelta
 
-# Añadir el directorio src al path para poder importar los módulos
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+# Añadir el directorio raíz al path para poder importar el paquete src
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from database import Database
-from models.player import Player
-from models.course import Course
-from models.scorecard import Scorecard
+from src.controllers.scorecard_controller import ScorecardController
+from src.database import Database
+from src.utils.helpers_simple import calculate_handicap_strokes, calculate_playing_handicap, calculate_points
+from src.utils.row_decoder import decode_hole_list
 
 def add_test_data():
     """Añade datos de prueba a la base de datos."""
     # Usar la misma base de datos que la aplicación principal
     db = Database('data/golf.db')
+    scorecard_controller = ScorecardController(db)
     
     # Crear jugadores
     players = [
@@ -97,18 +97,8 @@ def add_test_data():
             course_data = db.get_course(course_id)
             
             # Obtener pars y handicaps como listas
-            try:
-                # Intentar parsear como JSON
-                pars = json.loads(course_data['hole_pars']) if isinstance(course_data['hole_pars'], str) else course_data['hole_pars']
-                handicaps = json.loads(course_data['hole_handicaps']) if isinstance(course_data['hole_handicaps'], str) else course_data['hole_handicaps']
-            except (json.JSONDecodeError, TypeError):
-                # Si falla, intentar el método antiguo
-                pars = [int(x) for x in course_data['hole_pars'].split(',') if x.strip()]
-                handicaps = [int(x) for x in course_data['hole_handicaps'].split(',') if x.strip()]
-            
-            # Asegurarse de que todos los valores son enteros
-            pars = [int(x) if isinstance(x, str) else x for x in pars[:18]]
-            handicaps = [int(x) if isinstance(x, str) else x for x in handicaps[:18]]
+            pars = decode_hole_list(course_data['hole_pars'], 'hole_pars')[:18]
+            handicaps = decode_hole_list(course_data['hole_handicaps'], 'hole_handicaps')[:18]
             
             # Si no tenemos suficientes valores, usar valores predeterminados
             if len(pars) < 18:
@@ -123,29 +113,20 @@ def add_test_data():
             handicap_coefficients = [90, 95, 100]
             handicap_coefficient_percent = random.choice(handicap_coefficients)
             
-            # Calcular hándicap de juego
-            base_handicap = round((player_data['handicap'] * course_data['slope']) / 113, 1)
-            playing_handicap = round(base_handicap * (handicap_coefficient_percent / 100))
+            # Calcular hándicap de juego y golpes recibidos en cada hoyo
+            playing_handicap = calculate_playing_handicap(
+                player_data['handicap'], course_data['slope'], course_data['course_rating'], course_data['par_total']
+            )
+            handicap_strokes = calculate_handicap_strokes(
+                playing_handicap * (handicap_coefficient_percent / 100),
+                course_data['slope'], course_data['course_rating'], handicaps
+            )
             
             # Generar golpes aleatorios para cada hoyo
             strokes = []
             points = []
-            stableford = []
             
             for hole_index, par in enumerate(pars):
-                # Calcular hándicap extra para este hoyo
-                handicap_position = handicaps[hole_index]
-                # Asegurarse de que handicap_position es un entero
-                if isinstance(handicap_position, str):
-                    handicap_position = int(handicap_position)
-                
-                extra_strokes = 0
-                
-                if handicap_position <= playing_handicap % 18:
-                    extra_strokes = playing_handicap // 18 + 1
-                else:
-                    extra_strokes = playing_handicap // 18
-                
                 # Generar golpes aleatorios basados en el par y el hándicap
                 # Jugadores mejores (hándicap bajo) tienen más probabilidad de hacer buenos golpes
                 skill_factor = 1.0 - (player_data['handicap'] / 36.0)  # Factor de habilidad entre 0.33 y 0.86
@@ -164,35 +145,22 @@ def add_test_data():
                 
                 strokes.append(stroke)
                 
-                # Calcular puntos
-                # Para simplificar, usamos una fórmula básica: 2 puntos para par, +1 por debajo, -1 por encima
-                point = 2 + (par - stroke)
-                points.append(max(0, point))
-                
-                # Calcular Stableford
-                # Fórmula: 2 puntos para par, +1 por cada golpe bajo par, 1 para bogey, 0 para doble bogey o peor
-                stableford_point = 0
-                if stroke <= par - 2:  # Eagle o mejor
-                    stableford_point = 4
-                elif stroke == par - 1:  # Birdie
-                    stableford_point = 3
-                elif stroke == par:  # Par
-                    stableford_point = 2
-                elif stroke == par + 1:  # Bogey
-                    stableford_point = 1
-                
-                stableford.append(stableford_point)
+                # Puntos stableford con los golpes recibidos en el hoyo
+                points.append(calculate_points(stroke, par, handicap_strokes[hole_index]))
             
-            # Añadir la tarjeta a la base de datos
-            scorecard_id = db.add_scorecard(
-                player_id, 
-                course_id, 
-                date, 
-                strokes,  
-                points,  
-                stableford,  
-                handicap_coefficient_percent  # Almacenar el coeficiente (90, 95, 100) en lugar del hándicap calculado
+            # Añadir la tarjeta (calcula el diferencial y actualiza el hándicap del jugador)
+            success, scorecard_id = scorecard_controller.add_scorecard(
+                player_id,
+                course_id,
+                date,
+                strokes,
+                points,
+                handicap_coefficient_percent,
+                playing_handicap
             )
+            if not success:
+                print(f"Error al añadir tarjeta: {scorecard_id}")
+                continue
             
             print(f"Añadida tarjeta para {player_data['first_name']} {player_data['surname']} en {course_data['name']} ({date}) - ID: {scorecard_id}")
 
@@ -0,0 +1,81 @@
+"""
+Benchmark de las estadísticas por campo y por hoyo.
+
+Crea una base de datos temporal con un único campo con muchas rondas y mide
+ScorecardController.get_course_stats, comprobando las medias por hoyo y la
+distribución de resultados contra un cálculo en Python.
+
+Uso:
+    python benchmarks/bench_course_stats.py [--rounds N] [--repeat R] [--seed S]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_player_stats import populate
+from src.controllers.course_controller import CourseController
+from src.controllers.scorecard_controller import ScorecardController
+from src.database import Database
+
+
+def python_hole_stats(controller, course):
+    """Calcula la media y la distribución de cada hoyo recorriendo las tarjetas."""
+    scorecards = controller.search_scorecards({'course_id': course.id})
+    sums, counts = [0] * 18, [0] * 18
+    distribution = [[0] * 6 for _ in range(18)]
+    for sc in scorecards:
+        for hole, strokes in enumerate(sc.strokes[:18]):
+            if strokes <= 0:
+                continue
+            sums[hole] += strokes
+            counts[hole] += 1
+            diff = min(max(strokes - course.hole_pars[hole], -2), 3)
+            distribution[hole][diff + 2] += 1
+    averages = [s / c if c else None for s, c in zip(sums, counts)]
+    return len(scorecards), averages, distribution
+
+
+def _timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return result, (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de get_course_stats")
+    parser.add_argument('--rounds', type=int, default=100_000, help="Rondas en el campo")
+    parser.add_argument('--repeat', type=int, default=3, help="Repeticiones de cada medida")
+    parser.add_argument('--seed', type=int, default=42, help="Semilla aleatoria")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'bench.db'))
+        populate(db, 0, args.rounds, args.seed, courses=1)
+        controller = ScorecardController(db)
+        course = CourseController(db).get_course(1)
+
+        stats, sql_ms = _timed(lambda: controller.get_course_stats(course.id), args.repeat)
+        (rounds, averages, distribution), python_ms = _timed(
+            lambda: python_hole_stats(controller, course), 1)
+
+        print(f"{stats['total_rounds']} rondas en {course.name}")
+        print(f"{'get_course_stats':<24} {sql_ms:9.2f} ms")
+        print(f"{'python (referencia)':<24} {python_ms:9.2f} ms")
+
+        if stats['total_rounds'] != rounds:
+            raise AssertionError("El número de rondas no coincide con la referencia")
+        for hole, expected_avg, expected_dist in zip(stats['holes'], averages, distribution):
+            if abs(hole['avg_strokes'] - expected_avg) > 1e-9:
+                raise AssertionError(f"Media del hoyo {hole['hole']} no coincide con la referencia")
+            if list(hole['distribution'].values()) != expected_dist:
+                raise AssertionError(f"Distribución del hoyo {hole['hole']} no coincide con la referencia")
+        db.connection.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""
+Benchmark de las consultas "a fecha" sobre el historial de hándicap.
+
+Crea una base de datos temporal con miles de jugadores y décadas de revisiones
+semanales de su índice, y mide la consulta del índice vigente en una fecha y
+el cruce de N rondas con el índice vigente al jugarlas. Los resultados se
+comprueban contra una búsqueda binaria en Python.
+
+Uso:
+    python benchmarks/bench_handicap_history.py [--players N] [--years N] [--rounds N] [--repeat R] [--seed S]
+"""
+import argparse
+import bisect
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import Database
+
+
+def populate(db, players, years, rounds, seed):
+    """
+    Inserta jugadores con revisiones semanales del índice y rondas aleatorias.
+
+    Args:
+        db (Database): Base de datos vacía
+        players (int): Número de jugadores
+        years (int): Años de revisiones semanales por jugador
+        rounds (int): Número de rondas
+        seed (int): Semilla aleatoria
+
+    Returns:
+        dict: Revisiones por jugador {player_id: ([fechas], [índices])}
+    """
+    rng = random.Random(seed)
+    first_day = date(2000, 1, 1)
+    weeks = years * 52
+
+    with db.connection:
+        db.connection.executemany(
+            'INSERT INTO players (first_name, surname, handicap) VALUES (?, ?, ?)',
+            [(f'Jugador{i}', 'Benchmark', 0.0) for i in range(players)]
+        )
+        course_id = db.connection.execute('''
+            INSERT INTO courses (name, location, slope, course_rating, par_total, hole_pars, hole_handicaps)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', ('Campo', 'Benchmark', 113, 72.0, 72,
+              json.dumps([4] * 18), json.dumps(list(range(1, 19))))).lastrowid
+
+    history = {}
+    with db.connection:
+        for player_id in range(1, players + 1):
+            index = rng.uniform(0, 36)
+            dates, indexes = [], []
+            for week in range(weeks):
+                index = min(54.0, max(-5.0, index + rng.uniform(-0.5, 0.5)))
+                dates.append((first_day + timedelta(weeks=week)).isoformat())
+                indexes.append(round(index, 1))
+            db.connection.executemany(
+                'INSERT INTO handicap_history (player_id, effective_date, handicap_index) VALUES (?, ?, ?)',
+                [(player_id, d, i) for d, i in zip(dates, indexes)]
+            )
+            history[player_id] = (dates, indexes)
+
+    strokes = json.dumps([4] * 18)
+    points = json.dumps([2] * 18)
+    cards = []
+    for _ in range(rounds):
+        day = (first_day + timedelta(days=rng.randint(-30, weeks * 7))).isoformat()
+        cards.append((rng.randint(1, players), course_id, day, strokes, points, 95, 0.0, 72, 36))
+    with db.connection:
+        db.connection.executemany('''
+            INSERT INTO scorecards (player_id, course_id, date, strokes, points,
+                                    handicap_coefficient, playing_handicap,
+                                    total_strokes, total_points)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', cards)
+    return history
+
+
+def reference_as_of(history, player_id, day):
+    """Índice vigente en una fecha mediante búsqueda binaria en memoria."""
+    dates, indexes = history[player_id]
+    position = bisect.bisect_right(dates, day)
+    return indexes[position - 1] if position else None
+
+
+def _timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return result, (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del historial de hándicap")
+    parser.add_argument('--players', type=int, default=1000, help="Número de jugadores")
+    parser.add_argument('--years', type=int, default=20, help="Años de revisiones semanales")
+    parser.add_argument('--rounds', type=int, default=100000, help="Rondas para el cruce a fecha")
+    parser.add_argument('--repeat', type=int, default=5, help="Repeticiones de cada medida")
+    parser.add_argument('--seed', type=int, default=42, help="Semilla aleatoria")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'bench.db'))
+        start = time.perf_counter()
+        history = populate(db, args.players, args.years, args.rounds, args.seed)
+        revisions = sum(len(dates) for dates, _ in history.values())
+        print(f"{args.players} jugadores, {revisions} revisiones, {args.rounds} rondas "
+              f"(generado en {time.perf_counter() - start:.1f} s)")
+
+        rng = random.Random(args.seed)
+        lookups = [(rng.randint(1, args.players),
+                    (date(1999, 12, 1) + timedelta(days=rng.randint(0, args.years * 365))).isoformat())
+                   for _ in range(1000)]
+
+        results, lookup_ms = _timed(
+            lambda: [db.get_handicap_as_of(player_id, day) for player_id, day in lookups], args.repeat
+        )
+        for (player_id, day), value in zip(lookups, results):
+            expected = reference_as_of(history, player_id, day)
+            if value != expected:
+                raise AssertionError(f"Jugador {player_id} a {day}: {value} != referencia {expected}")
+
+        rows, join_ms = _timed(lambda: db.get_rounds_with_handicap(), args.repeat)
+        for row in rows:
+            expected = reference_as_of(history, row['player_id'], row['date'])
+            if row['handicap_index'] != expected:
+                raise AssertionError(f"Ronda {row['id']}: {row['handicap_index']} != referencia {expected}")
+
+        print(f"{'get_handicap_as_of':<28} {lookup_ms / len(lookups) * 1000:9.1f} µs/consulta")
+        print(f"{'get_rounds_with_handicap':<28} {join_ms:9.1f} ms ({len(rows)} rondas, "
+              f"{join_ms / max(1, len(rows)) * 1000:.1f} µs/ronda)")
+        db.connection.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""
+Benchmark de las estadísticas por jugador calculadas en SQL.
+
+Crea una base de datos temporal con un jugador con muchas rondas (y otros
+jugadores de relleno) y compara ScorecardController.get_player_stats con el
+cálculo anterior: cargar todas las tarjetas del jugador y recorrerlas en Python.
+
+Uso:
+    python benchmarks/bench_player_stats.py [--rounds N] [--others N] [--repeat R] [--seed S]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.controllers.course_controller import CourseController
+from src.controllers.scorecard_controller import ScorecardController
+from src.database import Database
+
+
+def populate(db, rounds, others, seed, courses=10):
+    """
+    Inserta campos, jugadores y tarjetas aleatorias.
+
+    Args:
+        db (Database): Base de datos vacía
+        rounds (int): Rondas del jugador 1
+        others (int): Rondas repartidas entre el resto de jugadores
+        seed (int): Semilla aleatoria
+        courses (int): Número de campos
+    """
+    rng = random.Random(seed)
+    with db.connection:
+        db.connection.executemany(
+            'INSERT INTO players (first_name, surname, handicap) VALUES (?, ?, ?)',
+            [(f'Jugador{i}', 'Benchmark', round(rng.uniform(0, 36), 1)) for i in range(20)]
+        )
+
+    course_list = []
+    for i in range(courses):
+        pars = [3, 4, 5] * 6
+        rng.shuffle(pars)
+        handicaps = list(range(1, 19))
+        rng.shuffle(handicaps)
+        course_id = db.add_course(f'Campo{i}', 'Benchmark', rng.randint(100, 150),
+                                  round(rng.uniform(68, 74), 1), sum(pars),
+                                  pars, handicaps)
+        course_list.append((course_id, pars))
+
+    first_day = date(2015, 1, 1)
+    cards = []
+    for i in range(rounds + others):
+        player_id = 1 if i < rounds else rng.randint(2, 20)
+        course_id, pars = rng.choice(course_list)
+        strokes = [par + rng.randint(-1, 3) for par in pars]
+        points = [max(0, 2 - (s - p)) for s, p in zip(strokes, pars)]
+        day = (first_day + timedelta(days=rng.randint(0, 3650))).isoformat()
+        cards.append((player_id, course_id, day, json.dumps(strokes), json.dumps(points),
+                      95, round(rng.uniform(0, 30), 1), sum(strokes), sum(points)))
+
+    with db.connection:
+        db.connection.executemany('''
+            INSERT INTO scorecards (player_id, course_id, date, strokes, points,
+                                    handicap_coefficient, playing_handicap,
+                                    total_strokes, total_points)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', cards)
+
+
+def python_stats(controller, course_controller, player_id):
+    """Calcula las estadísticas como lo hacía la vista: en Python sobre las tarjetas."""
+    scorecards = controller.search_scorecards({'player_id': player_id})
+    courses = course_controller.get_courses_by_ids({sc.course_id for sc in scorecards})
+    rounds = []
+    for sc in scorecards:
+        total_strokes = sum(sc.strokes)
+        rounds.append((sc.id, total_strokes, sum(sc.points),
+                       total_strokes - courses[sc.course_id].par_total))
+    return {
+        'total_rounds': len(rounds),
+        'best_gross': min(r[1] for r in rounds),
+        'worst_gross': max(r[1] for r in rounds),
+        'best_to_par': min(r[3] for r in rounds),
+        'worst_to_par': max(r[3] for r in rounds),
+        'best_points': max(r[2] for r in rounds),
+        'worst_points': min(r[2] for r in rounds),
+        'avg_strokes': sum(r[1] for r in rounds) / len(rounds)
+    }
+
+
+def _timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return result, (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de get_player_stats")
+    parser.add_argument('--rounds', type=int, default=5000, help="Rondas del jugador medido")
+    parser.add_argument('--others', type=int, default=50000, help="Rondas del resto de jugadores")
+    parser.add_argument('--repeat', type=int, default=20, help="Repeticiones de cada medida")
+    parser.add_argument('--seed', type=int, default=42, help="Semilla aleatoria")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'bench.db'))
+        populate(db, args.rounds, args.others, args.seed)
+        controller = ScorecardController(db)
+        course_controller = CourseController(db)
+
+        stats, sql_ms = _timed(lambda: controller.get_player_stats(1), args.repeat)
+        expected, python_ms = _timed(lambda: python_stats(controller, course_controller, 1),
+                                     max(1, args.repeat // 10))
+
+        print(f"{stats['total_rounds']} rondas del jugador, {args.others} de otros jugadores")
+        print(f"{'get_player_stats (SQL)':<24} {sql_ms:9.2f} ms")
+        print(f"{'python (referencia)':<24} {python_ms:9.2f} ms")
+
+        actual = {
+            'total_rounds': stats['total_rounds'],
+            'best_gross': stats['best_gross']['total_strokes'],
+            'worst_gross': stats['worst_gross']['total_strokes'],
+            'best_to_par': stats['best_to_par']['to_par'],
+            'worst_to_par': stats['worst_to_par']['to_par'],
+            'best_points': stats['best_points']['total_points'],
+            'worst_points': stats['worst_points']['total_points'],
+            'avg_strokes': stats['avg_strokes']
+        }
+        for key, value in expected.items():
+            if abs(actual[key] - value) > 1e-9:
+                raise AssertionError(f"{key}: SQL {actual[key]} != referencia {value}")
+        db.connection.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark del decodificador de filas (src/utils/row_decoder.py).
+
+Mide el coste por fila de decodificar los datos por hoyo en sus distintos
+formatos y el de construir una Scorecard completa desde una fila con join.
+La corrección del decodificador (incluida la prueba con entradas aleatorias)
+se comprueba en tests/test_row_decoder.py.
+
+Uso:
+    python benchmarks/bench_row_decoder.py [--rows N] [--seed S]
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.scorecard import Scorecard
+from src.utils.row_decoder import decode_hole_list
+
+
+def _random_strokes(rng):
+    """Genera 18 golpes aleatorios."""
+    return [rng.randint(1, 12) for _ in range(18)]
+
+
+def _time_per_row(func, items):
+    """Devuelve el tiempo medio por elemento en microsegundos."""
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    return (time.perf_counter() - start) / len(items) * 1e6
+
+
+def _joined_rows(rng, rows):
+    """Crea filas sqlite3.Row equivalentes a las de get_scorecard_with_details."""
+    connection = sqlite3.connect(':memory:')
+    connection.row_factory = sqlite3.Row
+    connection.execute('''
+        CREATE TABLE t (id INTEGER, player_id INTEGER, course_id INTEGER, date TEXT,
+                        strokes TEXT, points TEXT, handicap_coefficient INTEGER,
+                        playing_handicap REAL, first_name TEXT, surname TEXT, name TEXT,
+                        location TEXT, slope INTEGER, course_rating REAL, par_total INTEGER,
+                        hole_pars TEXT, hole_handicaps TEXT)
+    ''')
+    pars = json.dumps([4] * 18)
+    handicaps = json.dumps(list(range(1, 19)))
+    connection.executemany(
+        'INSERT INTO t VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        [(i, 1, 1, '2024-01-01', json.dumps(_random_strokes(rng)),
+          json.dumps([rng.randint(0, 4) for _ in range(18)]), 95, 12.0,
+          'Juan', 'García', 'Campo', 'Madrid', 125, 71.5, 72, pars, handicaps)
+         for i in range(rows)]
+    )
+    return connection.execute('SELECT * FROM t').fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del decodificador de filas")
+    parser.add_argument('--rows', type=int, default=20000, help="Filas por medición")
+    parser.add_argument('--seed', type=int, default=42, help="Semilla aleatoria")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+
+    values = [_random_strokes(rng) for _ in range(args.rows)]
+    json_rows = [json.dumps(v) for v in values]
+    legacy_rows = [','.join(map(str, v)) + ',' for v in values]
+    joined_rows = _joined_rows(rng, args.rows)
+
+    results = {
+        'json': _time_per_row(decode_hole_list, json_rows),
+        'json.loads sin validar': _time_per_row(json.loads, json_rows),
+        'formato antiguo': _time_per_row(decode_hole_list, legacy_rows),
+        'Scorecard.from_joined_row': _time_per_row(Scorecard.from_joined_row, joined_rows),
+    }
+
+    for name, micros in results.items():
+        print(f"{name:<28} {micros:8.2f} µs/fila")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark de las estadísticas vectorizadas de ScorecardBatch.
+
+Compara el cálculo de totales, resultado respecto al par, medias por hoyo y
+distribución de resultados sobre un lote sintético con el bucle equivalente
+en Python sobre listas de golpes.
+
+Uso:
+    python benchmarks/bench_scorecard_batch.py [--rounds N] [--courses C] [--seed S]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.scorecard_batch import ScorecardBatch
+
+
+def synthetic_batch(rounds, courses, seed):
+    """
+    Genera un lote aleatorio sin pasar por la base de datos.
+
+    Args:
+        rounds (int): Número de tarjetas
+        courses (int): Número de campos
+        seed (int): Semilla aleatoria
+
+    Returns:
+        ScorecardBatch: Lote sintético
+    """
+    rng = np.random.default_rng(seed)
+    course_pars = rng.choice(np.array([3, 4, 4, 4, 5], dtype=np.int8), size=(courses, 18))
+    course_stroke_index = np.array([rng.permutation(18) + 1 for _ in range(courses)], dtype=np.int8)
+    course_index = rng.integers(0, courses, size=rounds)
+    strokes = (course_pars[course_index] + rng.integers(-1, 4, size=(rounds, 18))).astype(np.int8)
+    return ScorecardBatch(
+        ids=np.arange(1, rounds + 1, dtype=np.int64),
+        player_ids=rng.integers(1, 1000, size=rounds),
+        course_ids=np.arange(1, courses + 1, dtype=np.int64),
+        course_index=course_index,
+        strokes=strokes,
+        points=np.clip(2 - (strokes - course_pars[course_index]), 0, 5).astype(np.int8),
+        date_ordinals=rng.integers(738000, 739000, size=rounds).astype(np.int32),
+        playing_handicaps=rng.uniform(0, 36, size=rounds),
+        handicap_coefficients=np.full(rounds, 95, dtype=np.float64),
+        course_pars=course_pars,
+        course_stroke_index=course_stroke_index
+    )
+
+
+def python_stats(strokes_lists, pars_lists):
+    """Calcula las mismas estadísticas con bucles de Python."""
+    totals = [sum(s) for s in strokes_lists]
+    to_par = [sum(s) - sum(p) for s, p in zip(strokes_lists, pars_lists)]
+    hole_sums = [0] * 18
+    for strokes in strokes_lists:
+        for i, value in enumerate(strokes):
+            hole_sums[i] += value
+    return totals, to_par, [value / len(strokes_lists) for value in hole_sums]
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de ScorecardBatch")
+    parser.add_argument('--rounds', type=int, default=1_000_000, help="Número de tarjetas")
+    parser.add_argument('--courses', type=int, default=50, help="Número de campos")
+    parser.add_argument('--seed', type=int, default=42, help="Semilla aleatoria")
+    parser.add_argument('--python-rounds', type=int, default=100_000,
+                        help="Tarjetas para la referencia en Python (es mucho más lenta)")
+    args = parser.parse_args()
+
+    batch = synthetic_batch(args.rounds, args.courses, args.seed)
+    print(f"{batch}")
+
+    for name, func in (
+        ('total_strokes', batch.total_strokes),
+        ('to_par', batch.to_par),
+        ('hole_averages', batch.hole_averages),
+        ('hole_to_par_averages', batch.hole_to_par_averages),
+        ('score_distribution', batch.score_distribution),
+    ):
+        _, millis = _timed(func)
+        print(f"{name:<22} {millis:9.2f} ms")
+
+    sample = batch.select(slice(0, args.python_rounds))
+    strokes_lists = sample.strokes.tolist()
+    pars_lists = sample.hole_pars().tolist()
+    (totals, to_par, _), millis = _timed(lambda: python_stats(strokes_lists, pars_lists))
+    print(f"{'python (referencia)':<22} {millis:9.2f} ms para {len(sample)} tarjetas")
+
+    if totals != sample.total_strokes().tolist() or to_par != sample.to_par().tolist():
+        raise AssertionError("Los resultados vectorizados no coinciden con la referencia")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Micro-benchmark de las funciones de puntuación vectorizadas.
+
+Compara batch_playing_handicap, batch_handicap_strokes y batch_points con
+calculate_playing_handicap, calculate_handicap_strokes y calculate_points
+aplicadas tarjeta a tarjeta sobre los mismos datos aleatorios, y comprueba que
+los resultados son idénticos.
+
+Uso:
+    python benchmarks/bench_scoring_batch.py [--cards N] [--repeat R] [--seed S]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.helpers_simple import (
+    calculate_handicap_strokes, calculate_playing_handicap, calculate_points
+)
+from src.utils.scoring_batch import (
+    batch_course_handicaps, batch_handicap_strokes, batch_playing_handicap, batch_points
+)
+
+
+def make_cards(cards, seed):
+    """
+    Genera datos aleatorios de tarjetas de un mismo campo.
+
+    Args:
+        cards (int): Número de tarjetas
+        seed (int): Semilla aleatoria
+
+    Returns:
+        dict: Arrays con exact_handicaps, coefficients, strokes, pars, stroke_index,
+            slope, course_rating y par
+    """
+    rng = np.random.default_rng(seed)
+    pars = rng.permutation(np.array([3, 4, 5] * 6))
+    strokes = pars + rng.integers(-2, 5, size=(cards, 18))
+    # Algunos hoyos sin jugar
+    strokes[rng.random((cards, 18)) < 0.02] = 0
+    return {
+        'exact_handicaps': np.round(rng.uniform(-5, 54, size=cards), 1),
+        'coefficients': rng.choice([100, 95, 90, 85, 75], size=cards).astype(np.float64),
+        'strokes': strokes,
+        'pars': pars,
+        'stroke_index': rng.permutation(np.arange(1, 19)),
+        'slope': int(rng.integers(55, 156)),
+        'course_rating': round(float(rng.uniform(66, 76)), 1),
+        'par': int(pars.sum())
+    }
+
+
+def scalar(data):
+    """Calcula hándicaps de juego, golpes recibidos y puntos con las funciones escalares."""
+    pars = data['pars'].tolist()
+    stroke_index = data['stroke_index'].tolist()
+    playing, received, points = [], [], []
+    for exact, coefficient, strokes in zip(data['exact_handicaps'].tolist(),
+                                           data['coefficients'].tolist(),
+                                           data['strokes'].tolist()):
+        playing_handicap = calculate_playing_handicap(exact, data['slope'], data['course_rating'], data['par'])
+        hole_strokes = calculate_handicap_strokes(playing_handicap * (coefficient / 100), data['slope'],
+                                                  data['course_rating'], stroke_index)
+        playing.append(playing_handicap)
+        received.append(hole_strokes)
+        points.append([calculate_points(s, p, e) for s, p, e in zip(strokes, pars, hole_strokes)])
+    return playing, received, points
+
+
+def vectorized(data):
+    """Calcula hándicaps de juego, golpes recibidos y puntos con las funciones por lotes."""
+    playing = batch_playing_handicap(data['exact_handicaps'], data['slope'], data['course_rating'], data['par'])
+    received = batch_handicap_strokes(batch_course_handicaps(playing, data['coefficients']),
+                                      data['stroke_index'])
+    points = batch_points(data['strokes'], data['pars'], received)
+    return playing, received, points
+
+
+def _timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return result, (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark de las funciones de puntuación por lotes")
+    parser.add_argument('--cards', type=int, default=100000, help="Número de tarjetas")
+    parser.add_argument('--repeat', type=int, default=5, help="Repeticiones de cada medida")
+    parser.add_argument('--seed', type=int, default=42, help="Semilla aleatoria")
+    args = parser.parse_args()
+
+    data = make_cards(args.cards, args.seed)
+    expected, scalar_ms = _timed(lambda: scalar(data), max(1, args.repeat // 5))
+    actual, batch_ms = _timed(lambda: vectorized(data), args.repeat)
+
+    for name, scalar_values, batch_values in zip(('hándicap de juego', 'golpes recibidos', 'puntos'),
+                                                 expected, actual):
+        if batch_values.tolist() != scalar_values:
+            raise AssertionError(f"Los {name} por lotes no coinciden con la versión escalar")
+
+    print(f"{args.cards} tarjetas de 18 hoyos")
+    print(f"{'escalar':<12} {scalar_ms:9.1f} ms")
+    print(f"{'por lotes':<12} {batch_ms:9.1f} ms ({scalar_ms / batch_ms:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
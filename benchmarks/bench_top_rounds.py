@@ -0,0 +1,74 @@
+"""
+Benchmark de las clasificaciones de mejores rondas (top-N).
+
+Mide ScorecardController.top_rounds para cada métrica con historiales de
+distinto tamaño y comprueba el resultado contra una ordenación completa en
+Python. Todas las métricas usan un índice y deben tardar lo mismo con
+independencia del número de rondas.
+
+Uso:
+    python benchmarks/bench_top_rounds.py [--sizes N [N ...]] [--top N] [--seed S]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_player_stats import populate
+from src.controllers.scorecard_controller import ScorecardController
+from src.database import Database
+
+
+def reference_top(db, metric, n):
+    """Calcula la clasificación ordenando todas las rondas en Python."""
+    rows = db.connection.execute("""
+        SELECT s.id, s.total_strokes, s.total_points, s.playing_handicap,
+               COALESCE(t.par_total, c.par_total) AS par_total
+        FROM scorecards s
+        JOIN courses c ON s.course_id = c.id
+        LEFT JOIN course_tees t ON t.id = s.tee_id
+        WHERE s.total_strokes IS NOT NULL
+    """)
+    rows = [row for row in rows if metric != 'net' or row['playing_handicap'] is not None]
+    keys = {
+        'gross': lambda row: (row['total_strokes'], -row['id']),
+        'to_par': lambda row: (row['total_strokes'] - row['par_total'], -row['id']),
+        'net': lambda row: (row['total_strokes'] - row['playing_handicap'], -row['id']),
+        'stableford': lambda row: (-row['total_points'], -row['id']),
+    }
+    return [row['id'] for row in sorted(rows, key=keys[metric])[:n]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de top_rounds")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000],
+                        help="Número de rondas de cada historial")
+    parser.add_argument('--top', type=int, default=10, help="Tamaño de la clasificación")
+    parser.add_argument('--repeat', type=int, default=20, help="Repeticiones de cada medida")
+    parser.add_argument('--seed', type=int, default=42, help="Semilla aleatoria")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(os.path.join(tmp, 'bench.db'))
+            populate(db, 0, size, args.seed)
+            controller = ScorecardController(db)
+
+            print(f"{size} rondas")
+            for metric in controller.TOP_ROUND_METRICS:
+                start = time.perf_counter()
+                for _ in range(args.repeat):
+                    result = controller.top_rounds(metric, args.top)
+                millis = (time.perf_counter() - start) * 1000 / args.repeat
+                print(f"  {metric:<12} {millis:9.2f} ms")
+
+                if [r['scorecard_id'] for r in result] != reference_top(db, metric, args.top):
+                    raise AssertionError(f"top_rounds('{metric}') no coincide con la referencia")
+            db.connection.close()
+
+
+if __name__ == '__main__':
+    main()
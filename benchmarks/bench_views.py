@@ -0,0 +1,282 @@
+"""
+Latencia de extremo a extremo de las vistas interactivas.
+
+Reproduce secuencias de teclas guionizadas en MenuViewSimple.run contra una
+base de datos generada y mide, para cada tecla, el tiempo desde que se pulsa
+Enter hasta que la aplicación vuelve a pedir una entrada: lo que el usuario
+percibe como la espera de cada pantalla. input() se sustituye por el guion,
+os.system('clear') por una función vacía y la salida se captura en memoria,
+por lo que el tiempo de escribir en la terminal no está incluido.
+
+Cada recorrido se repite varias veces y se muestran los percentiles 50 y 95 de
+sus pasos y el desglose por paso. Las bases de datos se generan y se guardan
+igual que en run.py.
+
+Uso:
+    python benchmarks/bench_views.py [--scales N [N ...]] [--repeat N] [--seed S]
+        [--data-dir DIR] [--flow NOMBRE] [--output FICHERO]
+"""
+import argparse
+import builtins
+import contextlib
+import io
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from run import dataset, log, scale_label
+from src.controllers.course_controller import CourseController
+from src.controllers.player_controller import PlayerController
+from src.controllers.scorecard_controller import ScorecardController
+from src.views.course_view import CourseView
+from src.views.menu_view_simple import MenuViewSimple
+from src.views.player_view import PlayerView
+from src.views.scorecard_view import ScorecardView
+
+DEFAULT_SCALES = [100_000, 1_000_000]
+
+
+class ScriptExhausted(Exception):
+    """La aplicación ha pedido más entradas de las que tiene el guion"""
+
+
+class KeystrokeReplay:
+    """
+    Sustituto de input() que devuelve las teclas de un guion y mide cada paso.
+
+    La latencia de un paso es el tiempo entre que se devuelve una tecla y la
+    siguiente llamada a input(); la del último paso termina con finish().
+    """
+
+    def __init__(self, keys):
+        self.keys = list(keys)
+        self.position = 0
+        self.latencies = []
+        self.pressed = None
+
+    def __call__(self, prompt=''):
+        now = time.perf_counter()
+        if self.pressed is not None:
+            self.latencies.append(now - self.pressed)
+        if self.position >= len(self.keys):
+            raise ScriptExhausted(f"el guion termina tras {len(self.keys)} teclas")
+        key = self.keys[self.position]
+        self.position += 1
+        self.pressed = time.perf_counter()
+        return key
+
+    def finish(self):
+        """Cierra la medida del último paso al terminar la aplicación"""
+        if self.pressed is not None and len(self.latencies) < self.position:
+            self.latencies.append(time.perf_counter() - self.pressed)
+
+
+def flow_context(db):
+    """
+    Elige los datos de los recorridos: el jugador y el campo con más rondas,
+    la tarjeta más reciente y el último año con datos.
+
+    Args:
+        db (Database): Base de datos de la escala
+
+    Returns:
+        dict: player_id, course_id, scorecard_id, start y end (DD/MM/YYYY)
+    """
+    connection = db.connection
+    player_id = connection.execute(
+        'SELECT player_id FROM scorecards GROUP BY player_id ORDER BY COUNT(*) DESC LIMIT 1'
+    ).fetchone()[0]
+    course_id = connection.execute(
+        'SELECT course_id FROM scorecards GROUP BY course_id ORDER BY COUNT(*) DESC LIMIT 1'
+    ).fetchone()[0]
+    scorecard_id, last_date = connection.execute(
+        'SELECT id, date FROM scorecards ORDER BY date DESC, id DESC LIMIT 1'
+    ).fetchone()
+    end = date.fromisoformat(last_date)
+    return {
+        'player_id': player_id,
+        'course_id': course_id,
+        'scorecard_id': scorecard_id,
+        'start': (end - timedelta(days=365)).strftime('%d/%m/%Y'),
+        'end': end.strftime('%d/%m/%Y'),
+    }
+
+
+def flows(context):
+    """
+    Recorridos guionizados desde el menú principal.
+
+    Cada paso es la tecla pulsada y la pantalla que se espera tras ella; cada
+    recorrido incluye un texto que debe aparecer en la salida para comprobar
+    que ha llegado a la pantalla final.
+
+    Args:
+        context (dict): Datos elegidos por flow_context
+
+    Returns:
+        list: Tuplas (nombre, pasos, texto esperado)
+    """
+    player, course, scorecard = (str(context[key]) for key in ('player_id', 'course_id', 'scorecard_id'))
+    return [
+        ('estadisticas-jugador', [
+            ('8', "menú de estadísticas"),
+            ('1', "lista de jugadores"),
+            (player, "elegir periodo"),
+            ('4', "estadísticas del jugador"),
+            ('', "menú de estadísticas"),
+            ('0', "menú principal"),
+            ('q', "salir"),
+        ], "Total de rondas"),
+        ('estadisticas-campo', [
+            ('8', "menú de estadísticas"),
+            ('2', "lista de campos"),
+            (course, "elegir periodo"),
+            ('4', "estadísticas del campo"),
+            ('', "menú de estadísticas"),
+            ('0', "menú principal"),
+            ('q', "salir"),
+        ], "Par del campo"),
+        ('filtro-campo-fecha', [
+            ('7', "menú de filtros"),
+            ('2', "lista de campos"),
+            (course, "tarjetas del campo"),
+            ('2', "menú de filtros"),
+            ('3', "elegir periodo"),
+            ('3', "fecha de inicio"),
+            (context['start'], "fecha de fin"),
+            (context['end'], "tarjetas del campo en el periodo"),
+            ('0', "menú principal"),
+            ('q', "salir"),
+        ], "Fechas: "),
+        ('lista-detalle', [
+            ('5', "lista de tarjetas"),
+            ('1', "ID de la tarjeta"),
+            (scorecard, "detalle de la tarjeta"),
+            ('', "opciones de la tarjeta"),
+            ('0', "menú principal"),
+            ('q', "salir"),
+        ], "DETALLES DE TARJETA"),
+    ]
+
+
+def replay(menu, keys):
+    """
+    Ejecuta el menú con un guion de teclas.
+
+    Args:
+        menu (MenuViewSimple): Menú con las vistas de la base de datos
+        keys (list): Teclas del guion
+
+    Returns:
+        tuple: (latencias de cada paso en segundos, salida capturada); si el
+            guion se agota antes de salir faltan las latencias de los últimos pasos
+    """
+    script = KeystrokeReplay(keys)
+    output = io.StringIO()
+    real_input, real_system = builtins.input, os.system
+    builtins.input, os.system = script, lambda command: 0
+    try:
+        menu.running = True
+        with contextlib.redirect_stdout(output):
+            menu.run()
+        script.finish()
+    except ScriptExhausted:
+        pass
+    finally:
+        builtins.input, os.system = real_input, real_system
+    return script.latencies, output.getvalue()
+
+
+def percentile(values, fraction):
+    """Percentil por rango más cercano de una lista de valores"""
+    ordered = sorted(values)
+    index = max(0, math.ceil(fraction * len(ordered)) - 1)
+    return ordered[index]
+
+
+def summary(samples):
+    """p50, p95 y máximo de una lista de latencias, en ms"""
+    return {
+        'p50_ms': round(percentile(samples, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(samples, 0.95) * 1000, 3),
+        'max_ms': round(max(samples) * 1000, 3),
+    }
+
+
+def run_flow(menu, name, steps, expected, repeat):
+    """
+    Repite un recorrido y resume sus latencias.
+
+    Raises:
+        RuntimeError: Si el recorrido no termina en la pantalla esperada
+    """
+    keys = [key for key, _ in steps]
+    per_step = [[] for _ in steps]
+    totals = []
+    for _ in range(repeat):
+        latencies, output = replay(menu, keys)
+        if len(latencies) != len(steps) or expected not in output:
+            raise RuntimeError(f"El recorrido {name} no ha llegado a la pantalla esperada:\n{output[-2000:]}")
+        for samples, latency in zip(per_step, latencies):
+            samples.append(latency)
+        totals.append(sum(latencies))
+
+    result = summary([latency for samples in per_step for latency in samples])
+    result['total'] = summary(totals)
+    result['steps'] = [dict(summary(samples), key=key, screen=screen)
+                       for (key, screen), samples in zip(steps, per_step)]
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latencia de los recorridos de las vistas")
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES, help="Rondas de cada escala")
+    parser.add_argument('--repeat', type=int, default=10, help="Repeticiones de cada recorrido")
+    parser.add_argument('--seed', type=int, default=42, help="Semilla aleatoria")
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'golf-bench'),
+                        help="Directorio de las bases de datos generadas")
+    parser.add_argument('--flow', default=None, help="Ejecutar solo los recorridos cuyo nombre contiene el texto")
+    parser.add_argument('--output', default=None, help="Fichero JSON donde guardar los resultados")
+    args = parser.parse_args()
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    results = {}
+    for rounds in args.scales:
+        label = scale_label(rounds)
+        db = dataset(args.data_dir, rounds, args.seed)
+        player_controller, course_controller = PlayerController(db), CourseController(db)
+        menu = MenuViewSimple(
+            PlayerView(player_controller),
+            CourseView(course_controller),
+            ScorecardView(ScorecardController(db), player_controller, course_controller)
+        )
+
+        print(f"{label} rondas")
+        print(f"  {'recorrido / pantalla':<48} {'p50':>10} {'p95':>10} {'máx':>10}")
+        for name, steps, expected in flows(flow_context(db)):
+            if args.flow and args.flow not in name:
+                continue
+            log(f"{label}: {name}")
+            result = run_flow(menu, name, steps, expected, args.repeat)
+            results[f'{label}/{name}'] = result
+            print(f"  {name:<48} {result['p50_ms']:>7.1f} ms {result['p95_ms']:>7.1f} ms "
+                  f"{result['max_ms']:>7.1f} ms")
+            for step in result['steps']:
+                screen = f"{step['key'] or '<Enter>'} -> {step['screen']}"
+                print(f"    {screen:<46} {step['p50_ms']:>7.1f} ms {step['p95_ms']:>7.1f} ms "
+                      f"{step['max_ms']:>7.1f} ms")
+        db.connection.close()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'repeat': args.repeat, 'seed': args.seed, 'flows': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
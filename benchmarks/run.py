@@ -0,0 +1,359 @@
+"""
+Suite de benchmarks de las operaciones principales a varias escalas.
+
+Genera (una sola vez, y las reutiliza) bases de datos deterministas de 1k,
+100k y 1M rondas con generate_data.generate y mide en cada una:
+
+- Database.get_scorecards (primera página y una página profunda)
+- Database.search_scorecards con cada uno de sus filtros
+- Database.get_stats (global, por jugador, por campo y por fechas)
+- ScorecardController.get_scorecard
+- Decodificación de modelos (Scorecard.from_db_row, Scorecard.from_joined_row,
+  ScorecardBatch.from_rows)
+
+y, una sola vez, las funciones de puntuación escalares y por lotes.
+
+Los resultados (mediana y mínimo en ms por operación) se emiten en JSON. Con
+--compare se comparan con un resultado guardado y el proceso termina con error
+si alguna operación es más lenta que la referencia por encima del umbral.
+
+Uso:
+    python benchmarks/run.py [--scales N [N ...]] [--repeat R] [--seed S] [--data-dir DIR]
+        [--regenerate] [--filter TEXTO] [--output FICHERO] [--compare FICHERO]
+        [--threshold FRACCIÓN] [--min-ms MS]
+
+Ejemplo:
+    python benchmarks/run.py --output baseline.json
+    python benchmarks/run.py --compare baseline.json
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import timeit
+from datetime import datetime
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from generate_data import generate
+from src.controllers.scorecard_controller import ScorecardController
+from src.database import Database
+from src.models.course import Course
+from src.models.scorecard import Scorecard
+from src.models.scorecard_batch import ScorecardBatch
+from src.utils.helpers_simple import (
+    calculate_handicap_strokes, calculate_playing_handicap, calculate_points
+)
+from src.utils.scoring_batch import (
+    batch_course_handicaps, batch_handicap_strokes, batch_playing_handicap, batch_points
+)
+
+DEFAULT_SCALES = [1_000, 100_000, 1_000_000]
+
+# Tarjetas con las que se miden las funciones de puntuación
+HELPER_CARDS = 10_000
+
+# Con operaciones más lentas que esto se toman como mucho tres muestras
+SLOW_SAMPLE_SECONDS = 1.0
+
+
+def log(message):
+    """Escribe el progreso en stderr para no mezclarlo con el JSON"""
+    print(message, file=sys.stderr, flush=True)
+
+
+def scale_label(rounds):
+    """Etiqueta corta de una escala: 1000 -> 1k, 1000000 -> 1M"""
+    for size, suffix in ((1_000_000, 'M'), (1_000, 'k')):
+        if rounds >= size and rounds % size == 0:
+            return f'{rounds // size}{suffix}'
+    return str(rounds)
+
+
+def dataset(data_dir, rounds, seed, regenerate=False):
+    """
+    Obtiene la base de datos de una escala, generándola si no existe.
+
+    El número de jugadores y campos crece con el de rondas (unas 100 rondas por
+    jugador y 2000 por campo, hasta 500 campos).
+
+    Args:
+        data_dir (str): Directorio donde se guardan las bases de datos generadas
+        rounds (int): Número de rondas
+        seed (int): Semilla de la generación
+        regenerate (bool): Generar de nuevo aunque ya exista
+
+    Returns:
+        Database: Base de datos con los datos de la escala
+    """
+    path = os.path.join(data_dir, f'bench-{rounds}-{seed}.db')
+    if os.path.exists(path) and not regenerate:
+        db = Database(path)
+        if db.connection.execute('SELECT COUNT(*) FROM scorecards').fetchone()[0] == rounds:
+            return db
+        db.connection.close()
+    for suffix in ('', '-journal', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    log(f"Generando {rounds} rondas en {path}")
+    db = Database(path)
+    db.connection.execute('PRAGMA cache_size = -262144')
+    players = max(20, rounds // 100)
+    courses = min(500, max(5, rounds // 2000))
+    generate(db, players, courses, rounds, seed, log=lambda message: None)
+    db.connection.execute('ANALYZE')
+    return db
+
+
+def measure(func, repeat):
+    """
+    Mide una operación.
+
+    Las operaciones rápidas se repiten dentro de cada muestra hasta que esta
+    dura al menos 0,2 s (timeit.Timer.autorange).
+
+    Args:
+        func (callable): Operación sin argumentos
+        repeat (int): Número de muestras
+
+    Returns:
+        dict: median_ms y min_ms por operación, muestras y operaciones por muestra
+    """
+    timer = timeit.Timer(func)
+    number, seconds = timer.autorange()
+    if seconds / number > SLOW_SAMPLE_SECONDS:
+        repeat = min(repeat, 3)
+    samples = [t / number * 1000 for t in timer.repeat(repeat, number)]
+    return {
+        'median_ms': float(np.median(samples)),
+        'min_ms': min(samples),
+        'repeat': repeat,
+        'number': number
+    }
+
+
+def database_cases(db, seed):
+    """
+    Operaciones a medir sobre una base de datos generada.
+
+    Args:
+        db (Database): Base de datos generada
+        seed (int): Semilla para elegir IDs
+
+    Returns:
+        list: Pares (nombre, operación sin argumentos)
+    """
+    rng = random.Random(seed)
+    connection = db.connection
+    total = connection.execute('SELECT COUNT(*) FROM scorecards').fetchone()[0]
+    max_id = connection.execute('SELECT MAX(id) FROM scorecards').fetchone()[0]
+    player_id = connection.execute(
+        'SELECT player_id FROM scorecards GROUP BY player_id ORDER BY COUNT(*) DESC, player_id LIMIT 1'
+    ).fetchone()[0]
+    course_id = connection.execute('SELECT MIN(id) FROM courses').fetchone()[0]
+    last_date = connection.execute('SELECT MAX(date) FROM scorecards').fetchone()[0]
+    first_name = connection.execute('SELECT first_name FROM players WHERE id = ?', (player_id,)).fetchone()[0]
+    course_name = connection.execute('SELECT name FROM courses WHERE id = ?', (course_id,)).fetchone()[0]
+    start_date = f'{last_date[:7]}-01'
+
+    controller = ScorecardController(db)
+    scorecard_ids = itertools.cycle([rng.randint(1, max_id) for _ in range(1000)])
+    plain_rows = connection.execute('SELECT * FROM scorecards ORDER BY id LIMIT 1000').fetchall()
+    joined_rows = [db.get_scorecard_with_details(scorecard_id) for scorecard_id in
+                   sorted(rng.sample(range(1, max_id + 1), min(1000, max_id)))]
+    course_rows = connection.execute('SELECT * FROM courses').fetchall()
+    courses = {row['id']: Course.from_db_row(row) for row in course_rows}
+    batch_rows = db.get_course_scorecard_rows(course_id)
+
+    filters = {
+        'player_id': {'player_id': player_id},
+        'course_id': {'course_id': course_id},
+        'date_range': {'start_date': start_date, 'end_date': last_date},
+        'player_name': {'player_name': first_name},
+        'course_name': {'course_name': course_name},
+        'to_par': {'to_par_min': -5, 'to_par_max': 0}
+    }
+
+    cases = [
+        ('db.get_scorecards', lambda: db.get_scorecards(50, 0)),
+        ('db.get_scorecards[offset]', lambda: db.get_scorecards(50, total // 2)),
+    ]
+    cases += [(f'db.search_scorecards[{name}]', lambda f=f: db.search_scorecards(f))
+              for name, f in filters.items()]
+    cases += [
+        ('db.get_stats', lambda: db.get_stats()),
+        ('db.get_stats[player_id]', lambda: db.get_stats(player_id=player_id)),
+        ('db.get_stats[course_id]', lambda: db.get_stats(course_id=course_id)),
+        ('db.get_stats[date_range]', lambda: db.get_stats(start_date=start_date, end_date=last_date)),
+        ('controller.get_scorecard', lambda: controller.get_scorecard(next(scorecard_ids))),
+        ('model.Scorecard.from_db_row[1000]', lambda: [Scorecard.from_db_row(row) for row in plain_rows]),
+        ('model.Scorecard.from_joined_row[1000]',
+         lambda: [Scorecard.from_joined_row(row) for row in joined_rows]),
+        ('model.Course.from_db_row', lambda: [Course.from_db_row(row) for row in course_rows]),
+        ('model.ScorecardBatch.from_rows[course]', lambda: ScorecardBatch.from_rows(batch_rows, courses)),
+    ]
+    return cases
+
+
+def helper_cases(seed):
+    """
+    Funciones de puntuación a medir sobre HELPER_CARDS tarjetas aleatorias.
+
+    Args:
+        seed (int): Semilla aleatoria
+
+    Returns:
+        list: Pares (nombre, operación sin argumentos)
+    """
+    rng = np.random.default_rng(seed)
+    pars = rng.permutation(np.array([3, 4, 5] * 6))
+    stroke_index = rng.permutation(np.arange(1, 19))
+    strokes = pars + rng.integers(-1, 4, size=(HELPER_CARDS, 18))
+    exact = np.round(rng.uniform(-5, 54, HELPER_CARDS), 1)
+    slope, course_rating, par = 128, 71.5, int(pars.sum())
+
+    exact_list, pars_list, stroke_index_list = exact.tolist(), pars.tolist(), stroke_index.tolist()
+    strokes_list = strokes.tolist()
+    playing_list = [calculate_playing_handicap(e, slope, course_rating, par) for e in exact_list]
+    received_list = [calculate_handicap_strokes(p, slope, course_rating, stroke_index_list) for p in playing_list]
+    playing = np.array(playing_list)
+    received = batch_handicap_strokes(batch_course_handicaps(playing), stroke_index)
+
+    def scalar_points():
+        return [[calculate_points(s, p, r) for s, p, r in zip(card, pars_list, card_received)]
+                for card, card_received in zip(strokes_list, received_list)]
+
+    return [
+        ('calculate_playing_handicap', lambda: [calculate_playing_handicap(e, slope, course_rating, par)
+                                                for e in exact_list]),
+        ('calculate_handicap_strokes', lambda: [calculate_handicap_strokes(p, slope, course_rating,
+                                                                           stroke_index_list)
+                                                for p in playing_list]),
+        ('calculate_points', scalar_points),
+        ('batch_playing_handicap', lambda: batch_playing_handicap(exact, slope, course_rating, par)),
+        ('batch_handicap_strokes', lambda: batch_handicap_strokes(batch_course_handicaps(playing), stroke_index)),
+        ('batch_points', lambda: batch_points(strokes, pars, received)),
+    ]
+
+
+def compare(results, baseline, threshold, min_ms):
+    """
+    Compara los resultados con una referencia.
+
+    Una operación empeora si su mediana supera la de referencia en más de
+    ``threshold`` (fracción) y en más de ``min_ms``, para no dar por regresión
+    el ruido de las operaciones muy rápidas.
+
+    Args:
+        results (dict): Resultados actuales {nombre: medida}
+        baseline (dict): Resultados de referencia {nombre: medida}
+        threshold (float): Empeoramiento relativo permitido
+        min_ms (float): Empeoramiento absoluto mínimo para contar como regresión
+
+    Returns:
+        list: Nombres de las operaciones que han empeorado
+    """
+    regressions = []
+    log(f"{'operación':<48} {'referencia':>11} {'actual':>11} {'cambio':>8}")
+    for name, current in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            log(f"{name:<48} {'-':>11} {current['median_ms']:>8.3f} ms {'nueva':>8}")
+            continue
+        before, after = reference['median_ms'], current['median_ms']
+        ratio = after / before if before else float('inf')
+        regressed = ratio > 1 + threshold and after - before > min_ms
+        if regressed:
+            regressions.append(name)
+        log(f"{name:<48} {before:>8.3f} ms {after:>8.3f} ms {ratio - 1:>+7.0%}"
+            f"{'  REGRESIÓN' if regressed else ''}")
+    missing = len(baseline.keys() - results.keys())
+    if missing:
+        log(f"{missing} operaciones de la referencia sin medir")
+    return regressions
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite de benchmarks a varias escalas")
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES, help="Rondas de cada escala")
+    parser.add_argument('--repeat', type=int, default=5, help="Muestras de cada medida")
+    parser.add_argument('--seed', type=int, default=42, help="Semilla aleatoria")
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'golf-bench'),
+                        help="Directorio de las bases de datos generadas")
+    parser.add_argument('--regenerate', action='store_true', help="Generar de nuevo las bases de datos")
+    parser.add_argument('--filter', default=None, help="Medir solo las operaciones cuyo nombre contiene el texto")
+    parser.add_argument('--output', default=None, help="Fichero JSON de resultados (por defecto, stdout)")
+    parser.add_argument('--compare', default=None, help="Fichero JSON de referencia con el que comparar")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Empeoramiento relativo permitido")
+    parser.add_argument('--min-ms', type=float, default=0.05,
+                        help="Empeoramiento absoluto mínimo (ms) para contar como regresión")
+    args = parser.parse_args()
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    results = {}
+
+    def run(prefix, cases):
+        for name, func in cases:
+            full_name = f'{prefix}/{name}'
+            if args.filter and args.filter not in full_name:
+                continue
+            results[full_name] = measure(func, args.repeat)
+            log(f"  {full_name:<48} {results[full_name]['median_ms']:>10.3f} ms")
+
+    run('helpers', helper_cases(args.seed))
+    for rounds in args.scales:
+        db = dataset(args.data_dir, rounds, args.seed, args.regenerate)
+        log(f"Escala {scale_label(rounds)} ({rounds} rondas)")
+        run(scale_label(rounds), database_cases(db, args.seed))
+        db.connection.close()
+
+    report = {
+        'meta': {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'seed': args.seed,
+            'scales': args.scales,
+            'repeat': args.repeat
+        },
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold, args.min_ms)
+        if regressions:
+            log(f"{len(regressions)} operaciones más lentas que la referencia")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+Prueba de carga de escrituras concurrentes desde varios procesos.
+
+Varios procesos, cada uno con su propia conexión, añaden tarjetas a la misma
+base de datos a la vez con ScorecardController.add_scorecard (inserción de la
+tarjeta y actualización del historial de hándicap). Al terminar se comprueba
+que todas las tarjetas confirmadas están guardadas y que no falta ninguna, y
+se muestran las métricas de espera por bloqueos de cada proceso.
+
+Con --max-retries 0 y un --busy-timeout bajo se puede ver cuántas tarjetas se
+pierden sin la política de reintentos.
+
+Uso:
+    python benchmarks/stress_concurrent_writes.py [--processes N] [--cards N] [--players N]
+        [--busy-timeout MS] [--max-retries N] [--retry-delay MS] [--seed S]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.controllers.scorecard_controller import ScorecardController
+from src.database import Database
+
+
+def setup(db_path, players):
+    """
+    Crea la base de datos con un campo y los jugadores de la prueba.
+
+    Args:
+        db_path (str): Ruta de la base de datos
+        players (int): Número de jugadores
+    """
+    db = Database(db_path)
+    db.add_course('Campo', 'Prueba de carga', 125, 71.5, 72, [4] * 18, list(range(1, 19)))
+    for i in range(players):
+        db.add_player(f'Jugador{i}', 'Carga', 18.0)
+    db.connection.close()
+
+
+def writer(worker, args, db_path, start, results):
+    """
+    Añade las tarjetas de un proceso y devuelve sus IDs y métricas por la cola.
+
+    Cada tarjeta tiene una fecha distinta, por lo que ninguna es un duplicado
+    de otra y todas deben guardarse.
+    """
+    rng = random.Random(args.seed + worker)
+    db = Database(db_path, busy_timeout=args.busy_timeout, max_retries=args.max_retries,
+                  retry_delay=args.retry_delay)
+    controller = ScorecardController(db)
+    first_day = date(2000, 1, 1)
+    saved, errors = [], []
+
+    start.wait()
+    began = time.perf_counter()
+    for i in range(args.cards):
+        day = (first_day + timedelta(days=worker * args.cards + i)).isoformat()
+        strokes = [rng.randint(3, 7) for _ in range(18)]
+        points = [max(0, 2 + 4 - s) for s in strokes]
+        success, result = controller.add_scorecard(
+            rng.randint(1, args.players), 1, day, strokes, points, 100, 18.0
+        )
+        if success:
+            saved.append(result)
+        else:
+            errors.append(result)
+    elapsed = time.perf_counter() - began
+
+    results.put((worker, saved, errors, elapsed, db.lock_stats()))
+    db.connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga de escrituras concurrentes")
+    parser.add_argument('--processes', type=int, default=8, help="Procesos escritores")
+    parser.add_argument('--cards', type=int, default=200, help="Tarjetas por proceso")
+    parser.add_argument('--players', type=int, default=20, help="Jugadores entre los que se reparten")
+    parser.add_argument('--busy-timeout', type=int, default=None, help="Busy timeout en ms")
+    parser.add_argument('--max-retries', type=int, default=None, help="Reintentos por escritura bloqueada")
+    parser.add_argument('--retry-delay', type=int, default=None, help="Espera del primer reintento en ms")
+    parser.add_argument('--seed', type=int, default=42, help="Semilla aleatoria")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'stress.db')
+        setup(db_path, args.players)
+
+        start = multiprocessing.Event()
+        results = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=writer, args=(w, args, db_path, start, results))
+                     for w in range(args.processes)]
+        for process in processes:
+            process.start()
+        start.set()
+        reports = sorted((results.get() for _ in processes), key=lambda report: report[0])
+        for process in processes:
+            process.join()
+
+        db = Database(db_path)
+        stored = {row[0] for row in db.connection.execute('SELECT id FROM scorecards')}
+        db.connection.close()
+
+    expected = args.processes * args.cards
+    saved = [scorecard_id for report in reports for scorecard_id in report[1]]
+    errors = [error for report in reports for error in report[2]]
+    lost = set(saved) - stored
+
+    print(f"{args.processes} procesos x {args.cards} tarjetas")
+    print(f"{'proceso':>7} {'tarjetas/s':>10} {'bloqueos':>8} {'reintentos':>10} {'fallos':>6} "
+          f"{'espera total':>12} {'espera máx':>10}")
+    for worker, worker_saved, _, elapsed, stats in reports:
+        print(f"{worker:>7} {len(worker_saved) / elapsed:>10.1f} {stats['blocked_writes']:>8} "
+              f"{stats['retries']:>10} {stats['failures']:>6} "
+              f"{stats['wait_seconds'] * 1000:>9.0f} ms {stats['max_wait_seconds'] * 1000:>7.0f} ms")
+    print(f"Confirmadas: {len(saved)}/{expected}, guardadas: {len(stored)}, "
+          f"perdidas: {len(lost)}, errores: {len(errors)}")
+    for error in sorted(set(errors))[:5]:
+        print(f"  {error}")
+
+    if lost or len(stored) != expected:
+        raise SystemExit(f"Faltan tarjetas: se esperaban {expected} y hay {len(stored)} guardadas")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,308 @@
+"""
+Generador de datos sintéticos deterministas para pruebas de carga.
+
+Crea jugadores, campos y rondas con distribuciones realistas a partir de una
+semilla: la misma semilla y los mismos volúmenes producen siempre la misma base
+de datos, independientemente del número de procesos.
+
+- Jugadores con un índice de hándicap de distribución gamma (media ~14) y una
+  frecuencia de juego log-normal (unos pocos juegan mucho más que el resto).
+- Campos con pares, stroke index, slope y course rating verosímiles.
+- Rondas en las que cada hoyo se juega según el hándicap de campo del jugador,
+  la dificultad del hoyo y la forma del día. Los puntos se calculan con las
+  versiones por lotes de calculate_handicap_strokes y calculate_points, y el
+  diferencial con las reglas de adjusted_gross_score y score_differential.
+
+Las rondas se generan por bloques en paralelo y se guardan con la inserción por
+lotes de Database.import_scorecards a medida que llegan, informando del ritmo.
+
+Uso:
+    python generate_data.py [--db RUTA] [--players N] [--courses N] [--rounds N]
+        [--years N] [--end-date YYYY-MM-DD] [--seed S] [--workers N] [--chunk-size N]
+        [--cache-mb N] [--reset] [--recalculate-handicaps]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+import numpy as np
+
+# Añadir el directorio raíz al path para poder importar el paquete src
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.controllers.handicap_controller import HandicapController
+from src.database import Database
+from src.utils.handicap import MAX_HANDICAP_INDEX, MIN_HANDICAP_INDEX, score_differential
+from src.utils.scoring_batch import (
+    MAX_ALLOCATED_HANDICAP, batch_course_handicaps, batch_playing_handicap, batch_points,
+    stroke_allocation_table
+)
+
+FIRST_NAMES = ['Juan', 'María', 'Carlos', 'Ana', 'Luis', 'Lucía', 'Javier', 'Carmen', 'Miguel', 'Elena',
+               'Pablo', 'Laura', 'Diego', 'Marta', 'Jorge', 'Sara', 'Álvaro', 'Paula', 'Sergio', 'Isabel']
+SURNAMES = ['García', 'López', 'Martínez', 'Rodríguez', 'Sánchez', 'Pérez', 'Gómez', 'Fernández',
+            'Díaz', 'Moreno', 'Muñoz', 'Álvarez', 'Romero', 'Navarro', 'Torres', 'Ruiz', 'Gil', 'Vázquez']
+LOCATIONS = ['Madrid', 'Sevilla', 'Girona', 'Málaga', 'Valencia', 'Asturias', 'Cádiz', 'Mallorca',
+             'Barcelona', 'Alicante', 'Murcia', 'Tenerife', 'Cantabria', 'Navarra', 'Huelva']
+
+# Coeficientes de hándicap y su frecuencia
+COEFFICIENTS = np.array([100, 95, 90, 85])
+COEFFICIENT_WEIGHTS = np.array([0.55, 0.25, 0.15, 0.05])
+
+# Golpes por encima del hándicap que hace de media un jugador en una ronda
+# (el índice sale de sus mejores rondas, no de la media)
+MEAN_STROKES_OVER_HANDICAP = 3.0
+
+# Desviación típica de la forma del día, en golpes por ronda
+ROUND_FORM_SD = 3.0
+
+# Máximo de golpes sobre el par en un hoyo (el jugador levanta la bola)
+MAX_OVER_PAR = 6
+
+
+def generate_players(rng, count):
+    """
+    Genera jugadores con su índice de hándicap y su frecuencia de juego.
+
+    Args:
+        rng (Generator): Generador aleatorio
+        count (int): Número de jugadores
+
+    Returns:
+        tuple: (lista de tuplas (first_name, surname, handicap), array de pesos de
+            frecuencia de juego normalizados)
+    """
+    indexes = np.round(np.clip(rng.gamma(3.5, 4.5, count) - 2, MIN_HANDICAP_INDEX, MAX_HANDICAP_INDEX), 1)
+    first_names = rng.integers(0, len(FIRST_NAMES), count)
+    surnames = rng.integers(0, len(SURNAMES), (count, 2))
+    players = [(FIRST_NAMES[first], f'{SURNAMES[s1]} {SURNAMES[s2]}', float(index))
+               for first, (s1, s2), index in zip(first_names, surnames, indexes)]
+    weights = rng.lognormal(0, 1, count)
+    return players, weights / weights.sum()
+
+
+def generate_courses(rng, count):
+    """
+    Genera campos de 18 hoyos.
+
+    El par va de 70 a 73, los hoyos impares de stroke index quedan en la
+    primera vuelta y el course rating depende del par y del slope.
+
+    Args:
+        rng (Generator): Generador aleatorio
+        count (int): Número de campos
+
+    Returns:
+        list: Tuplas (name, location, slope, course_rating, par_total, hole_pars, hole_handicaps)
+    """
+    courses = []
+    for i in range(count):
+        par_threes = int(rng.integers(4, 6))
+        par_fives = int(rng.integers(3, 6))
+        pars = rng.permutation([3] * par_threes + [5] * par_fives + [4] * (18 - par_threes - par_fives))
+        front = rng.permutation(np.arange(1, 19, 2))
+        back = rng.permutation(np.arange(2, 19, 2))
+        stroke_index = np.concatenate([front, back] if rng.random() < 0.5 else [back, front])
+        slope = int(np.clip(round(rng.normal(126, 10)), 55, 155))
+        par_total = int(pars.sum())
+        course_rating = round(float(par_total + (slope - 113) / 8 + rng.normal(-1, 1)), 1)
+        location = LOCATIONS[int(rng.integers(0, len(LOCATIONS)))]
+        courses.append((f'Campo {i + 1} de {location}', location, slope, course_rating, par_total,
+                        pars.tolist(), stroke_index.tolist()))
+    return courses
+
+
+def generate_rounds(seed, chunk, size, player_ids, player_indexes, player_weights, courses, first_day, days):
+    """
+    Genera un bloque de rondas (se ejecuta en un proceso aparte).
+
+    Cada bloque usa su propio generador derivado de (seed, chunk), por lo que el
+    resultado no depende del reparto de bloques entre procesos.
+
+    Args:
+        seed (int): Semilla de la generación
+        chunk (int): Número de bloque
+        size (int): Rondas del bloque
+        player_ids (ndarray): IDs de los jugadores
+        player_indexes (ndarray): Índice de hándicap de cada jugador
+        player_weights (ndarray): Frecuencia de juego de cada jugador (suma 1)
+        courses (dict): Arrays ids, slopes, ratings, pars_total, pars (C, 18) y
+            stroke_index (C, 18) de los campos
+        first_day (date): Primer día del periodo
+        days (int): Días del periodo
+
+    Returns:
+        list: Filas de Database.scorecard_import_rows, ordenadas por jugador y fecha
+    """
+    rng = np.random.default_rng([seed, chunk])
+    players = rng.choice(len(player_ids), size, p=player_weights)
+    course_rows = rng.integers(0, len(courses['ids']), size)
+    coefficients = rng.choice(COEFFICIENTS, size, p=COEFFICIENT_WEIGHTS)
+    day_offsets = rng.integers(0, days, size)
+
+    slopes = courses['slopes'][course_rows]
+    ratings = courses['ratings'][course_rows]
+    pars = courses['pars'][course_rows]
+    stroke_index = courses['stroke_index'][course_rows]
+
+    # Hándicap de juego de la ronda y golpes recibidos en cada hoyo, como en las vistas
+    playing = batch_playing_handicap(player_indexes[players], slopes, ratings, courses['pars_total'][course_rows])
+    course_handicaps = batch_course_handicaps(playing, coefficients)
+    allocation = np.clip(course_handicaps, 0, MAX_ALLOCATED_HANDICAP)
+    received = courses['allocation'][course_rows, allocation]
+
+    # Golpes sobre el par: Poisson con media según el nivel del jugador, la
+    # dificultad del hoyo y la forma del día, menos algún birdie
+    expected = np.maximum(playing + MEAN_STROKES_OVER_HANDICAP + rng.normal(0, ROUND_FORM_SD, size), 0)
+    difficulty = 1 + 0.5 * (9.5 - stroke_index) / 8.5
+    birdie_prob = np.clip(0.22 - 0.006 * playing, 0.02, 0.3)[:, None]
+    over_par = (rng.poisson(expected[:, None] / 18 * difficulty + birdie_prob)
+                - (rng.random((size, 18)) < birdie_prob))
+    strokes = pars + np.clip(over_par, 1 - pars, MAX_OVER_PAR)
+    points = batch_points(strokes, pars, received)
+
+    # Resultado bruto ajustado: cada hoyo limitado a doble bogey neto con el
+    # hándicap de juego redondeado, como adjusted_gross_score
+    rounded = np.round(playing).astype(np.int64)[:, None]
+    net_strokes = np.where(rounded >= 0,
+                           rounded // 18 + (stroke_index <= rounded % 18),
+                           -(stroke_index > 18 + rounded).astype(np.int64))
+    adjusted = np.minimum(strokes, pars + 2 + net_strokes).sum(axis=1)
+
+    # Ordenar por jugador y fecha para que las inserciones caigan juntas en los índices
+    order = np.lexsort((day_offsets, players))
+    players, course_rows, coefficients, day_offsets = (
+        players[order], course_rows[order], coefficients[order], day_offsets[order]
+    )
+    playing, strokes, points, adjusted = playing[order], strokes[order], points[order], adjusted[order]
+    ratings, slopes = ratings[order], slopes[order]
+
+    ids = player_ids[players].tolist()
+    course_ids = courses['ids'][course_rows].tolist()
+    return Database.scorecard_import_rows(
+        (player_id, course_id, (first_day + timedelta(days=offset)).isoformat(),
+         json.dumps(round_strokes), json.dumps(round_points), coefficient, playing_handicap,
+         score_differential(adjusted_gross, rating, slope))
+        for player_id, course_id, offset, round_strokes, round_points, coefficient, playing_handicap,
+            adjusted_gross, rating, slope
+        in zip(ids, course_ids, day_offsets.tolist(), strokes.tolist(), points.tolist(),
+               coefficients.tolist(), playing.tolist(), adjusted.tolist(), ratings.tolist(), slopes.tolist())
+    )
+
+
+def generate(db, players, courses, rounds, seed=42, years=5, end_date='2024-12-31', workers=None,
+             chunk_size=50000, log=print):
+    """
+    Genera jugadores, campos y rondas y los guarda en la base de datos.
+
+    Args:
+        db (Database): Base de datos de destino
+        players (int): Número de jugadores
+        courses (int): Número de campos
+        rounds (int): Número de rondas
+        seed (int): Semilla aleatoria
+        years (int): Años de rondas
+        end_date (str): Fecha de la última ronda posible (YYYY-MM-DD)
+        workers (int, optional): Procesos generadores (por defecto, los núcleos)
+        chunk_size (int): Rondas por bloque
+        log (callable): Función con la que se informa del progreso
+
+    Returns:
+        dict: Rondas generadas e insertadas, segundos totales y segundos de escritura
+    """
+    rng = np.random.default_rng([seed])
+    start = time.perf_counter()
+    player_rows, weights = generate_players(rng, players)
+    player_ids = np.array(db.import_players(player_rows))
+    course_rows = generate_courses(rng, courses)
+    course_ids = db.import_courses(course_rows)
+    log(f"{len(player_ids)} jugadores y {len(course_ids)} campos en {time.perf_counter() - start:.1f} s")
+
+    stroke_index = np.array([course[6] for course in course_rows])
+    course_data = {
+        'ids': np.array(course_ids),
+        'slopes': np.array([course[2] for course in course_rows], dtype=np.float64),
+        'ratings': np.array([course[3] for course in course_rows]),
+        'pars_total': np.array([course[4] for course in course_rows], dtype=np.float64),
+        'pars': np.array([course[5] for course in course_rows]),
+        'stroke_index': stroke_index,
+        'allocation': stroke_allocation_table(stroke_index)
+    }
+    player_indexes = np.array([player[2] for player in player_rows])
+    days = years * 365
+    first_day = date.fromisoformat(end_date) - timedelta(days=days - 1)
+
+    sizes = [min(chunk_size, rounds - offset) for offset in range(0, rounds, chunk_size)]
+    workers = workers or os.cpu_count() or 1
+    stats = {'generated': 0, 'inserted': 0, 'seconds': 0.0, 'write_seconds': 0.0}
+    start = time.perf_counter()
+
+    def write(rows):
+        write_start = time.perf_counter()
+        stats['inserted'] += db.import_scorecards(rows, prepared=True)
+        stats['write_seconds'] += time.perf_counter() - write_start
+        stats['generated'] += len(rows)
+        log(f"  {stats['generated']}/{rounds} rondas "
+            f"({stats['generated'] / (time.perf_counter() - start):,.0f} rondas/s)")
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Como mucho dos bloques por proceso en vuelo, para no acumular en memoria
+        # los bloques generados mientras se escriben los anteriores
+        pending = deque()
+        for chunk, size in enumerate(sizes):
+            pending.append(executor.submit(generate_rounds, seed, chunk, size, player_ids, player_indexes,
+                                           weights, course_data, first_day, days))
+            while pending and (len(pending) >= 2 * workers or pending[0].done()):
+                write(pending.popleft().result())
+        while pending:
+            write(pending.popleft().result())
+
+    stats['seconds'] = time.perf_counter() - start
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera datos sintéticos deterministas para pruebas de carga")
+    parser.add_argument('--db', default='data/synthetic.db', help="Base de datos de destino")
+    parser.add_argument('--players', type=int, default=1000, help="Número de jugadores")
+    parser.add_argument('--courses', type=int, default=50, help="Número de campos")
+    parser.add_argument('--rounds', type=int, default=100000, help="Número de rondas")
+    parser.add_argument('--years', type=int, default=5, help="Años de rondas")
+    parser.add_argument('--end-date', default='2024-12-31', help="Fecha de la última ronda posible")
+    parser.add_argument('--seed', type=int, default=42, help="Semilla aleatoria")
+    parser.add_argument('--workers', type=int, default=None, help="Procesos generadores (por defecto, los núcleos)")
+    parser.add_argument('--chunk-size', type=int, default=50000, help="Rondas por bloque")
+    parser.add_argument('--cache-mb', type=int, default=256, help="Caché de páginas de SQLite en MB")
+    parser.add_argument('--reset', action='store_true', help="Vaciar la base de datos antes de generar")
+    parser.add_argument('--recalculate-handicaps', action='store_true',
+                        help="Recalcular el historial de hándicap de todos los jugadores al terminar")
+    args = parser.parse_args()
+
+    db = Database(args.db)
+    if args.reset:
+        db.reset_database()
+    # Caché de páginas amplia para que el mantenimiento de los índices no lea
+    # del disco en cada inserción cuando la tabla crece
+    db.connection.execute(f'PRAGMA cache_size = -{args.cache_mb * 1024}')
+
+    stats = generate(db, args.players, args.courses, args.rounds, args.seed, args.years, args.end_date,
+                     args.workers, args.chunk_size)
+    print(f"{stats['inserted']} rondas guardadas ({stats['generated'] - stats['inserted']} repetidas descartadas) "
+          f"en {stats['seconds']:.1f} s: {stats['generated'] / stats['seconds']:,.0f} rondas/s, "
+          f"escritura {stats['inserted'] / max(stats['write_seconds'], 1e-9):,.0f} rondas/s")
+
+    if args.recalculate_handicaps:
+        start = time.perf_counter()
+        updated = HandicapController(db).recalculate_all(args.workers)
+        print(f"Hándicap de {len(updated)} jugadores recalculado en {time.perf_counter() - start:.1f} s")
+
+    db.connection.close()
+
+
+if __name__ == '__main__':
+    main()
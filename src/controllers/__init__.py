@@ -1,3 +1,4 @@
 from .player_controller import PlayerController
 from .course_controller import CourseController
 from .scorecard_controller import ScorecardController
+from .handicap_controller import HandicapController
@@ -1,20 +1,28 @@
 from src.database import Database
 from src.models.course import Course
-import json
+from src.utils.cache import IdentityMapCache, invalidate_caches
+from src.utils.metrics import CONTROLLER_SECONDS, ROWS_DECODED, instrument_methods
 
+@instrument_methods(CONTROLLER_SECONDS)
 class CourseController:
     """
     Controlador para gestionar operaciones relacionadas con campos de golf.
+    
+    Las salidas de cada campo se leen en la misma consulta que el campo y se
+    guardan en la instancia de Course en caché, de modo que los cálculos por
+    salida (Course.for_tee) no necesitan consultas adicionales.
     """
     
-    def __init__(self, database=None):
+    def __init__(self, database=None, cache_size=256):
         """
         Inicializa el controlador con una conexión a la base de datos.
         
         Args:
             database (Database, optional): Instancia de la base de datos
+            cache_size (int): Número máximo de campos en la caché en memoria
         """
         self.db = database or Database()
+        self.cache = IdentityMapCache(self.db, maxsize=cache_size, name='course')
     
     def add_course(self, name, location, slope, course_rating, par_total, hole_pars, hole_handicaps):
         """
@@ -115,7 +123,24 @@ class CourseController:
             
             # Actualizar en la base de datos
             self.db.update_course(course_id, name, location, slope, course_rating, par_total, hole_pars, hole_handicaps)
-            return True, "Campo actualizado correctamente."
+            invalidate_caches(self.db, 'course', course_id)
+            
+            # Los puntos de las tarjetas dependen de los pares y los hándicaps, y los
+            # diferenciales además del slope y el rating
+            previous = Course.from_db_row(course)
+            holes_changed = (previous.hole_pars != list(hole_pars)
+                             or previous.hole_handicaps != list(hole_handicaps))
+            message = "Campo actualizado correctamente."
+            if holes_changed:
+                from src.controllers.scorecard_controller import ScorecardController
+                updated = ScorecardController(self.db).recalculate_course_points(course_id)
+                if updated:
+                    message += f" Se han recalculado los puntos de {updated} tarjetas."
+            if holes_changed or previous.slope != slope or previous.course_rating != course_rating:
+                from src.controllers.handicap_controller import HandicapController
+                HandicapController(self.db, self).recalculate_course_differentials(course_id)
+            
+            return True, message
             
         except Exception as e:
             return False, f"Error al actualizar campo: {str(e)}"
@@ -131,38 +156,66 @@ class CourseController:
             Course: Instancia del campo o None si no existe
         """
         try:
+            course = self.cache.get(course_id)
+            if course is not None:
+                return course
+            
             course_data = self.db.get_course(course_id)
             if not course_data:
                 return None
             
-            # Intentar parsear los datos como JSON
-            try:
-                hole_pars = json.loads(course_data['hole_pars']) if course_data['hole_pars'] else []
-            except (json.JSONDecodeError, TypeError):
-                # Si falla, intentar el método antiguo
-                hole_pars = [int(x) for x in course_data['hole_pars'].split(',') if x.strip()] if course_data['hole_pars'] else []
-            
-            try:
-                hole_handicaps = json.loads(course_data['hole_handicaps']) if course_data['hole_handicaps'] else []
-            except (json.JSONDecodeError, TypeError):
-                # Si falla, intentar el método antiguo
-                hole_handicaps = [int(x) for x in course_data['hole_handicaps'].split(',') if x.strip()] if course_data['hole_handicaps'] else []
-            
-            return Course(
-                id=course_data['id'],
-                name=course_data['name'],
-                location=course_data['location'],
-                slope=course_data['slope'],
-                course_rating=course_data['course_rating'],
-                par_total=course_data['par_total'],
-                hole_pars=hole_pars,
-                hole_handicaps=hole_handicaps
-            )
+            course = Course.from_db_row(course_data)
+            ROWS_DECODED.inc(model='course')
+            self.cache.put(course_id, course)
+            return course
             
         except Exception as e:
             print(f"Error al obtener campo: {str(e)}")
             return None
     
+    def get_courses_by_ids(self, course_ids):
+        """
+        Obtiene varios campos por su ID con una sola consulta.
+        
+        Los campos que ya están en caché no se vuelven a consultar.
+        
+        Args:
+            course_ids (iterable): IDs de los campos
+            
+        Returns:
+            dict: Diccionario {id: Course} con los campos encontrados
+        """
+        try:
+            self.cache.sync()
+            result = {}
+            missing = []
+            
+            for course_id in set(course_ids):
+                if course_id is None:
+                    continue
+                course = self.cache.peek(course_id)
+                if course is not None:
+                    result[course_id] = course
+                else:
+                    missing.append(course_id)
+            
+            if missing:
+                for row in self.db.get_courses_by_ids(missing):
+                    try:
+                        course = Course.from_db_row(row)
+                    except Exception as e:
+                        print(f"Error al procesar campo: {str(e)}")
+                        continue
+                    self.cache.put(course.id, course)
+                    result[course.id] = course
+                    ROWS_DECODED.inc(model='course')
+            
+            return result
+            
+        except Exception as e:
+            print(f"Error al obtener campos: {str(e)}")
+            return {}
+    
     def get_courses(self):
         """
         Obtiene todos los campos.
@@ -173,32 +226,16 @@ class CourseController:
         try:
             courses_data = self.db.get_courses()
             result = []
+            self.cache.sync()
             
             for row in courses_data:
                 try:
-                    # Intentar parsear los datos como JSON
-                    try:
-                        hole_pars = json.loads(row['hole_pars']) if row['hole_pars'] else []
-                    except (json.JSONDecodeError, TypeError):
-                        # Si falla, intentar el método antiguo
-                        hole_pars = [int(x) for x in row['hole_pars'].split(',') if x.strip()] if row['hole_pars'] else []
-                    
-                    try:
-                        hole_handicaps = json.loads(row['hole_handicaps']) if row['hole_handicaps'] else []
-                    except (json.JSONDecodeError, TypeError):
-                        # Si falla, intentar el método antiguo
-                        hole_handicaps = [int(x) for x in row['hole_handicaps'].split(',') if x.strip()] if row['hole_handicaps'] else []
-                    
-                    course = Course(
-                        id=row['id'],
-                        name=row['name'],
-                        location=row['location'],
-                        slope=row['slope'],
-                        course_rating=row['course_rating'],
-                        par_total=row['par_total'],
-                        hole_pars=hole_pars,
-                        hole_handicaps=hole_handicaps
-                    )
+                    # Reutilizar la instancia en caché conserva sus tablas de hándicap
+                    course = self.cache.peek(row['id'])
+                    if course is None:
+                        course = Course.from_db_row(row)
+                        self.cache.put(course.id, course)
+                        ROWS_DECODED.inc(model='course')
                     result.append(course)
                 except Exception as e:
                     print(f"Error al procesar campo: {str(e)}")
@@ -212,6 +249,9 @@ class CourseController:
         """
         Elimina un campo por su ID.
         
+        Si se eliminan sus tarjetas, se recalcula el hándicap de los jugadores
+        que las jugaron desde la primera de ellas, igual que al eliminar una tarjeta.
+        
         Args:
             course_id (int): ID del campo
             delete_scorecards (bool): Si es True, elimina también las tarjetas asociadas
@@ -225,9 +265,158 @@ class CourseController:
             if not course:
                 return False, f"No se encontró ningún campo con ID {course_id}."
             
+            affected = self.db.get_course_first_rounds(course_id) if delete_scorecards else []
+            
             # Eliminar de la base de datos
             success, message = self.db.delete_course(course_id, delete_scorecards)
+            invalidate_caches(self.db, 'course', course_id)
+            
+            if success and affected:
+                from src.controllers.handicap_controller import HandicapController
+                handicap_controller = HandicapController(self.db, self)
+                for row in affected:
+                    handicap_controller.scorecard_changed(row['player_id'], row['date'])
             return success, message
             
         except Exception as e:
             return False, f"Error al eliminar campo: {str(e)}"
+    
+    def _validate_tee(self, course, name, slope, course_rating, par_total, yardages):
+        """
+        Valida los datos de una salida.
+        
+        Las salidas usan los pares por hoyo del campo, por lo que su par total
+        debe ser el del campo: si no, los puntos, el resultado bruto ajustado y
+        las estadísticas por hoyo no coincidirían con el resultado respecto al par.
+        
+        Args:
+            course (Course): Campo de la salida; el resto, como en add_tee
+        
+        Returns:
+            str: Mensaje de error, o None si los datos son válidos
+        """
+        if not name:
+            return "El nombre de la salida es obligatorio."
+        
+        if not isinstance(slope, (int, float)) or slope < 55 or slope > 155:
+            return "El slope debe ser un número entre 55 y 155."
+        
+        if not isinstance(course_rating, (int, float)) or course_rating < 60 or course_rating > 80:
+            return "El course rating debe ser un número entre 60 y 80."
+        
+        if not isinstance(par_total, int) or par_total < 27 or par_total > 73:
+            return "El par total debe ser un número entre 27 y 73."
+        
+        if par_total != course.par_total:
+            return f"El par de la salida ({par_total}) debe ser el del campo ({course.par_total})."
+        
+        if yardages and (len(yardages) != 18 or not all(isinstance(y, int) and y > 0 for y in yardages)):
+            return "Las distancias deben ser 18 números enteros positivos."
+        
+        return None
+    
+    def add_tee(self, course_id, name, slope, course_rating, par_total, yardages=None):
+        """
+        Añade una salida a un campo.
+        
+        Args:
+            course_id (int): ID del campo
+            name (str): Nombre de la salida
+            slope (int): Valor de slope desde la salida
+            course_rating (float): Rating desde la salida
+            par_total (int): Par total desde la salida
+            yardages (list, optional): Distancia de cada hoyo
+            
+        Returns:
+            tuple: (éxito, mensaje o ID)
+        """
+        try:
+            course = self.get_course(course_id)
+            if not course:
+                return False, f"No se encontró ningún campo con ID {course_id}."
+            
+            error = self._validate_tee(course, name, slope, course_rating, par_total, yardages)
+            if error:
+                return False, error
+            
+            if any(tee.name == name for tee in course.tees):
+                return False, f"El campo ya tiene una salida llamada {name}."
+            
+            tee_id = self.db.add_course_tee(course_id, name, slope, course_rating, par_total, yardages)
+            invalidate_caches(self.db, 'course', course_id)
+            return True, tee_id
+            
+        except Exception as e:
+            return False, f"Error al añadir salida: {str(e)}"
+    
+    def update_tee(self, tee_id, name, slope, course_rating, par_total, yardages=None):
+        """
+        Actualiza los datos de una salida.
+        
+        Si cambian el slope, el course rating o el par se recalculan los
+        diferenciales de las tarjetas del campo.
+        
+        Args:
+            tee_id (int): ID de la salida
+            name (str): Nombre de la salida
+            slope (int): Valor de slope desde la salida
+            course_rating (float): Rating desde la salida
+            par_total (int): Par total desde la salida
+            yardages (list, optional): Distancia de cada hoyo
+            
+        Returns:
+            tuple: (éxito, mensaje)
+        """
+        try:
+            previous = self.db.get_course_tee(tee_id)
+            if not previous:
+                return False, f"No se encontró ninguna salida con ID {tee_id}."
+            
+            error = self._validate_tee(
+                self.get_course(previous['course_id']), name, slope, course_rating, par_total, yardages
+            )
+            if error:
+                return False, error
+            
+            self.db.update_course_tee(tee_id, name, slope, course_rating, par_total, yardages)
+            invalidate_caches(self.db, 'course', previous['course_id'])
+            
+            if (previous['slope'], previous['course_rating'], previous['par_total']) != (slope, course_rating, par_total):
+                from src.controllers.handicap_controller import HandicapController
+                HandicapController(self.db, self).recalculate_course_differentials(previous['course_id'])
+            
+            return True, "Salida actualizada correctamente."
+            
+        except Exception as e:
+            return False, f"Error al actualizar salida: {str(e)}"
+    
+    def delete_tee(self, tee_id):
+        """
+        Elimina una salida que no tenga tarjetas.
+        
+        Args:
+            tee_id (int): ID de la salida
+            
+        Returns:
+            tuple: (éxito, mensaje)
+        """
+        try:
+            tee = self.db.get_course_tee(tee_id)
+            if not tee:
+                return False, f"No se encontró ninguna salida con ID {tee_id}."
+            
+            success, message = self.db.delete_course_tee(tee_id)
+            invalidate_caches(self.db, 'course', tee['course_id'])
+            return success, message
+            
+        except Exception as e:
+            return False, f"Error al eliminar salida: {str(e)}"
+    
+    def cache_stats(self):
+        """
+        Obtiene los contadores de la caché de campos.
+        
+        Returns:
+            dict: Aciertos, fallos, tasa de aciertos, invalidaciones y tamaño
+        """
+        return self.cache.stats()
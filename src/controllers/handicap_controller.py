@@ -0,0 +1,334 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date as date_cls, timedelta
+import os
+
+from src.database import Database
+from src.controllers.course_controller import CourseController
+from src.utils.cache import invalidate_caches
+from src.utils.metrics import CONTROLLER_SECONDS, instrument_methods
+from src.utils.handicap import (
+    WHS_DIFFERENTIALS_TABLE, WHS_WINDOW, handicap_index, round_differential
+)
+from src.utils.row_decoder import decode_hole_list
+
+
+def _calculate_handicap_chunk(db_path, player_ids):
+    """
+    Calcula el historial de hándicap de un grupo de jugadores en un proceso aparte.
+    
+    Args:
+        db_path (str): Ruta de la base de datos
+        player_ids (list): IDs de los jugadores
+    
+    Returns:
+        list: Tuplas (player_id, since, revisions, handicap) de compute_history
+    """
+    db = Database(db_path)
+    try:
+        controller = HandicapController(db)
+        return [(player_id, *controller.compute_history(player_id)) for player_id in player_ids]
+    finally:
+        db.connection.close()
+
+
+@instrument_methods(CONTROLLER_SECONDS)
+class HandicapController:
+    """
+    Controlador que calcula el índice de hándicap WHS de los jugadores.
+    
+    El índice se obtiene de los diferenciales guardados de las últimas
+    WHS_WINDOW rondas de cada jugador, que se leen con una consulta acotada por
+    el índice (player_id, date, score_differential) en lugar de recorrer todo
+    el historial. Cada cambio de índice se guarda además en el historial de
+    hándicap, con fecha efectiva el día siguiente a la ronda.
+    """
+    
+    def __init__(self, database=None, course_controller=None):
+        """
+        Inicializa el controlador con una conexión a la base de datos.
+        
+        Args:
+            database (Database, optional): Instancia de la base de datos
+            course_controller (CourseController, optional): Controlador de campos
+        """
+        self.db = database or Database()
+        self.course_controller = course_controller or CourseController(self.db)
+    
+    def get_recent_differentials(self, player_id, limit=WHS_WINDOW):
+        """
+        Obtiene los diferenciales de las últimas rondas de un jugador.
+        
+        Los diferenciales se guardan con cada tarjeta, por lo que no hace falta
+        consultar los campos ni decodificar los golpes.
+        
+        Args:
+            player_id (int): ID del jugador
+            limit (int): Número de rondas
+        
+        Returns:
+            list: Diccionarios con scorecard_id, date, course_id, total_strokes y
+                differential (None si la ronda no es válida para hándicap), de la
+                más reciente a la más antigua
+        """
+        return [{
+            'scorecard_id': row['id'],
+            'date': row['date'],
+            'course_id': row['course_id'],
+            'total_strokes': row['total_strokes'],
+            'differential': row['score_differential']
+        } for row in self.db.get_recent_player_rounds(player_id, limit)]
+    
+    def calculate_handicap_index(self, player_id):
+        """
+        Calcula el índice de hándicap actual de un jugador.
+        
+        Args:
+            player_id (int): ID del jugador
+        
+        Returns:
+            float: Índice de hándicap, o None si no tiene rondas suficientes
+        """
+        differentials = self.get_recent_differentials(player_id)
+        return handicap_index([d['differential'] for d in differentials])
+    
+    def get_handicap_evolution(self, player_id, rounds=WHS_WINDOW):
+        """
+        Obtiene las últimas rondas de un jugador con el índice vigente al jugarlas.
+        
+        El índice de cada ronda se lee del historial de hándicap con una consulta
+        "a fecha" en lugar de recalcularse.
+        
+        Args:
+            player_id (int): ID del jugador
+            rounds (int): Número de rondas a mostrar
+        
+        Returns:
+            list: Diccionarios con scorecard_id, date, course_id, course_name,
+                total_strokes, differential, handicap_index (índice vigente el día
+                de la ronda) y counted (True si el diferencial cuenta en el índice
+                actual), de la más antigua a la más reciente
+        """
+        rows = self.db.get_rounds_with_handicap({'player_id': player_id}, max(rounds, WHS_WINDOW))
+        history = [{
+            'scorecard_id': row['id'],
+            'date': row['date'],
+            'course_id': row['course_id'],
+            'course_name': row['course_name'],
+            'total_strokes': row['total_strokes'],
+            'differential': row['score_differential'],
+            'handicap_index': row['handicap_index'],
+            'counted': False
+        } for row in reversed(rows)]
+        
+        # Marcar los diferenciales que intervienen en el índice actual
+        offset = max(0, len(history) - WHS_WINDOW)
+        current = [(entry['differential'], i) for i, entry in enumerate(history[offset:])
+                   if entry['differential'] is not None]
+        rule = WHS_DIFFERENTIALS_TABLE.get(len(current))
+        if rule:
+            for _, i in sorted(current)[:rule[0]]:
+                history[offset + i]['counted'] = True
+        
+        return history[-rounds:]
+    
+    def get_handicap_as_of(self, player_id, date):
+        """
+        Obtiene el índice de hándicap vigente de un jugador en una fecha.
+        
+        Args:
+            player_id (int): ID del jugador
+            date (str): Fecha (YYYY-MM-DD)
+        
+        Returns:
+            float: Índice de hándicap, o None si no hay revisiones anteriores
+        """
+        try:
+            return self.db.get_handicap_as_of(player_id, date)
+        except Exception as e:
+            print(f"Error al obtener el hándicap: {str(e)}")
+            return None
+    
+    def get_handicap_history(self, player_id, start_date=None, end_date=None):
+        """
+        Obtiene las revisiones del índice de hándicap de un jugador.
+        
+        Args:
+            player_id (int): ID del jugador
+            start_date (str, optional): Fecha efectiva mínima (YYYY-MM-DD)
+            end_date (str, optional): Fecha efectiva máxima (YYYY-MM-DD)
+        
+        Returns:
+            list: Pares (effective_date, handicap_index) en orden cronológico
+        """
+        try:
+            return [(row['effective_date'], row['handicap_index'])
+                    for row in self.db.get_handicap_history(player_id, start_date, end_date)]
+        except Exception as e:
+            print(f"Error al obtener el historial de hándicap: {str(e)}")
+            return []
+    
+    def compute_history(self, player_id, since=None):
+        """
+        Calcula las revisiones del índice de hándicap de un jugador desde una fecha.
+        
+        Solo se leen las rondas desde ``since`` y las WHS_WINDOW anteriores, que
+        son las que intervienen en los índices a recalcular. Cada ronda genera una
+        revisión con fecha efectiva el día siguiente; si hay varias rondas el mismo
+        día, prevalece el índice tras la última.
+        
+        Args:
+            player_id (int): ID del jugador
+            since (str, optional): Fecha (YYYY-MM-DD) de la primera ronda a
+                recalcular; None para todo el historial
+        
+        Returns:
+            tuple: (since, revisions, handicap) con la fecha desde la que se ha
+                recalculado ('' para todo el historial), la lista de pares
+                (effective_date, handicap_index) y el índice actual (None si no
+                tiene rondas suficientes)
+        """
+        rows = self.db.get_player_rounds_since(player_id, since, WHS_WINDOW)
+        differentials = [row['score_differential'] for row in rows]
+        
+        revisions = {}
+        for i, row in enumerate(rows):
+            if since is not None and row['date'] < since:
+                continue
+            index = handicap_index(differentials[max(0, i + 1 - WHS_WINDOW):i + 1][::-1])
+            if index is not None:
+                effective_date = date_cls.fromisoformat(row['date']) + timedelta(days=1)
+                revisions[effective_date.isoformat()] = index
+        
+        # Aunque no quede ningún índice, las revisiones calculadas posteriores a
+        # since se sustituyen: pueden venir de una ronda eliminada o modificada.
+        # La ventana son las últimas WHS_WINDOW rondas, cuenten o no para hándicap,
+        # igual que en las revisiones y en calculate_handicap_index
+        current = handicap_index(differentials[-WHS_WINDOW:][::-1])
+        return since or '', sorted(revisions.items()), current
+    
+    def calculate_differential(self, course, strokes, playing_handicap=None):
+        """
+        Calcula el diferencial WHS de una ronda.
+        
+        Args:
+            course (Course): Campo de la ronda
+            strokes (list): Golpes por hoyo
+            playing_handicap (float, optional): Hándicap de juego de la ronda
+        
+        Returns:
+            float: Diferencial, o None si la ronda no es válida para hándicap
+        """
+        try:
+            return round_differential(strokes, course, playing_handicap)
+        except Exception as e:
+            print(f"Error al calcular el diferencial: {str(e)}")
+            return None
+    
+    def recalculate_course_differentials(self, course_id):
+        """
+        Recalcula el diferencial de todas las tarjetas de un campo.
+        
+        Se usa cuando cambian el slope, el course rating, los pares o los hándicaps
+        del campo o de sus salidas; cada tarjeta usa los valores de su salida.
+        Después se actualiza el índice de los jugadores afectados.
+        
+        Args:
+            course_id (int): ID del campo
+        
+        Returns:
+            int: Número de tarjetas actualizadas
+        """
+        course = self.course_controller.get_course(course_id)
+        if not course:
+            return 0
+        
+        rows = self.db.get_course_scorecard_rows(course_id)
+        differentials = []
+        for row in rows:
+            try:
+                strokes = decode_hole_list(row['strokes'], 'strokes')
+            except Exception as e:
+                print(f"Error al procesar tarjeta {row['id']}: {str(e)}")
+                continue
+            rated = course.for_tee(row['tee_id'])
+            differentials.append((row['id'], round_differential(strokes, rated, row['playing_handicap'])))
+        
+        updated = self.db.update_score_differentials(differentials)
+        for player_id in {row['player_id'] for row in rows}:
+            self.update_player_handicap(player_id)
+        return updated
+    
+    def update_player_handicap(self, player_id):
+        """
+        Recalcula el historial de hándicap completo de un jugador y lo guarda.
+        
+        Si el jugador no tiene rondas suficientes, su hándicap vuelve a la última
+        revisión introducida a mano.
+        
+        Args:
+            player_id (int): ID del jugador
+        
+        Returns:
+            float: Nuevo índice de hándicap, o None si no tiene rondas suficientes
+        """
+        since, revisions, index = self.compute_history(player_id)
+        self.db.save_handicap_revisions([(player_id, since, revisions, index)])
+        invalidate_caches(self.db, 'player', player_id)
+        return index
+    
+    def scorecard_changed(self, player_id, date):
+        """
+        Actualiza el hándicap de un jugador tras añadir, modificar o eliminar una tarjeta.
+        
+        Solo se recalculan las revisiones del historial posteriores a la tarjeta.
+        Si después del cambio el jugador ya no tiene rondas suficientes, su
+        hándicap vuelve a la última revisión anterior que se conserva.
+        
+        Args:
+            player_id (int): ID del jugador de la tarjeta
+            date (str): Fecha de la tarjeta (YYYY-MM-DD)
+        
+        Returns:
+            float: Nuevo índice de hándicap, o None si no tiene rondas suficientes
+        """
+        try:
+            since, revisions, index = self.compute_history(player_id, date)
+            self.db.save_handicap_revisions([(player_id, since, revisions, index)])
+            invalidate_caches(self.db, 'player', player_id)
+            return index
+        except Exception as e:
+            print(f"Error al actualizar el hándicap: {str(e)}")
+            return None
+    
+    def recalculate_all(self, workers=None, chunk_size=200):
+        """
+        Recalcula el historial y el índice de hándicap de todos los jugadores.
+        
+        Los jugadores se reparten en grupos que se calculan en paralelo con
+        varios procesos; los resultados se guardan en una sola transacción.
+        
+        Args:
+            workers (int, optional): Número de procesos (por defecto, los núcleos
+                disponibles); con 1 se calcula en el proceso actual
+            chunk_size (int): Jugadores por grupo
+        
+        Returns:
+            dict: Diccionario {player_id: índice} de los jugadores actualizados
+        """
+        player_ids = [row['id'] for row in self.db.get_players()]
+        chunks = [player_ids[i:i + chunk_size] for i in range(0, len(player_ids), chunk_size)]
+        workers = workers or os.cpu_count() or 1
+        
+        if workers == 1 or len(chunks) <= 1:
+            results = [[(player_id, *self.compute_history(player_id)) for player_id in chunk]
+                       for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+                results = list(executor.map(
+                    _calculate_handicap_chunk, [self.db.db_path] * len(chunks), chunks
+                ))
+        
+        updates = [update for chunk in results for update in chunk]
+        self.db.save_handicap_revisions(updates)
+        invalidate_caches(self.db, 'player')
+        return {player_id: index for player_id, _, _, index in updates if index is not None}
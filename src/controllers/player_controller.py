@@ -1,19 +1,24 @@
 from src.database import Database
 from src.models.player import Player
+from src.utils.cache import IdentityMapCache, invalidate_caches
+from src.utils.metrics import CONTROLLER_SECONDS, ROWS_DECODED, instrument_methods
 
+@instrument_methods(CONTROLLER_SECONDS)
 class PlayerController:
     """
     Controlador para gestionar operaciones relacionadas con jugadores.
     """
     
-    def __init__(self, database=None):
+    def __init__(self, database=None, cache_size=1024):
         """
         Inicializa el controlador con una conexión a la base de datos.
         
         Args:
             database (Database, optional): Instancia de la base de datos
+            cache_size (int): Número máximo de jugadores en la caché en memoria
         """
         self.db = database or Database()
+        self.cache = IdentityMapCache(self.db, maxsize=cache_size, name='player')
     
     def add_player(self, first_name, surname, handicap):
         """
@@ -70,6 +75,7 @@ class PlayerController:
             
             # Actualizar en la base de datos
             self.db.update_player(player_id, first_name, surname, handicap)
+            invalidate_caches(self.db, 'player', player_id)
             return True, "Jugador actualizado correctamente."
             
         except Exception as e:
@@ -86,20 +92,65 @@ class PlayerController:
             Player: Instancia del jugador o None si no existe
         """
         try:
+            player = self.cache.get(player_id)
+            if player is not None:
+                return player
+            
             player_data = self.db.get_player(player_id)
             if not player_data:
                 return None
             
-            return Player(
+            player = Player(
                 id=player_data['id'],
                 first_name=player_data['first_name'],
                 surname=player_data['surname'],
                 handicap=player_data['handicap']
             )
+            ROWS_DECODED.inc(model='player')
+            self.cache.put(player_id, player)
+            return player
             
         except Exception:
             return None
     
+    def get_players_by_ids(self, player_ids):
+        """
+        Obtiene varios jugadores por su ID con una sola consulta.
+        
+        Los jugadores que ya están en caché no se vuelven a consultar.
+        
+        Args:
+            player_ids (iterable): IDs de los jugadores
+            
+        Returns:
+            dict: Diccionario {id: Player} con los jugadores encontrados
+        """
+        try:
+            self.cache.sync()
+            result = {}
+            missing = []
+            
+            for player_id in set(player_ids):
+                if player_id is None:
+                    continue
+                player = self.cache.peek(player_id)
+                if player is not None:
+                    result[player_id] = player
+                else:
+                    missing.append(player_id)
+            
+            if missing:
+                for row in self.db.get_players_by_ids(missing):
+                    player = Player.from_db_row(row)
+                    self.cache.put(player.id, player)
+                    result[player.id] = player
+                    ROWS_DECODED.inc(model='player')
+            
+            return result
+            
+        except Exception:
+            return {}
+    
     def get_players(self):
         """
         Obtiene todos los jugadores.
@@ -109,7 +160,14 @@ class PlayerController:
         """
         try:
             players_data = self.db.get_players()
-            return [Player.from_db_row(row) for row in players_data]
+            players = [Player.from_db_row(row) for row in players_data]
+            ROWS_DECODED.inc(len(players), model='player')
+            
+            self.cache.sync()
+            for player in players:
+                self.cache.put(player.id, player)
+            
+            return players
             
         except Exception:
             return []
@@ -133,7 +191,17 @@ class PlayerController:
             
             # Eliminar de la base de datos
             success, message = self.db.delete_player(player_id, delete_scorecards)
+            invalidate_caches(self.db, 'player', player_id)
             return success, message
             
         except Exception as e:
             return False, f"Error al eliminar jugador: {str(e)}"
+    
+    def cache_stats(self):
+        """
+        Obtiene los contadores de la caché de jugadores.
+        
+        Returns:
+            dict: Aciertos, fallos, tasa de aciertos, invalidaciones y tamaño
+        """
+        return self.cache.stats()
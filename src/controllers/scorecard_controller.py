@@ -1,8 +1,16 @@
-from src.database import Database
+from src.database import Database, DuplicateScorecardError, ScorecardConflictError
+from src.controllers.handicap_controller import HandicapController
+from src.models.course import Course
 from src.models.scorecard import Scorecard
-from datetime import datetime
+from src.models.scorecard_batch import ScorecardBatch
+from src.utils.metrics import CONTROLLER_SECONDS, ROWS_DECODED, instrument_methods
+from datetime import datetime, date as date_cls
+import heapq
 import json
 
+import numpy as np
+
+@instrument_methods(CONTROLLER_SECONDS)
 class ScorecardController:
     """
     Controlador para gestionar operaciones relacionadas con tarjetas de puntuación.
@@ -16,8 +24,10 @@ class ScorecardController:
             database (Database, optional): Instancia de la base de datos
         """
         self.db = database or Database()
+        self.handicap_controller = HandicapController(self.db)
     
-    def add_scorecard(self, player_id, course_id, date, strokes, points, handicap_coefficient, playing_handicap=None):
+    def add_scorecard(self, player_id, course_id, date, strokes, points, handicap_coefficient, playing_handicap=None,
+                      tee_id=None):
         """
         Añade una nueva tarjeta de puntuación.
         
@@ -29,56 +39,169 @@ class ScorecardController:
             points (list): Lista de puntos stableford por hoyo
             handicap_coefficient (int): Coeficiente de hándicap aplicado (como porcentaje)
             playing_handicap (float, optional): Hándicap de juego final
+            tee_id (int, optional): ID de la salida desde la que se jugó
             
         Returns:
             int: ID de la tarjeta creada, o None si falla
         """
         try:
-            # Validaciones
-            if not player_id or not course_id:
-                return False, "El jugador y el campo son obligatorios."
-            
-            # Verificar que el jugador existe
-            player = self.db.get_player(player_id)
-            if not player:
-                return False, f"No se encontró ningún jugador con ID {player_id}."
-            
-            # Verificar que el campo existe
-            course = self.db.get_course(course_id)
-            if not course:
-                return False, f"No se encontró ningún campo con ID {course_id}."
-            
-            # Validar fecha
-            try:
-                datetime.strptime(date, "%Y-%m-%d")
-            except ValueError:
-                return False, "Formato de fecha inválido. Use YYYY-MM-DD."
-            
-            # Validar listas
-            if not all(isinstance(s, int) for s in strokes):
-                return False, "Los golpes deben ser números enteros."
-                
-            if not all(isinstance(p, int) for p in points):
-                return False, "Los puntos deben ser números enteros."
+            error, course = self._validate_scorecard(player_id, course_id, date, strokes, points, tee_id)
+            if error:
+                return False, error
             
             # Convertir listas a JSON
             strokes_json = json.dumps(strokes)
             points_json = json.dumps(points)
             
+            # Calcular el diferencial WHS de la ronda con el slope y el rating de la salida
+            score_differential = self.handicap_controller.calculate_differential(
+                course, strokes, playing_handicap
+            )
+            
             # Añadir a la base de datos
             scorecard_id = self.db.add_scorecard(
                 player_id, course_id, date, strokes_json, points_json, 
-                handicap_coefficient, playing_handicap
+                handicap_coefficient, playing_handicap, score_differential, tee_id
             )
             
             if scorecard_id:
+                self.handicap_controller.scorecard_changed(player_id, date)
                 return True, scorecard_id
             else:
                 return False, "Error al guardar la tarjeta en la base de datos."
                 
+        except DuplicateScorecardError as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"Error: {str(e)}"
+    
+    def upsert_scorecard(self, player_id, course_id, date, strokes, points, handicap_coefficient, playing_handicap=None,
+                         tee_id=None):
+        """
+        Añade una tarjeta o actualiza la misma ronda si ya estaba guardada.
+        
+        Es idempotente: repetir la operación (por ejemplo, al reintentar una
+        importación) no crea tarjetas duplicadas.
+        
+        Args:
+            player_id (int): ID del jugador
+            course_id (int): ID del campo
+            date (str): Fecha en formato YYYY-MM-DD
+            strokes (list): Lista de golpes por hoyo
+            points (list): Lista de puntos stableford por hoyo
+            handicap_coefficient (int): Coeficiente de hándicap aplicado (como porcentaje)
+            playing_handicap (float, optional): Hándicap de juego final
+            tee_id (int, optional): ID de la salida desde la que se jugó
+            
+        Returns:
+            tuple: (True, ID de la tarjeta) o (False, mensaje de error)
+        """
+        try:
+            error, course = self._validate_scorecard(player_id, course_id, date, strokes, points, tee_id)
+            if error:
+                return False, error
+            
+            score_differential = self.handicap_controller.calculate_differential(
+                course, strokes, playing_handicap
+            )
+            scorecard_id = self.db.upsert_scorecard(
+                player_id, course_id, date, json.dumps(strokes), json.dumps(points),
+                handicap_coefficient, playing_handicap, score_differential, tee_id
+            )
+            self.handicap_controller.scorecard_changed(player_id, date)
+            return True, scorecard_id
         except Exception as e:
             return False, f"Error: {str(e)}"
     
+    def import_scorecards(self, scorecards):
+        """
+        Importa varias tarjetas descartando las rondas que ya existen.
+        
+        Las repetidas se descartan en la base de datos con el índice único de la
+        clave de ronda, por lo que reintentar una importación es seguro.
+        
+        Args:
+            scorecards (iterable): Diccionarios con player_id, course_id, date, strokes,
+                points, handicap_coefficient y, opcionalmente, playing_handicap y tee_id
+            
+        Returns:
+            tuple: (tarjetas insertadas, tarjetas descartadas por repetidas o no válidas)
+        """
+        scorecards = list(scorecards)
+        try:
+            courses = self.handicap_controller.course_controller.get_courses_by_ids(
+                {card['course_id'] for card in scorecards}
+            )
+            
+            rows = []
+            first_dates = {}
+            for card in scorecards:
+                course = courses.get(card['course_id'])
+                tee_id = card.get('tee_id')
+                if not course or (tee_id is not None and course.get_tee(tee_id) is None):
+                    continue
+                playing_handicap = card.get('playing_handicap')
+                rows.append((
+                    card['player_id'], card['course_id'], card['date'],
+                    json.dumps(card['strokes']), json.dumps(card['points']),
+                    card['handicap_coefficient'], playing_handicap,
+                    self.handicap_controller.calculate_differential(
+                        course.for_tee(tee_id), card['strokes'], playing_handicap
+                    ),
+                    tee_id
+                ))
+                player_id = card['player_id']
+                first_dates[player_id] = min(card['date'], first_dates.get(player_id, card['date']))
+            
+            inserted = self.db.import_scorecards(rows)
+            if inserted:
+                for player_id, date in first_dates.items():
+                    self.handicap_controller.scorecard_changed(player_id, date)
+            return inserted, len(scorecards) - inserted
+        except Exception as e:
+            print(f"Error al importar tarjetas: {str(e)}")
+            return 0, len(scorecards)
+    
+    def _validate_scorecard(self, player_id, course_id, date, strokes, points, tee_id=None):
+        """
+        Valida los datos de una tarjeta nueva.
+        
+        Returns:
+            tuple: (mensaje de error o None, Course de la tarjeta con los valores
+                de su salida)
+        """
+        if not player_id or not course_id:
+            return "El jugador y el campo son obligatorios.", None
+        
+        # Verificar que el jugador existe
+        player = self.db.get_player(player_id)
+        if not player:
+            return f"No se encontró ningún jugador con ID {player_id}.", None
+        
+        # Verificar que el campo existe
+        course = self.db.get_course(course_id)
+        if not course:
+            return f"No se encontró ningún campo con ID {course_id}.", None
+        
+        # Validar fecha
+        try:
+            datetime.strptime(date, "%Y-%m-%d")
+        except ValueError:
+            return "Formato de fecha inválido. Use YYYY-MM-DD.", None
+        
+        # Validar listas
+        if not all(isinstance(s, int) for s in strokes):
+            return "Los golpes deben ser números enteros.", None
+        
+        if not all(isinstance(p, int) for p in points):
+            return "Los puntos deben ser números enteros.", None
+        
+        course = Course.from_db_row(course)
+        if tee_id is not None and course.get_tee(tee_id) is None:
+            return f"La salida {tee_id} no pertenece al campo {course.name}.", None
+        
+        return None, course.for_tee(tee_id)
+    
     def get_scorecard(self, scorecard_id):
         """
         Obtiene una tarjeta por su ID.
@@ -95,6 +218,7 @@ class ScorecardController:
                 return None
             
             # Usar el método from_joined_row del modelo Scorecard
+            ROWS_DECODED.inc(model='scorecard')
             return Scorecard.from_joined_row(scorecard_data)
             
         except Exception as e:
@@ -125,15 +249,16 @@ class ScorecardController:
                     print(f"Error al procesar tarjeta: {str(e)}")
                     continue
             
+            ROWS_DECODED.inc(len(result), model='scorecard')
             return result
             
         except Exception as e:
             print(f"Error al obtener tarjetas: {str(e)}")
             return []
     
-    def search_scorecards(self, filters=None):
+    def search_scorecards(self, filters=None, limit=None, offset=0):
         """
-        Busca tarjetas aplicando filtros.
+        Busca tarjetas aplicando filtros, de la más reciente a la más antigua.
         
         Args:
             filters (dict): Diccionario con los filtros a aplicar
@@ -143,43 +268,83 @@ class ScorecardController:
                 - end_date: Fecha de fin (YYYY-MM-DD)
                 - player_name: Nombre parcial del jugador
                 - course_name: Nombre parcial del campo
+                - to_par_min: Resultado mínimo respecto al par (golpes - par de la salida)
+                - to_par_max: Resultado máximo respecto al par (golpes - par de la salida)
+            limit (int, optional): Límite de resultados (sin límite por defecto)
+            offset (int): Desplazamiento para paginación
             
         Returns:
             list: Lista de instancias de Scorecard
         """
         try:
-            scorecards_data = self.db.search_scorecards(filters)
+            scorecards_data = self.db.search_scorecards(filters, limit, offset)
             result = []
             
             for row in scorecards_data:
                 try:
-                    # Convertir strings a listas, filtrando valores vacíos
-                    strokes = [int(x) for x in row['strokes'].split(',') if x.strip()] if row['strokes'] else []
-                    points = [int(x) for x in row['points'].split(',') if x.strip()] if row['points'] else []
-                    
-                    scorecard = Scorecard(
-                        id=row['id'],
-                        player_id=row['player_id'],
-                        course_id=row['course_id'],
-                        date=row['date'],
-                        strokes=strokes,
-                        points=points,
-                        handicap_coefficient=row['handicap_coefficient'],
-                        playing_handicap=row['playing_handicap'],
-                        player_name=f"{row['first_name']} {row['surname']}",
-                        course_name=row['name']
-                    )
-                    result.append(scorecard)
+                    result.append(Scorecard.from_joined_row(row))
                 except Exception as e:
                     print(f"Error al procesar tarjeta filtrada: {str(e)}")
                     continue
                 
+            ROWS_DECODED.inc(len(result), model='scorecard')
             return result
             
         except Exception as e:
             print(f"Error al filtrar tarjetas: {str(e)}")
             return []
     
+    def get_scorecard_batch(self, filters=None):
+        """
+        Carga las tarjetas que cumplen los filtros en un lote columnar.
+        
+        Args:
+            filters (dict, optional): Mismos filtros que search_scorecards
+            
+        Returns:
+            ScorecardBatch: Lote con las tarjetas filtradas
+        """
+        courses = {row['id']: Course.from_db_row(row) for row in self.db.get_courses()}
+        batch = ScorecardBatch.from_rows(self.db.search_scorecards(filters), courses)
+        ROWS_DECODED.inc(len(courses), model='course')
+        ROWS_DECODED.inc(len(batch), model='scorecard_batch')
+        return batch
+    
+    def recalculate_course_points(self, course_id):
+        """
+        Recalcula los puntos stableford de todas las tarjetas de un campo.
+        
+        Se usa cuando cambian los pares o los hándicaps de los hoyos. Las tarjetas
+        se cargan en un ScorecardBatch y los golpes recibidos y los puntos se
+        calculan en una sola pasada vectorizada; solo se escriben las tarjetas
+        cuyos puntos cambian.
+        
+        Args:
+            course_id (int): ID del campo
+            
+        Returns:
+            int: Número de tarjetas actualizadas
+        """
+        try:
+            row = self.db.get_course(course_id)
+            if not row:
+                return 0
+            
+            rows = self.db.get_course_scorecard_rows(course_id)
+            batch = ScorecardBatch.from_rows(rows, {course_id: Course.from_db_row(row)})
+            if not len(batch):
+                return 0
+            
+            points = batch.stableford_points()
+            changed = np.flatnonzero((points != batch.points).any(axis=1))
+            totals = points.sum(axis=1, dtype=np.int32)
+            return self.db.update_scorecard_points(
+                (int(batch.ids[i]), json.dumps(points[i].tolist()), int(totals[i])) for i in changed
+            )
+        except Exception as e:
+            print(f"Error al recalcular los puntos: {str(e)}")
+            return 0
+    
     def delete_scorecard(self, scorecard_id):
         """
         Elimina una tarjeta.
@@ -191,12 +356,17 @@ class ScorecardController:
             bool: True si se eliminó correctamente, False en caso contrario
         """
         try:
-            return self.db.delete_scorecard(scorecard_id)
+            current = self.db.get_scorecard(scorecard_id)
+            success = self.db.delete_scorecard(scorecard_id)
+            if success and current:
+                self.handicap_controller.scorecard_changed(current['player_id'], current['date'])
+            return success
         except Exception:
             return False
             
     def update_scorecard(self, scorecard_id, player_id=None, course_id=None, date=None, 
-                         strokes=None, points=None, handicap_coefficient=None, playing_handicap=None):
+                         strokes=None, points=None, handicap_coefficient=None, playing_handicap=None,
+                         expected_version=None, tee_id=None):
         """
         Actualiza una tarjeta existente.
         
@@ -209,9 +379,17 @@ class ScorecardController:
             points (list, optional): Nueva lista de puntos stableford
             handicap_coefficient (int, optional): Nuevo coeficiente de hándicap
             playing_handicap (float, optional): Nuevo hándicap de juego
+            expected_version (int, optional): Versión de la tarjeta que se leyó antes de
+                editarla; por defecto, la versión actual
+            tee_id (int, optional): Nueva salida; si se cambia de campo y no se indica,
+                la ronda pasa a usar los valores del nuevo campo
             
         Returns:
             bool: True si se actualizó correctamente, False en caso contrario
+            
+        Raises:
+            ScorecardConflictError: Si otro usuario ha modificado la tarjeta desde que
+                se leyó; hay que volver a leerla y repetir los cambios
         """
         try:
             # Obtener la tarjeta actual
@@ -227,18 +405,46 @@ class ScorecardController:
             points = points if points is not None else current.points
             handicap_coefficient = handicap_coefficient if handicap_coefficient is not None else current.handicap_coefficient
             playing_handicap = playing_handicap if playing_handicap is not None else current.playing_handicap
+            requested_tee = tee_id
+            tee_id = tee_id if tee_id is not None else current.tee_id
             
             # Convertir listas a JSON
             strokes_json = json.dumps(strokes)
             points_json = json.dumps(points)
             
+            # Recalcular el diferencial WHS de la ronda con los valores de su salida
+            course = self.handicap_controller.course_controller.get_course(course_id)
+            score_differential = None
+            if course:
+                if tee_id is not None and course.get_tee(tee_id) is None:
+                    if requested_tee is not None:
+                        print(f"La salida {tee_id} no pertenece al campo {course.name}.")
+                        return False
+                    # La salida era del campo anterior
+                    tee_id = None
+                score_differential = self.handicap_controller.calculate_differential(
+                    course.for_tee(tee_id), strokes, playing_handicap
+                )
+            
             # Actualizar en la base de datos
+            # La escritura es condicional a la versión: si otro usuario ha guardado
+            # entretanto, no se sobrescriben sus cambios
+            if expected_version is None:
+                expected_version = current.version
             success = self.db.update_scorecard(
                 scorecard_id, player_id, course_id, date, strokes_json, points_json,
-                handicap_coefficient, playing_handicap
+                handicap_coefficient, playing_handicap, score_differential, expected_version, tee_id
             )
             
+            if success:
+                # Recalcular el hándicap del jugador anterior y del nuevo si ha cambiado
+                self.handicap_controller.scorecard_changed(player_id, min(date, current.date))
+                if current.player_id != player_id:
+                    self.handicap_controller.scorecard_changed(current.player_id, current.date)
+            
             return success
+        except ScorecardConflictError:
+            raise
         except Exception as e:
             print(f"Error al actualizar tarjeta: {e}")
             return False
@@ -266,3 +472,235 @@ class ScorecardController:
                 'worst_round': 0,
                 'avg_points': 0
             }
+    
+    def get_player_stats(self, player_id, date_range=None):
+        """
+        Obtiene las estadísticas de un jugador sobre todo su historial.
+        
+        Args:
+            player_id (int): ID del jugador
+            date_range (tuple, optional): (fecha_inicio, fecha_fin) en formato YYYY-MM-DD;
+                cualquiera de las dos puede ser None
+            
+        Returns:
+            dict: Estadísticas con las claves:
+                - total_rounds: Número de rondas
+                - avg_strokes, avg_points, avg_to_par: Medias (None si no hay rondas)
+                - best_gross, worst_gross, best_to_par, worst_to_par, best_points,
+                  worst_points: Diccionario con scorecard_id, date, course_id,
+                  course_name, total_strokes, total_points y to_par de la ronda,
+                  o None si no hay rondas
+        """
+        stats = {
+            'total_rounds': 0,
+            'avg_strokes': None,
+            'avg_points': None,
+            'avg_to_par': None
+        }
+        for kind, _, _ in self.db.PLAYER_STATS_EXTREMES:
+            stats[kind] = None
+        
+        start_date, end_date = date_range if date_range else (None, None)
+        
+        try:
+            rows = self.db.get_player_stats(player_id, start_date, end_date)
+        except Exception as e:
+            print(f"Error al obtener estadísticas del jugador: {str(e)}")
+            return stats
+        
+        for row in rows:
+            if row['kind'] == 'summary':
+                stats['total_rounds'] = row['rounds']
+                stats['avg_strokes'] = row['total_strokes']
+                stats['avg_points'] = row['total_points']
+                stats['avg_to_par'] = row['to_par']
+            else:
+                stats[row['kind']] = {
+                    'scorecard_id': row['id'],
+                    'date': row['date'],
+                    'course_id': row['course_id'],
+                    'course_name': row['course_name'],
+                    'total_strokes': row['total_strokes'],
+                    'total_points': row['total_points'],
+                    'to_par': row['to_par']
+                }
+        
+        return stats
+    
+    # Etiquetas de la distribución de resultados por hoyo (de -2 o mejor a +3 o peor)
+    SCORE_DISTRIBUTION_LABELS = ('eagle', 'birdie', 'par', 'bogey', 'double_bogey', 'triple_bogey')
+    
+    def get_course_stats(self, course_id, date_range=None, tee_id=None):
+        """
+        Obtiene las estadísticas de un campo y de cada uno de sus hoyos.
+        
+        Las tarjetas se cargan en una sola consulta y se procesan en un
+        ScorecardBatch, de modo que las medias por hoyo se calculan de forma
+        vectorizada sobre todo el historial del campo. Las salidas llegan con
+        el campo, así que el desglose por salida no necesita más consultas.
+        
+        Args:
+            course_id (int): ID del campo
+            date_range (tuple, optional): (fecha_inicio, fecha_fin) en formato YYYY-MM-DD;
+                cualquiera de las dos puede ser None
+            tee_id (int, optional): Limitar las estadísticas a las rondas de una salida
+            
+        Returns:
+            dict: Estadísticas con las claves:
+                - total_rounds: Número de rondas
+                - avg_strokes, avg_points, avg_to_par: Medias (None si no hay rondas)
+                - best_round, worst_round: Diccionario con scorecard_id, player_id, date,
+                  total_strokes, total_points y to_par de la ronda, o None
+                - holes: Lista con un diccionario por hoyo (hole, par, stroke_index,
+                  rounds, avg_strokes, avg_to_par, distribution y difficulty_rank)
+                - tees: Lista con un diccionario por salida con rondas (tee_id, name,
+                  slope, course_rating, rounds, avg_strokes, avg_points y
+                  avg_over_rating); tee_id None agrupa las rondas sin salida
+        """
+        stats = {
+            'total_rounds': 0,
+            'avg_strokes': None,
+            'avg_points': None,
+            'avg_to_par': None,
+            'best_round': None,
+            'worst_round': None,
+            'holes': [],
+            'tees': []
+        }
+        
+        try:
+            row = self.db.get_course(course_id)
+            if not row:
+                return stats
+            
+            course = Course.from_db_row(row)
+            start_date, end_date = date_range if date_range else (None, None)
+            rows = self.db.get_course_scorecard_rows(course_id, start_date, end_date)
+            batch = ScorecardBatch.from_rows(rows, {course_id: course})
+            if tee_id is not None:
+                batch = batch.select(batch.tee_ids == tee_id)
+        except Exception as e:
+            print(f"Error al obtener estadísticas del campo: {str(e)}")
+            return stats
+        
+        if not len(batch):
+            return stats
+        
+        total_strokes = batch.total_strokes()
+        total_points = batch.total_points()
+        to_par = batch.to_par()
+        
+        def round_summary(index):
+            return {
+                'scorecard_id': int(batch.ids[index]),
+                'player_id': int(batch.player_ids[index]),
+                'date': date_cls.fromordinal(int(batch.date_ordinals[index])).isoformat(),
+                'total_strokes': int(total_strokes[index]),
+                'total_points': int(total_points[index]),
+                'to_par': int(to_par[index])
+            }
+        
+        stats['total_rounds'] = len(batch)
+        stats['avg_strokes'] = float(total_strokes.mean())
+        stats['avg_points'] = float(total_points.mean())
+        stats['avg_to_par'] = float(to_par.mean())
+        # Las tarjetas llegan ordenadas por fecha descendente: argmin/argmax toman la más reciente
+        stats['best_round'] = round_summary(int(np.argmin(to_par)))
+        stats['worst_round'] = round_summary(int(np.argmax(to_par)))
+        
+        played = np.count_nonzero(batch.strokes, axis=0)
+        averages = batch.hole_averages()
+        to_par_averages = batch.hole_to_par_averages()
+        distribution = batch.score_distribution()
+        rank = batch.difficulty_rank()
+        
+        for hole in range(batch.HOLES):
+            has_data = bool(played[hole])
+            stats['holes'].append({
+                'hole': hole + 1,
+                'par': int(batch.course_pars[0, hole]),
+                'stroke_index': int(batch.course_stroke_index[0, hole]),
+                'rounds': int(played[hole]),
+                'avg_strokes': float(averages[hole]) if has_data else None,
+                'avg_to_par': float(to_par_averages[hole]) if has_data else None,
+                'distribution': dict(zip(self.SCORE_DISTRIBUTION_LABELS,
+                                         distribution[hole].tolist())),
+                'difficulty_rank': int(rank[hole])
+            })
+        
+        # Desglose por salida: cada grupo se compara con el rating desde el que se jugó
+        for tee in [None] + course.tees:
+            mask = batch.tee_ids == (tee.id if tee else 0)
+            rounds = int(np.count_nonzero(mask))
+            if not rounds:
+                continue
+            rated = course.for_tee(tee.id) if tee else course
+            avg_strokes = float(total_strokes[mask].mean())
+            stats['tees'].append({
+                'tee_id': tee.id if tee else None,
+                'name': tee.name if tee else None,
+                'slope': rated.slope,
+                'course_rating': rated.course_rating,
+                'rounds': rounds,
+                'avg_strokes': avg_strokes,
+                'avg_points': float(total_points[mask].mean()),
+                'avg_over_rating': avg_strokes - rated.course_rating
+            })
+        
+        return stats
+    
+    TOP_ROUND_METRICS = ('gross', 'to_par', 'net', 'stableford')
+    
+    def top_rounds(self, metric='to_par', n=10, filters=None):
+        """
+        Obtiene las mejores rondas según una métrica.
+        
+        - gross, net y stableford se resuelven con una consulta ordenada por índice
+          y LIMIT n (net con el índice de la expresión golpes - hándicap de juego).
+        - to_par usa el índice (course_id, tee_id, total_strokes): como el par es
+          fijo en cada salida (o en el campo para las rondas sin salida), las n
+          mejores rondas respecto al par están entre las n de menos golpes de cada
+          salida, que se obtienen en una consulta y se combinan con un heap.
+        
+        Args:
+            metric (str): 'gross', 'to_par', 'net' o 'stableford'
+            n (int): Número de rondas
+            filters (dict, optional): Filtros admitidos por search_scorecards
+            
+        Returns:
+            list: Diccionarios con scorecard_id, player_id, player_name, course_id,
+                course_name, date, total_strokes, total_points, to_par y net,
+                ordenados de mejor a peor
+            
+        Raises:
+            ValueError: Si la métrica no es válida
+        """
+        if metric not in self.TOP_ROUND_METRICS:
+            raise ValueError(f"Métrica no válida: {metric}")
+        
+        filters = dict(filters or {})
+        
+        try:
+            if metric in self.db.INDEXED_TOP_METRICS:
+                rows = self.db.get_top_rounds(metric, n, filters)
+            else:
+                candidates = self.db.get_top_rounds_per_course(n, filters)
+                rows = heapq.nsmallest(
+                    n, candidates, key=lambda row: (row['total_strokes'] - row['par_total'], -row['id'])
+                )
+        except Exception as e:
+            print(f"Error al obtener las mejores rondas: {str(e)}")
+            return []
+        
+        return [{
+            'scorecard_id': row['id'],
+            'player_id': row['player_id'],
+            'player_name': f"{row['first_name']} {row['surname']}",
+            'course_id': row['course_id'],
+            'course_name': row['course_name'],
+            'date': row['date'],
+            'total_strokes': row['total_strokes'],
+            'total_points': row['total_points'],
+            'to_par': row['total_strokes'] - row['par_total'],
+            'net': row['total_strokes'] - row['playing_handicap'] if row['playing_handicap'] is not None else None
+        } for row in rows]
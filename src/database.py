@@ -1,19 +1,73 @@
 import sqlite3
 import os
 from datetime import datetime
+import hashlib
 import json
 
+from src.models.course import Course
+from src.utils.db_retry import (
+    LockWaitMetrics, busy_timeout_from_env, max_retries_from_env,
+    retry_delay_from_env, retry_on_busy
+)
+from src.utils.handicap import round_differential
+from src.utils.metrics import DB_SECONDS, count_statement, instrument_methods
+from src.utils.row_decoder import HoleDataError, decode_hole_list
+
+
+class DuplicateScorecardError(Exception):
+    """
+    Error al guardar una tarjeta idéntica a otra existente (mismo jugador, campo,
+    fecha y golpes).
+    
+    Atributos:
+        scorecard_id (int): ID de la tarjeta existente
+    """
+    
+    def __init__(self, scorecard_id):
+        super().__init__(f"Ya existe una tarjeta idéntica (ID {scorecard_id}).")
+        self.scorecard_id = scorecard_id
+
+
+class ScorecardConflictError(Exception):
+    """
+    Error al modificar una tarjeta que otro usuario ha cambiado desde que se leyó.
+    
+    Atributos:
+        scorecard_id (int): ID de la tarjeta
+        current_version (int): Versión actual de la tarjeta en la base de datos
+    """
+    
+    def __init__(self, scorecard_id, current_version):
+        super().__init__(
+            f"La tarjeta {scorecard_id} ha sido modificada por otro usuario (versión {current_version})."
+        )
+        self.scorecard_id = scorecard_id
+        self.current_version = current_version
+
+
+@instrument_methods(DB_SECONDS)
 class Database:
     """
     Clase para gestionar la conexión y operaciones con la base de datos SQLite.
+    
+    La duración de cada método público y las sentencias ejecutadas se
+    registran en las métricas del proceso (src.utils.metrics).
     """
     
-    def __init__(self, db_name='data/golf.db'):
+    def __init__(self, db_name='data/golf.db', busy_timeout=None, max_retries=None, retry_delay=None):
         """
         Inicializa la conexión a la base de datos y crea las tablas si no existen.
         
+        Los valores por defecto de los parámetros de bloqueo se leen de las
+        variables de entorno GOLF_DB_BUSY_TIMEOUT, GOLF_DB_MAX_RETRIES y
+        GOLF_DB_RETRY_DELAY (ver src.utils.db_retry).
+        
         Args:
             db_name (str): Nombre del archivo de base de datos
+            busy_timeout (int, optional): Espera máxima por un bloqueo de otro
+                proceso antes de fallar con "database is locked", en ms
+            max_retries (int, optional): Reintentos de una escritura bloqueada
+            retry_delay (int, optional): Espera antes del primer reintento, en ms
         """
         # Determinar la ruta base del proyecto (directorio raíz)
         base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -25,15 +79,34 @@ class Database:
         if '/' in db_name or '\\' in db_name:
             os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
         
+        # Política de bloqueos para varios procesos escribiendo a la vez
+        self.busy_timeout = busy_timeout_from_env() if busy_timeout is None else busy_timeout
+        self.max_retries = max_retries_from_env() if max_retries is None else max_retries
+        self.retry_delay_ms = retry_delay_from_env() if retry_delay is None else retry_delay
+        self.lock_metrics = LockWaitMetrics()
+        
         # Conectar a la base de datos
-        self.connection = sqlite3.connect(self.db_path)
+        self.connection = sqlite3.connect(self.db_path, timeout=self.busy_timeout / 1000)
         
         # Configurar para obtener filas como diccionarios
         self.connection.row_factory = sqlite3.Row
         
+        # Contar las sentencias ejecutadas en las métricas
+        self.connection.set_trace_callback(count_statement)
+        
         # Crear las tablas si no existen
         self.create_tables()
     
+    def lock_stats(self):
+        """
+        Obtiene las métricas de espera por bloqueos de las escrituras de esta conexión.
+        
+        Returns:
+            dict: Contadores de LockWaitMetrics.stats
+        """
+        return self.lock_metrics.stats()
+
+    @retry_on_busy
     def create_tables(self):
         """Crea las tablas necesarias si no existen"""
         with self.connection:
@@ -67,22 +140,391 @@ class Database:
                     points TEXT NOT NULL,
                     handicap_coefficient INTEGER NOT NULL,
                     playing_handicap REAL,
+                    total_strokes INTEGER,
+                    total_points INTEGER,
+                    score_differential REAL,
+                    round_hash TEXT,
+                    version INTEGER NOT NULL DEFAULT 1,
                     FOREIGN KEY (player_id) REFERENCES players(id),
                     FOREIGN KEY (course_id) REFERENCES courses(id)
                 )
             ''')
+            # Salidas de cada campo; el índice único sirve también para leerlas por campo
+            self.connection.execute('''
+                CREATE TABLE IF NOT EXISTS course_tees (
+                    id INTEGER PRIMARY KEY,
+                    course_id INTEGER NOT NULL,
+                    name TEXT NOT NULL,
+                    slope INTEGER NOT NULL,
+                    course_rating REAL NOT NULL,
+                    par_total INTEGER NOT NULL,
+                    yardages TEXT NOT NULL DEFAULT '[]',
+                    FOREIGN KEY (course_id) REFERENCES courses(id)
+                )
+            ''')
+            self.connection.execute('''
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_course_tees_course_name
+                ON course_tees (course_id, name)
+            ''')
+            
+            # Historial del índice de hándicap: una revisión por jugador y fecha efectiva,
+            # agrupada físicamente por jugador para las consultas "a fecha". computed
+            # distingue las revisiones calculadas a partir de las rondas de las
+            # introducidas a mano
+            history_exists = self.connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'handicap_history'"
+            ).fetchone()
+            self.connection.execute('''
+                CREATE TABLE IF NOT EXISTS handicap_history (
+                    player_id INTEGER NOT NULL,
+                    effective_date TEXT NOT NULL,
+                    handicap_index REAL NOT NULL,
+                    computed INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (player_id, effective_date),
+                    FOREIGN KEY (player_id) REFERENCES players(id)
+                ) WITHOUT ROWID
+            ''')
+            if not history_exists:
+                # El historial empieza con el hándicap actual de cada jugador
+                self.connection.execute('''
+                    INSERT INTO handicap_history (player_id, effective_date, handicap_index)
+                    SELECT id, ?, handicap FROM players
+                ''', (self.INITIAL_HANDICAP_DATE,))
+            
+            # Migrar bases de datos creadas con versiones anteriores
+            self._ensure_column('scorecards', 'total_strokes', 'INTEGER')
+            self._ensure_column('scorecards', 'total_points', 'INTEGER')
+            self._backfill_scorecard_totals()
+            if self._ensure_column('scorecards', 'score_differential', 'REAL'):
+                self._backfill_score_differentials()
+            if self._ensure_column('scorecards', 'round_hash', 'TEXT'):
+                self._backfill_round_hashes()
+            self._ensure_column('scorecards', 'version', 'INTEGER NOT NULL DEFAULT 1')
+            if self._ensure_column('handicap_history', 'computed', 'INTEGER NOT NULL DEFAULT 0'):
+                self._backfill_computed_revisions()
+            # Salida desde la que se jugó la ronda (NULL: valores del propio campo)
+            self._ensure_column('scorecards', 'tee_id', 'INTEGER REFERENCES course_tees(id)')
+            
+            # Las mejores rondas respecto al par se buscan por salida, porque cada una
+            # tiene su propio par
+            self.connection.execute('DROP INDEX IF EXISTS idx_scorecards_course_total')
+            self.connection.execute('''
+                CREATE INDEX IF NOT EXISTS idx_scorecards_course_tee_total
+                ON scorecards (course_id, tee_id, total_strokes)
+            ''')
+            # El diferencial se incluye en el índice para que la ventana de hándicap
+            # de un jugador se lea sin acceder a la tabla
+            self.connection.execute('DROP INDEX IF EXISTS idx_scorecards_player_date')
+            self.connection.execute('''
+                CREATE INDEX IF NOT EXISTS idx_scorecards_player_date_differential
+                ON scorecards (player_id, date, score_differential)
+            ''')
+            self.connection.execute('''
+                CREATE INDEX IF NOT EXISTS idx_scorecards_total_strokes
+                ON scorecards (total_strokes)
+            ''')
+            self.connection.execute('''
+                CREATE INDEX IF NOT EXISTS idx_scorecards_total_points
+                ON scorecards (total_points)
+            ''')
+            # Resultado neto (golpes menos hándicap de juego) para la clasificación neta;
+            # al ser un índice de expresión no hay columna que mantener en cada escritura
+            self.connection.execute('''
+                CREATE INDEX IF NOT EXISTS idx_scorecards_net
+                ON scorecards (total_strokes - playing_handicap)
+            ''')
+            # Una misma ronda (jugador, campo, fecha y golpes) solo puede guardarse una vez
+            self.connection.execute('''
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_scorecards_round_hash
+                ON scorecards (round_hash)
+            ''')
+            
+            self._create_change_log()
+
+    # Tablas cuyos cambios se registran en change_log y columna que se guarda como
+    # row_id; handicap_history no tiene id (es WITHOUT ROWID), así que se registra
+    # el jugador cuyo historial ha cambiado
+    CHANGE_LOG_TABLES = {
+        'players': 'id',
+        'courses': 'id',
+        'course_tees': 'id',
+        'scorecards': 'id',
+        'handicap_history': 'player_id',
+    }
+
+    def _create_change_log(self):
+        """
+        Crea el registro de cambios y los triggers que lo alimentan.
+        
+        Cada inserción, modificación o eliminación en CHANGE_LOG_TABLES añade una
+        fila a change_log dentro de la misma transacción, sea cual sea el método
+        que la hace (incluidas las operaciones por lotes). AUTOINCREMENT garantiza
+        que los números de secuencia no se reutilizan.
+        """
+        self.connection.execute('''
+            CREATE TABLE IF NOT EXISTS change_log (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                table_name TEXT NOT NULL,
+                op TEXT NOT NULL CHECK (op IN ('INSERT', 'UPDATE', 'DELETE', 'RESET')),
+                row_id INTEGER NOT NULL,
+                ts TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+            )
+        ''')
+        for table, key in self.CHANGE_LOG_TABLES.items():
+            for op, row in (('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD')):
+                self.connection.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS trg_{table}_{op.lower()}_log
+                    AFTER {op} ON {table}
+                    BEGIN
+                        INSERT INTO change_log (table_name, op, row_id) VALUES ('{table}', '{op}', {row}.{key});
+                    END
+                ''')
+
+    def changes_since(self, seq=0, limit=None):
+        """
+        Obtiene los cambios registrados después de un número de secuencia.
+        
+        Los consumidores guardan el último ``seq`` procesado y solo leen los
+        cambios posteriores, con un recorrido por rango de la clave primaria. Una
+        fila con op 'RESET' indica que la base de datos se ha reiniciado y que
+        hay que reconstruir todo lo derivado de ella.
+        
+        Args:
+            seq (int): Último número de secuencia procesado (0 para todos)
+            limit (int, optional): Número máximo de cambios a devolver
+            
+        Returns:
+            list: Filas con seq, table_name, op, row_id (el jugador en los cambios de
+                handicap_history) y ts en orden de secuencia
+        """
+        query = "SELECT seq, table_name, op, row_id, ts FROM change_log WHERE seq > ? ORDER BY seq"
+        params = [seq]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        
+        with self.connection:
+            return self.connection.execute(query, params).fetchall()
+
+    def get_last_change_seq(self):
+        """
+        Obtiene el número de secuencia del último cambio registrado.
+        
+        Returns:
+            int: Último número de secuencia, o 0 si no hay cambios
+        """
+        with self.connection:
+            return self.connection.execute('SELECT COALESCE(MAX(seq), 0) FROM change_log').fetchone()[0]
+
+    def _ensure_column(self, table, column, definition):
+        """
+        Añade una columna a una tabla si todavía no existe.
+        
+        Args:
+            table (str): Nombre de la tabla
+            column (str): Nombre de la columna
+            definition (str): Tipo y restricciones de la columna
+            
+        Returns:
+            bool: True si se ha añadido la columna
+        """
+        columns = {row['name'] for row in self.connection.execute(f'PRAGMA table_info({table})')}
+        if column in columns:
+            return False
+        self.connection.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+        return True
+
+    def _backfill_computed_revisions(self):
+        """Marca como calculadas las revisiones con fecha efectiva el día siguiente a una ronda"""
+        self.connection.execute('''
+            UPDATE handicap_history SET computed = 1
+            WHERE EXISTS (
+                SELECT 1 FROM scorecards s
+                WHERE s.player_id = handicap_history.player_id
+                  AND s.date = date(handicap_history.effective_date, '-1 day')
+            )
+        ''')
+
+    def _backfill_scorecard_totals(self):
+        """Calcula los totales de golpes y puntos de las tarjetas que no los tienen"""
+        rows = self.connection.execute(
+            'SELECT id, strokes, points FROM scorecards WHERE total_strokes IS NULL'
+        ).fetchall()
+        
+        updates = []
+        for row in rows:
+            try:
+                updates.append(self._scorecard_totals(row['strokes'], row['points']) + (row['id'],))
+            except HoleDataError as e:
+                print(f"No se pudieron calcular los totales de la tarjeta {row['id']}: {e}")
+        
+        self.connection.executemany(
+            'UPDATE scorecards SET total_strokes = ?, total_points = ? WHERE id = ?', updates
+        )
+
+    def _backfill_score_differentials(self):
+        """Calcula el diferencial de todas las tarjetas existentes"""
+        courses = {row['id']: Course.from_db_row(row)
+                   for row in self.connection.execute('SELECT * FROM courses')}
+        rows = self.connection.execute(
+            'SELECT id, course_id, strokes, playing_handicap FROM scorecards'
+        ).fetchall()
+        
+        updates = []
+        for row in rows:
+            course = courses.get(row['course_id'])
+            if not course:
+                continue
+            try:
+                strokes = decode_hole_list(row['strokes'], 'strokes')
+            except HoleDataError as e:
+                print(f"No se pudo calcular el diferencial de la tarjeta {row['id']}: {e}")
+                continue
+            updates.append((round_differential(strokes, course, row['playing_handicap']), row['id']))
+        
+        self.connection.executemany(
+            'UPDATE scorecards SET score_differential = ? WHERE id = ?', updates
+        )
 
+    def _backfill_round_hashes(self):
+        """
+        Calcula la clave de ronda de las tarjetas existentes.
+        
+        Si hay rondas repetidas solo la primera recibe la clave; las demás la
+        dejan a NULL para que se pueda crear el índice único.
+        """
+        rows = self.connection.execute(
+            'SELECT id, player_id, course_id, date, strokes FROM scorecards ORDER BY id'
+        ).fetchall()
+        
+        seen = set()
+        updates = []
+        duplicates = 0
+        for row in rows:
+            try:
+                round_hash = self.round_hash(row['player_id'], row['course_id'], row['date'], row['strokes'])
+            except HoleDataError as e:
+                print(f"No se pudo calcular la clave de la tarjeta {row['id']}: {e}")
+                continue
+            if round_hash in seen:
+                duplicates += 1
+                continue
+            seen.add(round_hash)
+            updates.append((round_hash, row['id']))
+        
+        self.connection.executemany('UPDATE scorecards SET round_hash = ? WHERE id = ?', updates)
+        if duplicates:
+            print(f"Se han encontrado {duplicates} tarjetas repetidas; se conservan sin clave de ronda.")
+
+    @staticmethod
+    def round_hash(player_id, course_id, date, strokes):
+        """
+        Calcula la clave natural de una ronda: jugador, campo, fecha y golpes.
+        
+        Los golpes se normalizan antes de calcular el hash, de modo que el
+        formato del JSON no influye.
+        
+        Args:
+            player_id (int): ID del jugador
+            course_id (int): ID del campo
+            date (str): Fecha de la ronda (YYYY-MM-DD)
+            strokes (str): Golpes por hoyo en formato JSON
+            
+        Returns:
+            str: Hash SHA-1 en hexadecimal
+        """
+        holes = ','.join(map(str, decode_hole_list(strokes, 'strokes')))
+        return hashlib.sha1(f'{player_id}|{course_id}|{date}|{holes}'.encode()).hexdigest()
+
+    def _find_round(self, round_hash):
+        """Obtiene el ID de la tarjeta con una clave de ronda, o None"""
+        row = self.connection.execute(
+            'SELECT id FROM scorecards WHERE round_hash = ?', (round_hash,)
+        ).fetchone()
+        return row['id'] if row else None
+
+    @staticmethod
+    def _scorecard_totals(strokes, points):
+        """
+        Calcula los totales de una tarjeta a partir de sus listas en JSON.
+        
+        Args:
+            strokes (str): Golpes por hoyo en formato JSON
+            points (str): Puntos por hoyo en formato JSON
+            
+        Returns:
+            tuple: (total_strokes, total_points)
+        """
+        return sum(decode_hole_list(strokes, 'strokes')), sum(decode_hole_list(points, 'points'))
+
+    def get_data_version(self):
+        """
+        Obtiene el contador PRAGMA data_version de la conexión.
+        
+        El valor cambia cuando otra conexión confirma cambios en la base de datos,
+        por lo que sirve para invalidar cachés en memoria.
+        
+        Returns:
+            int: Versión de los datos vista por esta conexión
+        """
+        return self.connection.execute('PRAGMA data_version').fetchone()[0]
+
+    @retry_on_busy
     def reset_database(self):
         """Elimina todas las tablas y las vuelve a crear"""
         with self.connection:
             self.connection.execute('DROP TABLE IF EXISTS scorecards')
             self.connection.execute('DROP TABLE IF EXISTS players')
+            self.connection.execute('DROP TABLE IF EXISTS course_tees')
             self.connection.execute('DROP TABLE IF EXISTS courses')
+            self.connection.execute('DROP TABLE IF EXISTS handicap_history')
+            # El registro de cambios se conserva para que los consumidores sepan
+            # que deben reconstruir sus datos
+            if self.connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'change_log'"
+            ).fetchone():
+                self.connection.execute(
+                    "INSERT INTO change_log (table_name, op, row_id) VALUES ('*', 'RESET', 0)"
+                )
         self.create_tables()
         return True
 
+    # Máximo de parámetros por consulta (límite de SQLite en versiones antiguas)
+    MAX_QUERY_PARAMS = 900
+
+    def _select_by_ids(self, table, ids, columns='*'):
+        """
+        Obtiene las filas de una tabla cuyos IDs están en la lista, usando IN (...).
+        
+        Las listas más largas que MAX_QUERY_PARAMS se pasan como un único
+        parámetro JSON que se expande con json_each, de modo que siempre se
+        ejecuta una sola consulta.
+        
+        Args:
+            table (str): Nombre de la tabla (players o courses)
+            ids (iterable): IDs a buscar
+            columns (str): Columnas de la consulta
+            
+        Returns:
+            list: Filas encontradas
+        """
+        ids = list(dict.fromkeys(i for i in ids if i is not None))
+        if not ids:
+            return []
+        
+        if len(ids) > self.MAX_QUERY_PARAMS:
+            query = f'SELECT {columns} FROM {table} WHERE id IN (SELECT value FROM json_each(?))'
+            params = [json.dumps(ids)]
+        else:
+            query = f"SELECT {columns} FROM {table} WHERE id IN ({', '.join('?' * len(ids))})"
+            params = ids
+        
+        with self.connection:
+            return self.connection.execute(query, params).fetchall()
+
     # ===== Operaciones con Jugadores =====
     
+    @retry_on_busy
     def add_player(self, first_name, surname, handicap):
         """Añade un nuevo jugador a la base de datos"""
         with self.connection:
@@ -90,11 +532,18 @@ class Database:
                 INSERT INTO players (first_name, surname, handicap)
                 VALUES (?, ?, ?)
             ''', (first_name, surname, handicap))
+            self._record_handicap(cursor.lastrowid, self.INITIAL_HANDICAP_DATE, handicap)
             return cursor.lastrowid
 
+    @retry_on_busy
     def update_player(self, player_id, first_name, surname, handicap):
         """Actualiza los datos de un jugador existente"""
         with self.connection:
+            current = self.connection.execute(
+                'SELECT handicap FROM players WHERE id = ?', (player_id,)
+            ).fetchone()
+            if current and current['handicap'] != handicap:
+                self._record_handicap(player_id, datetime.now().strftime('%Y-%m-%d'), handicap)
             self.connection.execute('''
                 UPDATE players 
                 SET first_name = ?, surname = ?, handicap = ?
@@ -102,6 +551,143 @@ class Database:
             ''', (first_name, surname, handicap, player_id))
             return True
 
+    @retry_on_busy
+    def import_players(self, players):
+        """
+        Inserta varios jugadores en una sola transacción.
+        
+        Como add_player, guarda el hándicap de cada jugador como primera revisión
+        de su historial.
+        
+        Args:
+            players (iterable): Tuplas (first_name, surname, handicap)
+            
+        Returns:
+            list: IDs de los jugadores creados, en el mismo orden
+        """
+        player_ids = []
+        with self.connection:
+            for first_name, surname, handicap in players:
+                player_ids.append(self.connection.execute('''
+                    INSERT INTO players (first_name, surname, handicap)
+                    VALUES (?, ?, ?)
+                    RETURNING id
+                ''', (first_name, surname, handicap)).fetchone()['id'])
+                self._record_handicap(player_ids[-1], self.INITIAL_HANDICAP_DATE, handicap)
+        return player_ids
+
+    # Fecha efectiva del hándicap inicial de cada jugador: anterior a cualquier ronda,
+    # para que las revisiones calculadas (aunque sean de rondas pasadas) lo sustituyan
+    INITIAL_HANDICAP_DATE = '0001-01-01'
+
+    def _record_handicap(self, player_id, effective_date, handicap_index):
+        """Guarda una revisión manual del historial de hándicap (dentro de una transacción abierta)"""
+        self.connection.execute('''
+            INSERT INTO handicap_history (player_id, effective_date, handicap_index)
+            VALUES (?, ?, ?)
+            ON CONFLICT (player_id, effective_date) DO UPDATE SET
+                handicap_index = excluded.handicap_index, computed = 0
+        ''', (player_id, effective_date, handicap_index))
+
+    @retry_on_busy
+    def save_handicap_revisions(self, updates):
+        """
+        Sustituye el historial de hándicap calculado y actualiza el hándicap actual.
+        
+        Todo se guarda en una sola transacción. Para cada jugador se eliminan las
+        revisiones calculadas posteriores a ``since`` y se insertan las nuevas; las
+        introducidas a mano se conservan. Si no hay índice actual, el hándicap del
+        jugador vuelve a la última revisión que queda en el historial, de modo que
+        un jugador que nunca ha tenido índice calculado conserva su valor manual.
+        
+        Args:
+            updates (iterable): Tuplas (player_id, since, revisions, handicap), donde
+                revisions es una lista de pares (effective_date, handicap_index),
+                since la fecha a partir de la cual se han recalculado ('' para todo
+                el historial) y handicap el índice actual (None si no tiene rondas
+                suficientes)
+            
+        Returns:
+            int: Número de revisiones guardadas
+        """
+        saved = 0
+        with self.connection:
+            for player_id, since, revisions, handicap in updates:
+                self.connection.execute(
+                    'DELETE FROM handicap_history WHERE player_id = ? AND effective_date > ? AND computed = 1',
+                    (player_id, since)
+                )
+                self.connection.executemany('''
+                    INSERT INTO handicap_history (player_id, effective_date, handicap_index, computed)
+                    VALUES (?, ?, ?, 1)
+                    ON CONFLICT (player_id, effective_date) DO UPDATE SET
+                        handicap_index = excluded.handicap_index, computed = 1
+                ''', [(player_id, effective_date, index) for effective_date, index in revisions])
+                saved += len(revisions)
+                if handicap is not None:
+                    self.connection.execute(
+                        'UPDATE players SET handicap = ? WHERE id = ?', (handicap, player_id)
+                    )
+                else:
+                    self.connection.execute('''
+                        UPDATE players SET handicap = COALESCE((
+                            SELECT handicap_index FROM handicap_history
+                            WHERE player_id = ?
+                            ORDER BY effective_date DESC
+                            LIMIT 1
+                        ), handicap)
+                        WHERE id = ?
+                    ''', (player_id, player_id))
+        return saved
+
+    def get_handicap_as_of(self, player_id, date):
+        """
+        Obtiene el índice de hándicap vigente de un jugador en una fecha.
+        
+        Args:
+            player_id (int): ID del jugador
+            date (str): Fecha (YYYY-MM-DD)
+            
+        Returns:
+            float: Índice de hándicap, o None si no hay revisiones anteriores
+        """
+        with self.connection:
+            row = self.connection.execute('''
+                SELECT handicap_index FROM handicap_history
+                WHERE player_id = ? AND effective_date <= ?
+                ORDER BY effective_date DESC
+                LIMIT 1
+            ''', (player_id, date)).fetchone()
+            return row['handicap_index'] if row else None
+
+    def get_handicap_history(self, player_id, start_date=None, end_date=None):
+        """
+        Obtiene las revisiones del índice de hándicap de un jugador.
+        
+        Args:
+            player_id (int): ID del jugador
+            start_date (str, optional): Fecha efectiva mínima (YYYY-MM-DD)
+            end_date (str, optional): Fecha efectiva máxima (YYYY-MM-DD)
+            
+        Returns:
+            list: Filas con effective_date y handicap_index en orden cronológico
+        """
+        query = "SELECT effective_date, handicap_index FROM handicap_history WHERE player_id = ?"
+        params = [player_id]
+        
+        if start_date:
+            query += " AND effective_date >= ?"
+            params.append(start_date)
+        
+        if end_date:
+            query += " AND effective_date <= ?"
+            params.append(end_date)
+        
+        query += " ORDER BY effective_date"
+        
+        with self.connection:
+            return self.connection.execute(query, params).fetchall()
+
     def get_player(self, player_id):
         """Obtiene un jugador por su ID"""
         with self.connection:
@@ -111,11 +697,24 @@ class Database:
             ).fetchone()
             return dict(result) if result else None
 
+    def get_players_by_ids(self, player_ids):
+        """
+        Obtiene varios jugadores con una sola consulta.
+        
+        Args:
+            player_ids (iterable): IDs de los jugadores
+            
+        Returns:
+            list: Filas de los jugadores encontrados
+        """
+        return self._select_by_ids('players', player_ids)
+
     def get_players(self):
         """Obtiene todos los jugadores"""
         with self.connection:
             return self.connection.execute('SELECT * FROM players ORDER BY surname, first_name').fetchall()
 
+    @retry_on_busy
     def delete_player(self, player_id, delete_scorecards=False):
         """
         Elimina un jugador por su ID
@@ -141,7 +740,9 @@ class Database:
             if scorecards > 0 and delete_scorecards:
                 self.connection.execute('DELETE FROM scorecards WHERE player_id = ?', (player_id,))
             
-            # Eliminar el jugador
+            # Eliminar el jugador y su historial de hándicap; las tarjetas eliminadas
+            # son todas suyas, así que no hay que recalcular el hándicap de nadie
+            self.connection.execute('DELETE FROM handicap_history WHERE player_id = ?', (player_id,))
             self.connection.execute('DELETE FROM players WHERE id = ?', (player_id,))
             
             if delete_scorecards and scorecards > 0:
@@ -151,6 +752,19 @@ class Database:
 
     # ===== Operaciones con Campos =====
     
+    # Columnas de las consultas de campos: las salidas de cada campo se leen en la
+    # misma consulta como un array JSON (columna tees) que decodifica Course.from_db_row
+    _COURSE_COLUMNS = """
+        courses.*,
+        (SELECT json_group_array(json_object(
+                    'id', t.id, 'course_id', t.course_id, 'name', t.name, 'slope', t.slope,
+                    'course_rating', t.course_rating, 'par_total', t.par_total,
+                    'yardages', t.yardages))
+         FROM (SELECT * FROM course_tees WHERE course_id = courses.id
+               ORDER BY course_rating DESC, id) AS t) AS tees
+    """
+
+    @retry_on_busy
     def add_course(self, name, location, slope, course_rating, par_total, hole_pars, hole_handicaps):
         """Añade un nuevo campo a la base de datos"""
         # Convertir listas a formato JSON
@@ -164,6 +778,30 @@ class Database:
             ''', (name, location, slope, course_rating, par_total, hole_pars_json, hole_handicaps_json))
             return cursor.lastrowid
 
+    @retry_on_busy
+    def import_courses(self, courses):
+        """
+        Inserta varios campos en una sola transacción.
+        
+        Args:
+            courses (iterable): Tuplas (name, location, slope, course_rating, par_total,
+                hole_pars, hole_handicaps) con los pares y hándicaps como listas
+            
+        Returns:
+            list: IDs de los campos creados, en el mismo orden
+        """
+        course_ids = []
+        with self.connection:
+            for name, location, slope, course_rating, par_total, hole_pars, hole_handicaps in courses:
+                course_ids.append(self.connection.execute('''
+                    INSERT INTO courses (name, location, slope, course_rating, par_total, hole_pars, hole_handicaps)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    RETURNING id
+                ''', (name, location, slope, course_rating, par_total,
+                      json.dumps(hole_pars), json.dumps(hole_handicaps))).fetchone()['id'])
+        return course_ids
+
+    @retry_on_busy
     def update_course(self, course_id, name, location, slope, course_rating, par_total, hole_pars, hole_handicaps):
         """Actualiza los datos de un campo existente"""
         # Convertir listas a formato JSON
@@ -178,22 +816,41 @@ class Database:
                 WHERE id = ?
             ''', (name, location, slope, course_rating, par_total, 
                   hole_pars_json, hole_handicaps_json, course_id))
+            # Las salidas usan los pares por hoyo del campo
+            self.connection.execute(
+                'UPDATE course_tees SET par_total = ? WHERE course_id = ?', (par_total, course_id)
+            )
             return True
 
     def get_course(self, course_id):
-        """Obtiene un campo por su ID"""
+        """Obtiene un campo por su ID, con sus salidas en la columna tees"""
         with self.connection:
             result = self.connection.execute(
-                'SELECT * FROM courses WHERE id = ?', 
+                f'SELECT {self._COURSE_COLUMNS} FROM courses WHERE id = ?', 
                 (course_id,)
             ).fetchone()
             return dict(result) if result else None
 
+    def get_courses_by_ids(self, course_ids):
+        """
+        Obtiene varios campos con una sola consulta.
+        
+        Args:
+            course_ids (iterable): IDs de los campos
+            
+        Returns:
+            list: Filas de los campos encontrados, con sus salidas en la columna tees
+        """
+        return self._select_by_ids('courses', course_ids, self._COURSE_COLUMNS)
+
     def get_courses(self):
-        """Obtiene todos los campos"""
+        """Obtiene todos los campos, con sus salidas en la columna tees"""
         with self.connection:
-            return self.connection.execute('SELECT * FROM courses ORDER BY name').fetchall()
+            return self.connection.execute(
+                f'SELECT {self._COURSE_COLUMNS} FROM courses ORDER BY name'
+            ).fetchall()
 
+    @retry_on_busy
     def delete_course(self, course_id, delete_scorecards=False):
         """
         Elimina un campo por su ID
@@ -219,7 +876,8 @@ class Database:
             if scorecards > 0 and delete_scorecards:
                 self.connection.execute('DELETE FROM scorecards WHERE course_id = ?', (course_id,))
             
-            # Eliminar el campo
+            # Eliminar el campo y sus salidas
+            self.connection.execute('DELETE FROM course_tees WHERE course_id = ?', (course_id,))
             self.connection.execute('DELETE FROM courses WHERE id = ?', (course_id,))
             
             if delete_scorecards and scorecards > 0:
@@ -227,9 +885,79 @@ class Database:
             else:
                 return True, "Campo eliminado correctamente."
 
+    # ===== Operaciones con Salidas =====
+    
+    @retry_on_busy
+    def add_course_tee(self, course_id, name, slope, course_rating, par_total, yardages=None):
+        """
+        Añade una salida a un campo.
+        
+        Args:
+            course_id (int): ID del campo
+            name (str): Nombre de la salida
+            slope (int): Valor de slope desde la salida
+            course_rating (float): Rating desde la salida
+            par_total (int): Par total desde la salida
+            yardages (list, optional): Distancia de cada hoyo
+            
+        Returns:
+            int: ID de la salida creada
+        """
+        with self.connection:
+            cursor = self.connection.execute('''
+                INSERT INTO course_tees (course_id, name, slope, course_rating, par_total, yardages)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (course_id, name, slope, course_rating, par_total, json.dumps(yardages or [])))
+            return cursor.lastrowid
+
+    @retry_on_busy
+    def update_course_tee(self, tee_id, name, slope, course_rating, par_total, yardages=None):
+        """Actualiza los datos de una salida existente"""
+        with self.connection:
+            self.connection.execute('''
+                UPDATE course_tees
+                SET name = ?, slope = ?, course_rating = ?, par_total = ?, yardages = ?
+                WHERE id = ?
+            ''', (name, slope, course_rating, par_total, json.dumps(yardages or []), tee_id))
+            return True
+
+    def get_course_tee(self, tee_id):
+        """Obtiene una salida por su ID"""
+        with self.connection:
+            result = self.connection.execute(
+                'SELECT * FROM course_tees WHERE id = ?',
+                (tee_id,)
+            ).fetchone()
+            return dict(result) if result else None
+
+    @retry_on_busy
+    def delete_course_tee(self, tee_id):
+        """
+        Elimina una salida si no tiene tarjetas.
+        
+        Args:
+            tee_id (int): ID de la salida
+            
+        Returns:
+            tuple: (éxito, mensaje)
+        """
+        with self.connection:
+            scorecards = self.connection.execute(
+                'SELECT COUNT(*) FROM scorecards WHERE tee_id = ?',
+                (tee_id,)
+            ).fetchone()[0]
+            
+            if scorecards > 0:
+                return False, f"No se puede eliminar la salida porque tiene {scorecards} tarjetas asociadas."
+            
+            self.connection.execute('DELETE FROM course_tees WHERE id = ?', (tee_id,))
+            return True, "Salida eliminada correctamente."
+
     # ===== Operaciones con Tarjetas =====
     
-    def add_scorecard(self, player_id, course_id, date, strokes, points, handicap_coefficient, playing_handicap=None):
+    @retry_on_busy
+    def add_scorecard(self, player_id, course_id, date, strokes, points, handicap_coefficient, playing_handicap=None,
+                      score_differential=None, tee_id=None):
         """
         Añade una nueva tarjeta a la base de datos.
         
@@ -241,30 +969,48 @@ class Database:
             points (str): Puntos por hoyo en formato JSON
             handicap_coefficient (float): Coeficiente de hándicap aplicado
             playing_handicap (float, optional): Hándicap de juego final
+            score_differential (float, optional): Diferencial WHS de la ronda
+            tee_id (int, optional): ID de la salida desde la que se jugó
             
         Returns:
-            int: ID de la tarjeta creada o None si falla
+            int: ID de la tarjeta creada, o None si faltan el jugador, el campo o la fecha
+            
+        Raises:
+            DuplicateScorecardError: Si la misma ronda ya está guardada
+            sqlite3.Error: Si falla la escritura (los bloqueos los reintenta retry_on_busy)
         """
         try:
             # Validar datos
             if not player_id or not course_id or not date:
                 return None
                 
+            total_strokes, total_points = self._scorecard_totals(strokes, points)
+            round_hash = self.round_hash(player_id, course_id, date, strokes)
+            
             # Preparar la consulta SQL
             query = """
                 INSERT INTO scorecards (
                     player_id, course_id, date, strokes, points, 
-                    handicap_coefficient, playing_handicap
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                    handicap_coefficient, playing_handicap, total_strokes, total_points,
+                    score_differential, round_hash, tee_id
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """
             
             # Ejecutar la consulta
             cursor = self.connection.cursor()
-            cursor.execute(
-                query, 
-                (player_id, course_id, date, strokes, points, 
-                 handicap_coefficient, playing_handicap)
-            )
+            try:
+                cursor.execute(
+                    query, 
+                    (player_id, course_id, date, strokes, points, 
+                     handicap_coefficient, playing_handicap, total_strokes, total_points,
+                     score_differential, round_hash, tee_id)
+                )
+            except sqlite3.IntegrityError:
+                self.connection.rollback()
+                existing = self._find_round(round_hash)
+                if existing is None:
+                    raise
+                raise DuplicateScorecardError(existing)
             
             # Obtener el ID de la tarjeta creada
             scorecard_id = cursor.lastrowid
@@ -274,9 +1020,115 @@ class Database:
             
             return scorecard_id
             
-        except Exception as e:
-            print(f"Error al añadir tarjeta: {e}")
-            return None
+        except Exception:
+            # Se deshace la escritura y se propaga el error: retry_on_busy repite los
+            # bloqueos y el controlador informa del resto
+            if self.connection.in_transaction:
+                self.connection.rollback()
+            raise
+
+    @retry_on_busy
+    def upsert_scorecard(self, player_id, course_id, date, strokes, points, handicap_coefficient,
+                         playing_handicap=None, score_differential=None, tee_id=None):
+        """
+        Añade una tarjeta o, si la misma ronda ya existe, actualiza sus datos.
+        
+        La ronda se identifica por su clave natural (jugador, campo, fecha y
+        golpes); en ese caso se actualizan los puntos, el coeficiente, el hándicap
+        de juego, el diferencial y la salida con INSERT ... ON CONFLICT, sin
+        consultas previas.
+        
+        Args:
+            player_id (int): ID del jugador
+            course_id (int): ID del campo
+            date (str): Fecha de la ronda en formato YYYY-MM-DD
+            strokes (str): Golpes por hoyo en formato JSON
+            points (str): Puntos por hoyo en formato JSON
+            handicap_coefficient (float): Coeficiente de hándicap aplicado
+            playing_handicap (float, optional): Hándicap de juego final
+            score_differential (float, optional): Diferencial WHS de la ronda
+            tee_id (int, optional): ID de la salida desde la que se jugó
+            
+        Returns:
+            int: ID de la tarjeta creada o actualizada
+        """
+        total_strokes, total_points = self._scorecard_totals(strokes, points)
+        round_hash = self.round_hash(player_id, course_id, date, strokes)
+        
+        with self.connection:
+            return self.connection.execute('''
+                INSERT INTO scorecards (
+                    player_id, course_id, date, strokes, points,
+                    handicap_coefficient, playing_handicap, total_strokes, total_points,
+                    score_differential, round_hash, tee_id
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (round_hash) DO UPDATE SET
+                    points = excluded.points,
+                    handicap_coefficient = excluded.handicap_coefficient,
+                    playing_handicap = excluded.playing_handicap,
+                    total_points = excluded.total_points,
+                    score_differential = excluded.score_differential,
+                    tee_id = excluded.tee_id,
+                    version = scorecards.version + 1
+                RETURNING id
+            ''', (player_id, course_id, date, strokes, points,
+                  handicap_coefficient, playing_handicap, total_strokes, total_points,
+                  score_differential, round_hash, tee_id)).fetchone()['id']
+
+    @classmethod
+    def scorecard_import_rows(cls, scorecards):
+        """
+        Prepara las filas de import_scorecards con sus totales y su clave de ronda.
+        
+        Al no usar la conexión se puede llamar en otro proceso, por ejemplo en
+        los que generan los datos, y pasar el resultado con ``prepared=True``.
+        
+        Args:
+            scorecards (iterable): Tuplas (player_id, course_id, date, strokes, points,
+                handicap_coefficient, playing_handicap, score_differential[, tee_id])
+                con los golpes y los puntos en formato JSON
+            
+        Returns:
+            list: Tuplas con las columnas que inserta import_scorecards
+        """
+        rows = []
+        for player_id, course_id, date, strokes, points, coefficient, playing_handicap, differential, *tee in scorecards:
+            total_strokes, total_points = cls._scorecard_totals(strokes, points)
+            rows.append((player_id, course_id, date, strokes, points, coefficient, playing_handicap,
+                         total_strokes, total_points, differential,
+                         cls.round_hash(player_id, course_id, date, strokes), tee[0] if tee else None))
+        return rows
+
+    @retry_on_busy
+    def import_scorecards(self, scorecards, prepared=False):
+        """
+        Inserta varias tarjetas en una sola transacción descartando las repetidas.
+        
+        Las rondas que ya existen (o que aparecen dos veces en el lote) se
+        descartan con INSERT ... ON CONFLICT DO NOTHING sobre el índice único de
+        la clave de ronda, sin comprobarlas una a una.
+        
+        Args:
+            scorecards (iterable): Tuplas (player_id, course_id, date, strokes, points,
+                handicap_coefficient, playing_handicap, score_differential[, tee_id])
+                con los golpes y los puntos en formato JSON
+            prepared (bool): True si las filas ya vienen de scorecard_import_rows
+            
+        Returns:
+            int: Número de tarjetas insertadas
+        """
+        rows = scorecards if prepared else self.scorecard_import_rows(scorecards)
+        
+        with self.connection:
+            cursor = self.connection.executemany('''
+                INSERT INTO scorecards (
+                    player_id, course_id, date, strokes, points,
+                    handicap_coefficient, playing_handicap, total_strokes, total_points,
+                    score_differential, round_hash, tee_id
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (round_hash) DO NOTHING
+            ''', rows)
+            return cursor.rowcount
 
     def get_scorecard(self, scorecard_id):
         """Obtiene una tarjeta por su ID"""
@@ -288,14 +1140,23 @@ class Database:
             return dict(result) if result else None
     
     def get_scorecard_with_details(self, scorecard_id):
-        """Obtiene una tarjeta con información de jugador y campo por su ID"""
+        """
+        Obtiene una tarjeta con información de jugador y campo por su ID.
+        
+        Si la ronda tiene salida, el slope, el course rating y el par son los de
+        la salida.
+        """
         with self.connection:
             result = self.connection.execute('''
-                SELECT s.*, p.first_name, p.surname, c.name, c.location, c.slope, c.course_rating, 
-                       c.par_total, c.hole_pars, c.hole_handicaps
+                SELECT s.*, p.first_name, p.surname, c.name, c.location,
+                       COALESCE(t.slope, c.slope) AS slope,
+                       COALESCE(t.course_rating, c.course_rating) AS course_rating,
+                       COALESCE(t.par_total, c.par_total) AS par_total,
+                       c.hole_pars, c.hole_handicaps, t.name AS tee_name
                 FROM scorecards s
                 LEFT JOIN players p ON s.player_id = p.id
                 LEFT JOIN courses c ON s.course_id = c.id
+                LEFT JOIN course_tees t ON s.tee_id = t.id
                 WHERE s.id = ?
             ''', (scorecard_id,)).fetchone()
             return result
@@ -312,14 +1173,17 @@ class Database:
                 LIMIT ? OFFSET ?
             ''', (limit, offset)).fetchall()
 
+    @retry_on_busy
     def delete_scorecard(self, scorecard_id):
         """Elimina una tarjeta por su ID"""
         with self.connection:
             self.connection.execute('DELETE FROM scorecards WHERE id = ?', (scorecard_id,))
             return True
 
+    @retry_on_busy
     def update_scorecard(self, scorecard_id, player_id, course_id, date, strokes, points,
-                        handicap_coefficient, playing_handicap):
+                        handicap_coefficient, playing_handicap, score_differential=None,
+                        expected_version=None, tee_id=None):
         """
         Actualiza una tarjeta existente.
         
@@ -332,92 +1196,444 @@ class Database:
             points (str): Puntos por hoyo en formato JSON
             handicap_coefficient (float): Coeficiente de hándicap aplicado
             playing_handicap (float): Hándicap de juego final
+            score_differential (float, optional): Diferencial WHS de la ronda
+            expected_version (int, optional): Versión de la tarjeta leída por quien la
+                modifica; si se indica, la tarjeta solo se actualiza si sigue en esa versión
+            tee_id (int, optional): ID de la salida desde la que se jugó
             
         Returns:
-            bool: True si se actualizó correctamente, False en caso contrario
+            bool: True si se actualizó la tarjeta, False si no existe
+            
+        Raises:
+            DuplicateScorecardError: Si la tarjeta pasaría a ser idéntica a otra
+            ScorecardConflictError: Si la tarjeta ya no está en expected_version
+            sqlite3.Error: Si falla la escritura (los bloqueos los reintenta retry_on_busy)
         """
         try:
+            total_strokes, total_points = self._scorecard_totals(strokes, points)
+            round_hash = self.round_hash(player_id, course_id, date, strokes)
+            
             # Preparar la consulta SQL
             query = """
                 UPDATE scorecards
                 SET player_id = ?, course_id = ?, date = ?, strokes = ?, points = ?,
-                    handicap_coefficient = ?, playing_handicap = ?
+                    handicap_coefficient = ?, playing_handicap = ?,
+                    total_strokes = ?, total_points = ?, score_differential = ?,
+                    round_hash = ?, tee_id = ?, version = version + 1
                 WHERE id = ?
             """
+            params = [player_id, course_id, date, strokes, points,
+                      handicap_coefficient, playing_handicap,
+                      total_strokes, total_points, score_differential, round_hash, tee_id, scorecard_id]
+            
+            # Compare-and-set: solo se actualiza si nadie la ha modificado desde que se leyó
+            if expected_version is not None:
+                query += " AND version = ?"
+                params.append(expected_version)
             
             # Ejecutar la consulta
             cursor = self.connection.cursor()
-            cursor.execute(
-                query, 
-                (player_id, course_id, date, strokes, points,
-                 handicap_coefficient, playing_handicap, scorecard_id)
-            )
+            try:
+                cursor.execute(query, params)
+            except sqlite3.IntegrityError:
+                self.connection.rollback()
+                existing = self._find_round(round_hash)
+                if existing is None:
+                    raise
+                raise DuplicateScorecardError(existing)
+            
+            if cursor.rowcount == 0 and expected_version is not None:
+                current = self.connection.execute(
+                    'SELECT version FROM scorecards WHERE id = ?', (scorecard_id,)
+                ).fetchone()
+                self.connection.commit()
+                if current:
+                    raise ScorecardConflictError(scorecard_id, current['version'])
             
             # Confirmar los cambios
             self.connection.commit()
             
             return cursor.rowcount > 0
             
-        except Exception as e:
-            print(f"Error al actualizar tarjeta: {e}")
-            return False
+        except Exception:
+            if self.connection.in_transaction:
+                self.connection.rollback()
+            raise
 
-    def search_scorecards(self, filters=None):
+    def _scorecard_filter_clause(self, filters):
         """
-        Busca tarjetas aplicando filtros.
+        Construye las condiciones WHERE de los filtros de tarjetas.
+        
+        Las condiciones usan los alias s (scorecards), p (players), c (courses) y
+        t (course_tees, unida con LEFT JOIN por s.tee_id).
         
         Args:
-            filters (dict): Diccionario con los filtros a aplicar
-                - player_id: ID del jugador
-                - course_id: ID del campo
-                - start_date: Fecha de inicio (YYYY-MM-DD)
-                - end_date: Fecha de fin (YYYY-MM-DD)
-                - player_name: Nombre parcial del jugador
-                - course_name: Nombre parcial del campo
+            filters (dict): Filtros admitidos por search_scorecards
         
         Returns:
-            list: Lista de tarjetas que cumplen los filtros
+            tuple: (condiciones SQL, lista de parámetros)
         """
         filters = filters or {}
-        query = """
-            SELECT s.*, p.first_name, p.surname, c.name, c.location
-            FROM scorecards s
-            JOIN players p ON s.player_id = p.id
-            JOIN courses c ON s.course_id = c.id
-            WHERE 1=1
-        """
+        conditions = "1=1"
         params = []
         
         if 'player_id' in filters and filters['player_id']:
-            query += " AND s.player_id = ?"
+            conditions += " AND s.player_id = ?"
             params.append(filters['player_id'])
         
         if 'course_id' in filters and filters['course_id']:
-            query += " AND s.course_id = ?"
+            conditions += " AND s.course_id = ?"
             params.append(filters['course_id'])
         
+        if 'tee_id' in filters and filters['tee_id']:
+            conditions += " AND s.tee_id = ?"
+            params.append(filters['tee_id'])
+        
         if 'start_date' in filters and filters['start_date']:
-            query += " AND s.date >= ?"
+            conditions += " AND s.date >= ?"
             params.append(filters['start_date'])
         
         if 'end_date' in filters and filters['end_date']:
-            query += " AND s.date <= ?"
+            conditions += " AND s.date <= ?"
             params.append(filters['end_date'])
         
         if 'player_name' in filters and filters['player_name']:
-            query += " AND (p.first_name LIKE ? OR p.surname LIKE ?)"
+            conditions += " AND (p.first_name LIKE ? OR p.surname LIKE ?)"
             name_pattern = f"%{filters['player_name']}%"
             params.extend([name_pattern, name_pattern])
         
         if 'course_name' in filters and filters['course_name']:
-            query += " AND c.name LIKE ?"
+            conditions += " AND c.name LIKE ?"
             params.append(f"%{filters['course_name']}%")
         
+        # El resultado respecto al par usa el par de la salida de la ronda, o el del
+        # campo si se jugó sin salida
+        if filters.get('to_par_min') is not None:
+            conditions += " AND s.total_strokes >= COALESCE(t.par_total, c.par_total) + ?"
+            params.append(filters['to_par_min'])
+        
+        if filters.get('to_par_max') is not None:
+            conditions += " AND s.total_strokes <= COALESCE(t.par_total, c.par_total) + ?"
+            params.append(filters['to_par_max'])
+        
+        return conditions, params
+
+    def search_scorecards(self, filters=None, limit=None, offset=0):
+        """
+        Busca tarjetas aplicando filtros, de la más reciente a la más antigua.
+        
+        Args:
+            filters (dict): Diccionario con los filtros a aplicar
+                - player_id: ID del jugador
+                - course_id: ID del campo
+                - tee_id: ID de la salida
+                - start_date: Fecha de inicio (YYYY-MM-DD)
+                - end_date: Fecha de fin (YYYY-MM-DD)
+                - player_name: Nombre parcial del jugador
+                - course_name: Nombre parcial del campo
+                - to_par_min: Resultado mínimo respecto al par (golpes - par de la salida)
+                - to_par_max: Resultado máximo respecto al par (golpes - par de la salida)
+            limit (int, optional): Límite de resultados (sin límite por defecto)
+            offset (int): Desplazamiento para paginación
+        
+        Returns:
+            list: Lista de tarjetas que cumplen los filtros
+        """
+        conditions, params = self._scorecard_filter_clause(filters)
+        query = f"""
+            SELECT s.*, p.first_name, p.surname, c.name, c.location
+            FROM scorecards s
+            JOIN players p ON s.player_id = p.id
+            JOIN courses c ON s.course_id = c.id
+            LEFT JOIN course_tees t ON t.id = s.tee_id
+            WHERE {conditions}
+        """
+        
         query += " ORDER BY s.date DESC"
+        if limit is not None:
+            query += " LIMIT ? OFFSET ?"
+            params = [*params, limit, offset]
+        
+        with self.connection:
+            return self.connection.execute(query, params).fetchall()
+
+    def get_recent_player_rounds(self, player_id, limit):
+        """
+        Obtiene las rondas más recientes de un jugador usando el índice (player_id, date).
+        
+        Args:
+            player_id (int): ID del jugador
+            limit (int): Número máximo de rondas
+        
+        Returns:
+            list: Filas con id, course_id, date, total_strokes y score_differential,
+                de la más reciente a la más antigua
+        """
+        with self.connection:
+            return self.connection.execute('''
+                SELECT id, course_id, date, total_strokes, score_differential
+                FROM scorecards
+                WHERE player_id = ?
+                ORDER BY date DESC, id DESC
+                LIMIT ?
+            ''', (player_id, limit)).fetchall()
+
+    def get_player_rounds_since(self, player_id, since=None, lookback=0):
+        """
+        Obtiene las rondas de un jugador desde una fecha y las ``lookback`` anteriores.
+        
+        Se resuelve solo con el índice (player_id, date, score_differential).
+        
+        Args:
+            player_id (int): ID del jugador
+            since (str, optional): Fecha inicial (YYYY-MM-DD); None para todo el historial
+            lookback (int): Rondas anteriores a ``since`` que se incluyen
+        
+        Returns:
+            list: Filas con id, date y score_differential en orden cronológico
+        """
+        with self.connection:
+            if since is None:
+                return self.connection.execute('''
+                    SELECT id, date, score_differential FROM scorecards
+                    WHERE player_id = ?
+                    ORDER BY date, id
+                ''', (player_id,)).fetchall()
+            
+            return self.connection.execute('''
+                SELECT * FROM (
+                    SELECT id, date, score_differential FROM scorecards
+                    WHERE player_id = ? AND date < ?
+                    ORDER BY date DESC, id DESC
+                    LIMIT ?
+                )
+                UNION ALL
+                SELECT id, date, score_differential FROM scorecards
+                WHERE player_id = ? AND date >= ?
+                ORDER BY date, id
+            ''', (player_id, since, lookback, player_id, since)).fetchall()
+
+    def get_rounds_with_handicap(self, filters=None, limit=None):
+        """
+        Obtiene rondas junto con el índice de hándicap vigente el día en que se jugaron.
+        
+        El índice de cada ronda se obtiene con una subconsulta correlacionada que
+        busca en la clave primaria (player_id, effective_date) del historial, de
+        modo que el coste por ronda no depende del tamaño del historial.
+        
+        Args:
+            filters (dict, optional): Filtros admitidos por search_scorecards
+            limit (int, optional): Número máximo de rondas
+        
+        Returns:
+            list: Filas con id, player_id, course_id, course_name, date, total_strokes,
+                score_differential y handicap_index, de la más reciente a la más antigua
+        """
+        conditions, params = self._scorecard_filter_clause(filters)
+        query = f"""
+            SELECT s.id, s.player_id, s.course_id, c.name AS course_name, s.date,
+                   s.total_strokes, s.score_differential,
+                   (SELECT h.handicap_index FROM handicap_history h
+                    WHERE h.player_id = s.player_id AND h.effective_date <= s.date
+                    ORDER BY h.effective_date DESC
+                    LIMIT 1) AS handicap_index
+            FROM scorecards s
+            JOIN players p ON s.player_id = p.id
+            JOIN courses c ON s.course_id = c.id
+            LEFT JOIN course_tees t ON t.id = s.tee_id
+            WHERE {conditions}
+            ORDER BY s.date DESC, s.id DESC
+        """
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
         
         with self.connection:
             return self.connection.execute(query, params).fetchall()
 
+    @retry_on_busy
+    def update_score_differentials(self, differentials):
+        """
+        Guarda el diferencial de varias tarjetas en una sola transacción.
+        
+        Args:
+            differentials (iterable): Pares (scorecard_id, diferencial)
+            
+        Returns:
+            int: Número de tarjetas actualizadas
+        """
+        with self.connection:
+            cursor = self.connection.executemany(
+                'UPDATE scorecards SET score_differential = ? WHERE id = ?',
+                [(differential, scorecard_id) for scorecard_id, differential in differentials]
+            )
+            return cursor.rowcount
+
+    @retry_on_busy
+    def update_scorecard_points(self, updates):
+        """
+        Guarda los puntos recalculados de varias tarjetas en una sola transacción.
+        
+        Args:
+            updates (iterable): Tuplas (scorecard_id, points, total_points), con los
+                puntos por hoyo en formato JSON
+            
+        Returns:
+            int: Número de tarjetas actualizadas
+        """
+        with self.connection:
+            cursor = self.connection.executemany(
+                'UPDATE scorecards SET points = ?, total_points = ?, version = version + 1 WHERE id = ?',
+                [(points, total_points, scorecard_id) for scorecard_id, points, total_points in updates]
+            )
+            return cursor.rowcount
+
+    def get_course_first_rounds(self, course_id):
+        """
+        Obtiene la fecha de la primera tarjeta de cada jugador en un campo.
+        
+        Args:
+            course_id (int): ID del campo
+        
+        Returns:
+            list: Filas con player_id y date
+        """
+        with self.connection:
+            return self.connection.execute('''
+                SELECT player_id, MIN(date) AS date
+                FROM scorecards
+                WHERE course_id = ?
+                GROUP BY player_id
+            ''', (course_id,)).fetchall()
+
+    def get_course_scorecard_rows(self, course_id, start_date=None, end_date=None):
+        """
+        Obtiene las columnas de las tarjetas de un campo que necesita ScorecardBatch.
+        
+        A diferencia de search_scorecards no une jugadores ni campos, lo que la
+        hace adecuada para cargar historiales grandes.
+        
+        Args:
+            course_id (int): ID del campo
+            start_date (str, optional): Fecha de inicio (YYYY-MM-DD)
+            end_date (str, optional): Fecha de fin (YYYY-MM-DD)
+        
+        Returns:
+            list: Filas ordenadas por fecha descendente
+        """
+        query = """
+            SELECT id, player_id, course_id, tee_id, date, strokes, points,
+                   handicap_coefficient, playing_handicap
+            FROM scorecards
+            WHERE course_id = ?
+        """
+        params = [course_id]
+        
+        if start_date:
+            query += " AND date >= ?"
+            params.append(start_date)
+        
+        if end_date:
+            query += " AND date <= ?"
+            params.append(end_date)
+        
+        query += " ORDER BY date DESC, id DESC"
+        
+        with self.connection:
+            return self.connection.execute(query, params).fetchall()
+
+    # Columnas de las consultas de mejores rondas; par_total es el de la salida
+    _TOP_ROUND_COLUMNS = """
+        s.id, s.player_id, s.course_id, s.date, s.total_strokes, s.total_points,
+        s.playing_handicap, COALESCE(t.par_total, c.par_total) AS par_total,
+        c.name AS course_name, p.first_name, p.surname
+    """
+    
+    # Métricas que se resuelven recorriendo un índice: métrica -> (expresión, orden).
+    # La expresión debe coincidir con la del índice para que SQLite lo use
+    INDEXED_TOP_METRICS = {
+        'gross': ('s.total_strokes', 'ASC'),
+        'net': ('s.total_strokes - s.playing_handicap', 'ASC'),
+        'stableford': ('s.total_points', 'DESC'),
+    }
+
+    def get_top_rounds(self, metric, limit, filters=None):
+        """
+        Obtiene las mejores rondas según una métrica con índice.
+        
+        La consulta recorre el índice de la columna ordenada y se detiene al
+        llegar a ``limit`` filas, por lo que no depende del tamaño del historial.
+        
+        Args:
+            metric (str): Métrica de INDEXED_TOP_METRICS ('gross', 'net' o 'stableford')
+            limit (int): Número máximo de rondas
+            filters (dict, optional): Filtros admitidos por search_scorecards
+        
+        Returns:
+            list: Filas ordenadas de mejor a peor
+        """
+        column, order = self.INDEXED_TOP_METRICS[metric]
+        conditions, params = self._scorecard_filter_clause(filters)
+        # CROSS JOIN fija scorecards como tabla exterior: con las estadísticas de
+        # ANALYZE, SQLite prefiere recorrer players y ordenar todas las rondas
+        query = f"""
+            SELECT {self._TOP_ROUND_COLUMNS}
+            FROM scorecards s
+            CROSS JOIN players p ON s.player_id = p.id
+            CROSS JOIN courses c ON s.course_id = c.id
+            LEFT JOIN course_tees t ON t.id = s.tee_id
+            WHERE {conditions} AND {column} IS NOT NULL
+            ORDER BY {column} {order}, s.id DESC
+            LIMIT ?
+        """
+        
+        with self.connection:
+            return self.connection.execute(query, params + [limit]).fetchall()
+
+    def get_top_rounds_per_course(self, limit, filters=None):
+        """
+        Obtiene las ``limit`` rondas de menos golpes de cada salida en una sola consulta.
+        
+        Las rondas sin salida forman un grupo más de cada campo. Una subconsulta
+        correlacionada recorre el índice (course_id, tee_id, total_strokes) de
+        cada grupo y se detiene en ``limit`` filas, sin lanzar una consulta por
+        salida.
+        
+        Args:
+            limit (int): Número máximo de rondas por salida
+            filters (dict, optional): Filtros admitidos por search_scorecards
+        
+        Returns:
+            list: Filas con las mismas columnas que get_top_rounds
+        """
+        conditions, params = self._scorecard_filter_clause(filters)
+        query = f"""
+            WITH tee_groups AS (
+                SELECT id AS course_id, NULL AS tee_id FROM courses
+                UNION ALL
+                SELECT course_id, id FROM course_tees
+            )
+            SELECT {self._TOP_ROUND_COLUMNS}
+            FROM tee_groups g
+            JOIN scorecards s ON s.id IN (
+                SELECT s.id
+                FROM scorecards s
+                JOIN players p ON s.player_id = p.id
+                JOIN courses c ON s.course_id = c.id
+                LEFT JOIN course_tees t ON t.id = s.tee_id
+                WHERE s.course_id = g.course_id AND s.tee_id IS g.tee_id
+                  AND {conditions} AND s.total_strokes IS NOT NULL
+                ORDER BY s.total_strokes ASC, s.id DESC
+                LIMIT ?
+            )
+            JOIN players p ON s.player_id = p.id
+            JOIN courses c ON s.course_id = c.id
+            LEFT JOIN course_tees t ON t.id = s.tee_id
+        """
+        
+        with self.connection:
+            return self.connection.execute(query, params + [limit]).fetchall()
+
     def get_stats(self, player_id=None, course_id=None, start_date=None, end_date=None):
         """
         Obtiene estadísticas de las tarjetas.
@@ -434,21 +1650,14 @@ class Database:
         query = """
             SELECT 
                 COUNT(*) as total_rounds,
-                AVG(total_strokes) as avg_strokes,
-                MIN(total_strokes) as best_round,
-                MAX(total_strokes) as worst_round,
-                AVG(total_points) as avg_points
-            FROM (
-                SELECT 
-                    s.id,
-                    SUM(CAST(value as INTEGER)) as total_strokes,
-                    SUM(CAST(point as INTEGER)) as total_points
-                FROM scorecards s
-                JOIN players p ON s.player_id = p.id
-                JOIN courses c ON s.course_id = c.id,
-                json_each('["' || REPLACE(s.strokes, ',', '","') || '"]') as strokes(value),
-                json_each('["' || REPLACE(s.points, ',', '","') || '"]') as points(point)
-                WHERE 1=1
+                AVG(s.total_strokes) as avg_strokes,
+                MIN(s.total_strokes) as best_round,
+                MAX(s.total_strokes) as worst_round,
+                AVG(s.total_points) as avg_points
+            FROM scorecards s
+            JOIN players p ON s.player_id = p.id
+            JOIN courses c ON s.course_id = c.id
+            WHERE 1=1
         """
         params = []
         
@@ -468,8 +1677,6 @@ class Database:
             query += " AND s.date <= ?"
             params.append(end_date)
         
-        query += " GROUP BY s.id)"
-        
         with self.connection:
             result = self.connection.execute(query, params).fetchone()
             return dict(result) if result else {
@@ -479,3 +1686,75 @@ class Database:
                 'worst_round': 0,
                 'avg_points': 0
             }
+
+    # Extremos que calcula get_player_stats: (clave, columna, orden)
+    PLAYER_STATS_EXTREMES = (
+        ('best_gross', 'total_strokes', 'ASC'),
+        ('worst_gross', 'total_strokes', 'DESC'),
+        ('best_to_par', 'to_par', 'ASC'),
+        ('worst_to_par', 'to_par', 'DESC'),
+        ('best_points', 'total_points', 'DESC'),
+        ('worst_points', 'total_points', 'ASC'),
+    )
+
+    def get_player_stats(self, player_id, start_date=None, end_date=None):
+        """
+        Obtiene las estadísticas de un jugador en una sola consulta.
+        
+        Las medias y los extremos (mejor y peor ronda por golpes, resultado
+        respecto al par y puntos stableford) se calculan en SQL sobre todo el
+        historial del jugador, usando el índice (player_id, date).
+        
+        Args:
+            player_id (int): ID del jugador
+            start_date (str, optional): Fecha de inicio (YYYY-MM-DD)
+            end_date (str, optional): Fecha de fin (YYYY-MM-DD)
+        
+        Returns:
+            list: Filas con la columna kind ('summary' o la clave de cada extremo)
+        """
+        conditions = ["s.player_id = ?", "s.total_strokes IS NOT NULL"]
+        params = [player_id]
+        
+        if start_date:
+            conditions.append("s.date >= ?")
+            params.append(start_date)
+        
+        if end_date:
+            conditions.append("s.date <= ?")
+            params.append(end_date)
+        
+        columns = "id, date, course_id, course_name, total_strokes, total_points, to_par"
+        selects = [f"""
+            SELECT 'summary' AS kind, NULL AS id, NULL AS date, NULL AS course_id,
+                   NULL AS course_name, AVG(total_strokes) AS total_strokes,
+                   AVG(total_points) AS total_points, AVG(to_par) AS to_par,
+                   COUNT(*) AS rounds
+            FROM rounds
+        """]
+        for kind, column, order in self.PLAYER_STATS_EXTREMES:
+            # A igualdad de resultado se toma la ronda más reciente
+            selects.append(f"""
+                SELECT * FROM (
+                    SELECT '{kind}', {columns}, NULL
+                    FROM rounds
+                    ORDER BY {column} {order}, date DESC, id DESC
+                    LIMIT 1
+                )
+            """)
+        
+        query = f"""
+            WITH rounds AS (
+                SELECT s.id, s.date, s.course_id, c.name AS course_name,
+                       s.total_strokes, s.total_points,
+                       s.total_strokes - COALESCE(t.par_total, c.par_total) AS to_par
+                FROM scorecards s
+                JOIN courses c ON s.course_id = c.id
+                LEFT JOIN course_tees t ON t.id = s.tee_id
+                WHERE {' AND '.join(conditions)}
+            )
+            {' UNION ALL '.join(selects)}
+        """
+        
+        with self.connection:
+            return self.connection.execute(query, params).fetchall()
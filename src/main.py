@@ -1,6 +1,12 @@
 """
 Punto de entrada principal de la aplicación.
+
+Uso:
+    python src/main.py [--profile DIR] [--profile-memory] [--metrics FICHERO]
+    python src/main.py --dump-metrics FICHERO
 """
+import argparse
+import json
 import os
 import sys
 from colorama import init
@@ -9,13 +15,36 @@ from colorama import init
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.database import Database
+from src.utils import metrics, profiling
 from src.views.menu_view_simple import MenuViewSimple
 
 # Inicializar colorama
 init(autoreset=True)
 
+def parse_args():
+    """Lee las opciones de la línea de comandos"""
+    parser = argparse.ArgumentParser(description="Golf Scorecard Manager")
+    parser.add_argument('--profile', metavar='DIR', default=None,
+                        help="Perfilar cada acción del menú y guardar los perfiles en DIR")
+    parser.add_argument('--profile-memory', action='store_true',
+                        help="Añadir a cada perfil una instantánea de memoria (tracemalloc)")
+    parser.add_argument('--metrics', metavar='FICHERO', default=None,
+                        help="Escribir las métricas en formato Prometheus en FICHERO tras cada acción")
+    parser.add_argument('--dump-metrics', metavar='FICHERO', default=None,
+                        help="Mostrar como JSON las métricas guardadas en FICHERO y salir")
+    return parser.parse_args()
+
 def main():
     """Función principal de la aplicación"""
+    args = parse_args()
+    if args.dump_metrics:
+        with open(args.dump_metrics, encoding='utf-8') as f:
+            print(json.dumps(metrics.parse_prometheus(f.read()), indent=2, ensure_ascii=False))
+        return
+    
+    profiling.configure(directory=args.profile, memory=args.profile_memory or None)
+    metrics.configure(file=args.metrics)
+    
     try:
         # Crear directorio de datos si no existe
         os.makedirs('data', exist_ok=True)
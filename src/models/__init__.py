@@ -1,3 +1,5 @@
 from .player import Player
 from .course import Course
+from .course_tee import CourseTee
 from .scorecard import Scorecard
+from .scorecard_batch import ScorecardBatch
@@ -1,3 +1,15 @@
+import json
+
+import numpy as np
+
+from src.models.course_tee import CourseTee
+from src.utils.handicap import MAX_HANDICAP_INDEX, MIN_HANDICAP_INDEX
+from src.utils.row_decoder import decode_hole_list, row_keys
+from src.utils.scoring_batch import (
+    MAX_ALLOCATED_HANDICAP, batch_playing_handicap, stroke_allocation_table
+)
+
+
 class Course:
     """
     Modelo para representar un campo de golf.
@@ -11,10 +23,19 @@ class Course:
         par_total (int): Par total del campo
         hole_pars (list): Lista de pares para cada hoyo
         hole_handicaps (list): Lista de hándicaps para cada hoyo
+        tees (list): Salidas del campo (CourseTee), cargadas junto con el campo
+        tee (CourseTee): Salida cuyos valores tiene la instancia, o None si son
+            los del campo (ver for_tee)
+    
+    Las tablas de hándicap de juego y de reparto de golpes se calculan la primera
+    vez que se usan y se guardan en la instancia. Como el controlador de campos
+    descarta la instancia de su caché al modificar el campo, cada versión del
+    campo tiene sus propias tablas; si se modifican los atributos de una
+    instancia, las tablas se recalculan en el siguiente uso.
     """
     
     def __init__(self, id=None, name="", location="", slope=113, course_rating=72.0, 
-                 par_total=72, hole_pars=None, hole_handicaps=None):
+                 par_total=72, hole_pars=None, hole_handicaps=None, tees=None):
         self.id = id
         self.name = name
         self.location = location
@@ -23,28 +44,32 @@ class Course:
         self.par_total = par_total
         self.hole_pars = hole_pars or []
         self.hole_handicaps = hole_handicaps or []
+        self.tees = tees or []
+        self.tee = None
+        self._tee_courses = {}
+        self._tables_key = None
+        self._playing_handicap_table = None
+        self._stroke_allocation_table = None
     
     def __str__(self):
         return f"{self.name} ({self.location}) - Par {self.par_total}"
     
+    @property
+    def par(self):
+        """Par total del campo (alias de par_total usado por las vistas)"""
+        return self.par_total
+    
     @classmethod
     def from_db_row(cls, row):
-        """Crea una instancia de Course a partir de una fila de la base de datos"""
-        import json
-        
-        # Intentar parsear los datos como JSON
-        try:
-            hole_pars = json.loads(row['hole_pars']) if row['hole_pars'] else []
-        except (json.JSONDecodeError, TypeError):
-            # Si falla, intentar el método antiguo (separado por comas)
-            hole_pars = [int(x) for x in row['hole_pars'].split(',') if x.strip()] if row['hole_pars'] else []
-        
-        try:
-            hole_handicaps = json.loads(row['hole_handicaps']) if row['hole_handicaps'] else []
-        except (json.JSONDecodeError, TypeError):
-            # Si falla, intentar el método antiguo (separado por comas)
-            hole_handicaps = [int(x) for x in row['hole_handicaps'].split(',') if x.strip()] if row['hole_handicaps'] else []
+        """
+        Crea una instancia de Course a partir de una fila de la base de datos.
         
+        Si la fila tiene la columna ``tees`` (array JSON de las consultas de
+        campos de Database) se cargan también las salidas del campo.
+        """
+        tees = None
+        if 'tees' in row_keys(row) and row['tees']:
+            tees = [CourseTee.from_db_row(tee) for tee in json.loads(row['tees'])]
         return cls(
             id=row['id'],
             name=row['name'],
@@ -52,6 +77,111 @@ class Course:
             slope=row['slope'],
             course_rating=row['course_rating'],
             par_total=row['par_total'],
-            hole_pars=hole_pars,
-            hole_handicaps=hole_handicaps
+            hole_pars=decode_hole_list(row['hole_pars'], 'hole_pars'),
+            hole_handicaps=decode_hole_list(row['hole_handicaps'], 'hole_handicaps'),
+            tees=tees
         )
+    
+    def get_tee(self, tee_id):
+        """
+        Obtiene una salida del campo.
+        
+        Args:
+            tee_id (int): ID de la salida
+        
+        Returns:
+            CourseTee: La salida, o None si no es de este campo
+        """
+        for tee in self.tees:
+            if tee.id == tee_id:
+                return tee
+        return None
+    
+    def for_tee(self, tee_id):
+        """
+        Obtiene el campo con el slope, el course rating y el par de una salida.
+        
+        La instancia de cada salida se guarda en el campo, de modo que conserva
+        sus tablas de hándicap mientras el campo siga en la caché del controlador.
+        Comparte los pares y hándicaps por hoyo del campo, y se puede pasar a
+        cualquier función que reciba un Course (round_differential...).
+        
+        Args:
+            tee_id (int): ID de la salida, o None para los valores del campo
+        
+        Returns:
+            Course: Campo con los valores de la salida, o el propio campo si
+                tee_id es None o no es una salida de este campo
+        """
+        tee = self.get_tee(tee_id) if tee_id is not None else None
+        if tee is None:
+            return self
+        
+        rated = self._tee_courses.get(tee.id)
+        if rated is None:
+            rated = self._tee_courses[tee.id] = Course(id=self.id, location=self.location)
+        # Se copian en cada llamada por si el campo o la salida han cambiado;
+        # _tables recalcula las tablas solo si cambian los valores
+        rated.tee = tee
+        rated.name = f"{self.name} ({tee.name})"
+        rated.slope, rated.course_rating, rated.par_total = tee.slope, tee.course_rating, tee.par_total
+        rated.hole_pars, rated.hole_handicaps = self.hole_pars, self.hole_handicaps
+        rated.tees = self.tees
+        return rated
+    
+    def _tables(self):
+        """Calcula las tablas del campo si no existen o si el campo ha cambiado"""
+        key = (self.slope, self.course_rating, self.par_total, tuple(self.hole_handicaps))
+        if key != self._tables_key:
+            # Índices de MIN_HANDICAP_INDEX a MAX_HANDICAP_INDEX en décimas
+            indexes = np.arange(round(MIN_HANDICAP_INDEX * 10), round(MAX_HANDICAP_INDEX * 10) + 1) / 10
+            self._playing_handicap_table = batch_playing_handicap(
+                indexes, self.slope, self.course_rating, self.par_total
+            )
+            stroke_index = np.zeros(18, dtype=np.int16)
+            stroke_index[:len(self.hole_handicaps[:18])] = self.hole_handicaps[:18]
+            self._stroke_allocation_table = stroke_allocation_table(stroke_index)
+            self._tables_key = key
+        return self._playing_handicap_table, self._stroke_allocation_table
+    
+    def playing_handicap(self, exact_handicap):
+        """
+        Obtiene el hándicap de juego de un jugador en el campo.
+        
+        Equivale a calculate_playing_handicap; los índices entre MIN_HANDICAP_INDEX
+        y MAX_HANDICAP_INDEX con un decimal se leen de la tabla del campo.
+        
+        Args:
+            exact_handicap (float): Hándicap exacto del jugador
+        
+        Returns:
+            float: Hándicap de juego redondeado a un decimal
+        """
+        if exact_handicap is None:
+            return 0.0
+        
+        table, _ = self._tables()
+        tenths = round(exact_handicap * 10)
+        position = tenths - round(MIN_HANDICAP_INDEX * 10)
+        if 0 <= position < len(table) and tenths / 10 == exact_handicap:
+            return float(table[position])
+        return float(batch_playing_handicap(exact_handicap, self.slope, self.course_rating, self.par_total))
+    
+    def handicap_strokes(self, playing_handicap):
+        """
+        Obtiene los golpes de hándicap que recibe un jugador en cada hoyo.
+        
+        Equivale a calculate_handicap_strokes; el reparto se lee de la tabla del
+        campo según el hándicap redondeado.
+        
+        Args:
+            playing_handicap (float): Hándicap de juego (ya ajustado con el coeficiente)
+        
+        Returns:
+            list: Golpes de hándicap de cada uno de los 18 hoyos
+        """
+        if playing_handicap is None or not self.hole_handicaps:
+            return [0] * 18
+        
+        _, table = self._tables()
+        return table[min(max(round(playing_handicap), 0), MAX_ALLOCATED_HANDICAP)].tolist()
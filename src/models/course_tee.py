@@ -0,0 +1,53 @@
+from src.utils.row_decoder import decode_hole_list
+
+
+class CourseTee:
+    """
+    Modelo para representar una salida (barras) de un campo de golf.
+    
+    Cada salida tiene su propio slope, course rating y par; los pares y
+    hándicaps por hoyo son los del campo.
+    
+    Atributos:
+        id (int): Identificador único de la salida
+        course_id (int): ID del campo
+        name (str): Nombre de la salida (Amarillas, Rojas...)
+        slope (int): Valor de slope desde esta salida
+        course_rating (float): Rating desde esta salida
+        par_total (int): Par total desde esta salida
+        yardages (list): Distancia de cada hoyo (vacía si no se conoce)
+    """
+    
+    def __init__(self, id=None, course_id=None, name="", slope=113, course_rating=72.0,
+                 par_total=72, yardages=None):
+        self.id = id
+        self.course_id = course_id
+        self.name = name
+        self.slope = slope
+        self.course_rating = course_rating
+        self.par_total = par_total
+        self.yardages = yardages or []
+    
+    def __str__(self):
+        return f"{self.name} - Slope {self.slope} - CR {self.course_rating} - Par {self.par_total}"
+    
+    @property
+    def total_yardage(self):
+        """Distancia total del recorrido desde esta salida (0 si no se conoce)"""
+        return sum(self.yardages)
+    
+    @classmethod
+    def from_db_row(cls, row):
+        """
+        Crea una instancia de CourseTee a partir de una fila de course_tees o de
+        un objeto de la columna ``tees`` de las consultas de campos.
+        """
+        return cls(
+            id=row['id'],
+            course_id=row['course_id'],
+            name=row['name'],
+            slope=row['slope'],
+            course_rating=row['course_rating'],
+            par_total=row['par_total'],
+            yardages=decode_hole_list(row['yardages'], 'yardages')
+        )
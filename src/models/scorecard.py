@@ -1,5 +1,6 @@
 from datetime import datetime
-import json
+
+from src.utils.row_decoder import decode_hole_list, row_keys
 
 class Scorecard:
     """
@@ -14,6 +15,7 @@ class Scorecard:
         points (list): Lista de puntos stableford por hoyo
         handicap_coefficient (int): Coeficiente de hándicap aplicado (como porcentaje, ej: 95 para 95%)
         playing_handicap (float): Hándicap de juego final (puede ser modificado manualmente)
+        version (int): Versión de la tarjeta, para detectar modificaciones concurrentes
         player_name (str): Nombre del jugador (opcional, para visualización)
         course_name (str): Nombre del campo (opcional, para visualización)
         course_location (str): Ubicación del campo (opcional)
@@ -22,13 +24,16 @@ class Scorecard:
         course_par_total (int): Puntuación total del campo (opcional)
         course_hole_pars (list): Puntuaciones de cada hoyo del campo (opcional)
         course_hole_handicaps (list): Hándicaps de cada hoyo del campo (opcional)
+        tee_id (int): ID de la salida desde la que se jugó (None: valores del campo)
+        tee_name (str): Nombre de la salida (opcional, para visualización)
     """
     
     def __init__(self, id=None, player_id=None, course_id=None, date=None, 
                  strokes=None, points=None, handicap_coefficient=100,
                  playing_handicap=None, player_name=None, course_name=None,
                  course_location=None, course_slope=None, course_rating=None,
-                 course_par_total=None, course_hole_pars=None, course_hole_handicaps=None):
+                 course_par_total=None, course_hole_pars=None, course_hole_handicaps=None,
+                 version=None, tee_id=None, tee_name=None):
         """
         Inicializa una nueva instancia de Scorecard.
         
@@ -49,6 +54,9 @@ class Scorecard:
             course_par_total (int, optional): Puntuación total del campo
             course_hole_pars (list, optional): Puntuaciones de cada hoyo del campo
             course_hole_handicaps (list, optional): Hándicaps de cada hoyo del campo
+            version (int, optional): Versión de la tarjeta en la base de datos
+            tee_id (int, optional): ID de la salida desde la que se jugó
+            tee_name (str, optional): Nombre de la salida
         """
         self.id = id
         self.player_id = player_id
@@ -66,6 +74,9 @@ class Scorecard:
         self.course_par_total = course_par_total
         self.course_hole_pars = course_hole_pars or []
         self.course_hole_handicaps = course_hole_handicaps or []
+        self.version = version
+        self.tee_id = tee_id
+        self.tee_name = tee_name
     
     def __str__(self):
         player_info = self.player_name or f"Jugador ID: {self.player_id}"
@@ -94,117 +105,81 @@ class Scorecard:
         if not row:
             return None
         
-        # Convertir JSON a listas
-        strokes = json.loads(row['strokes']) if row['strokes'] else []
-        points = json.loads(row['points']) if row['points'] else []
+        keys = row_keys(row)
         
         return cls(
             id=row['id'],
             player_id=row['player_id'],
             course_id=row['course_id'],
             date=row['date'],
-            strokes=strokes,
-            points=points,
+            strokes=decode_hole_list(row['strokes'], 'strokes'),
+            points=decode_hole_list(row['points'], 'points'),
             handicap_coefficient=row['handicap_coefficient'],
             playing_handicap=row['playing_handicap'],
-            player_name=row.get('player_name'),
-            course_name=row.get('course_name')
+            player_name=row['player_name'] if 'player_name' in keys else None,
+            course_name=row['course_name'] if 'course_name' in keys else None,
+            version=row['version'] if 'version' in keys else None,
+            tee_id=row['tee_id'] if 'tee_id' in keys else None
         )
     
     @classmethod
     def from_joined_row(cls, row):
-        """Crea una instancia de Scorecard a partir de una fila con join de tablas"""
+        """
+        Crea una instancia de Scorecard a partir de una fila con join de tablas.
+        
+        Args:
+            row (sqlite3.Row or dict): Fila con columnas de scorecards y, opcionalmente,
+                de players (first_name, surname) y courses (name, location, ...)
+            
+        Returns:
+            Scorecard: Instancia de Scorecard
+            
+        Raises:
+            HoleDataError: Si los datos por hoyo de la fila están corruptos
+        """
+        keys = row_keys(row)
+        
         # Crear la tarjeta con los campos básicos
         scorecard = cls(
             id=row['id'],
             player_id=row['player_id'],
             course_id=row['course_id'],
             date=row['date'],
+            strokes=decode_hole_list(row['strokes'], 'strokes') if 'strokes' in keys else None,
+            points=decode_hole_list(row['points'], 'points') if 'points' in keys else None,
             handicap_coefficient=row['handicap_coefficient'],
-            playing_handicap=row['playing_handicap']
+            playing_handicap=row['playing_handicap'],
+            version=row['version'] if 'version' in keys else None,
+            tee_id=row['tee_id'] if 'tee_id' in keys else None
         )
         
-        # Procesar los campos de listas
-        if 'strokes' in row and row['strokes']:
-            try:
-                # Verificar si es una cadena JSON
-                if row['strokes'].startswith('['):
-                    scorecard.strokes = json.loads(row['strokes'])
-                else:
-                    # Limpiar la cadena de texto para eliminar comas múltiples
-                    clean_strokes = row['strokes'].replace(',,,', ',').replace(',,', ',')
-                    # Eliminar comas al inicio y al final
-                    clean_strokes = clean_strokes.strip(',')
-                    scorecard.strokes = [int(x) for x in clean_strokes.split(',') if x.strip()]
-            except Exception as e:
-                print(f"Error al procesar strokes: {str(e)}")
-                scorecard.strokes = []
-        
-        if 'points' in row and row['points']:
-            try:
-                # Verificar si es una cadena JSON
-                if row['points'].startswith('['):
-                    scorecard.points = json.loads(row['points'])
-                else:
-                    # Limpiar la cadena de texto para eliminar comas múltiples
-                    clean_points = row['points'].replace(',,,', ',').replace(',,', ',')
-                    # Eliminar comas al inicio y al final
-                    clean_points = clean_points.strip(',')
-                    scorecard.points = [int(x) for x in clean_points.split(',') if x.strip()]
-            except Exception as e:
-                print(f"Error al procesar points: {str(e)}")
-                scorecard.points = []
-        
         # Añadir información adicional si está disponible
-        if 'first_name' in row and 'surname' in row:
+        if 'first_name' in keys and 'surname' in keys:
             scorecard.player_name = f"{row['first_name']} {row['surname']}"
         
         # Asignar información del campo
-        if 'name' in row:
+        if 'name' in keys:
             scorecard.course_name = row['name']
             
-        if 'location' in row:
+        if 'location' in keys:
             scorecard.course_location = row['location']
             
-        if 'slope' in row:
+        if 'slope' in keys:
             scorecard.course_slope = row['slope']
             
-        if 'course_rating' in row:
+        if 'course_rating' in keys:
             scorecard.course_rating = row['course_rating']
             
-        if 'par_total' in row:
+        if 'par_total' in keys:
             scorecard.course_par_total = row['par_total']
             
-        if 'hole_pars' in row and row['hole_pars']:
-            try:
-                # Verificar si es una cadena JSON
-                if isinstance(row['hole_pars'], str) and row['hole_pars'].startswith('['):
-                    scorecard.course_hole_pars = json.loads(row['hole_pars'])
-                elif isinstance(row['hole_pars'], list):
-                    scorecard.course_hole_pars = row['hole_pars']
-                else:
-                    # Es una cadena de texto separada por comas
-                    clean_pars = row['hole_pars'].replace(',,,', ',').replace(',,', ',')
-                    clean_pars = clean_pars.strip(',')
-                    scorecard.course_hole_pars = [int(x) for x in clean_pars.split(',') if x.strip()]
-            except Exception as e:
-                print(f"Error al procesar hole_pars: {str(e)}")
-                scorecard.course_hole_pars = []
+        if 'hole_pars' in keys:
+            scorecard.course_hole_pars = decode_hole_list(row['hole_pars'], 'hole_pars')
                 
-        if 'hole_handicaps' in row and row['hole_handicaps']:
-            try:
-                # Verificar si es una cadena JSON
-                if isinstance(row['hole_handicaps'], str) and row['hole_handicaps'].startswith('['):
-                    scorecard.course_hole_handicaps = json.loads(row['hole_handicaps'])
-                elif isinstance(row['hole_handicaps'], list):
-                    scorecard.course_hole_handicaps = row['hole_handicaps']
-                else:
-                    # Es una cadena de texto separada por comas
-                    clean_handicaps = row['hole_handicaps'].replace(',,,', ',').replace(',,', ',')
-                    clean_handicaps = clean_handicaps.strip(',')
-                    scorecard.course_hole_handicaps = [int(x) for x in clean_handicaps.split(',') if x.strip()]
-            except Exception as e:
-                print(f"Error al procesar hole_handicaps: {str(e)}")
-                scorecard.course_hole_handicaps = []
+        if 'hole_handicaps' in keys:
+            scorecard.course_hole_handicaps = decode_hole_list(row['hole_handicaps'], 'hole_handicaps')
+        
+        if 'tee_name' in keys:
+            scorecard.tee_name = row['tee_name']
         
         return scorecard
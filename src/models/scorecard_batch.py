@@ -0,0 +1,274 @@
+from datetime import date as date_cls
+
+import numpy as np
+
+from src.utils.row_decoder import decode_hole_matrix
+from src.utils.scoring_batch import (
+    MAX_ALLOCATED_HANDICAP, batch_course_handicaps, batch_points, stroke_allocation_table
+)
+
+
+class ScorecardBatch:
+    """
+    Conjunto de tarjetas almacenado en arrays contiguos de NumPy para análisis vectorizados.
+
+    Atributos:
+        ids (ndarray): IDs de las tarjetas (N,)
+        player_ids (ndarray): IDs de los jugadores (N,)
+        course_ids (ndarray): IDs de los campos presentes en el lote (C,)
+        course_index (ndarray): Índice de cada tarjeta en course_ids (N,)
+        strokes (ndarray): Golpes por hoyo, int8 (N, 18); 0 si el hoyo no se jugó
+        points (ndarray): Puntos stableford por hoyo, int8 (N, 18)
+        date_ordinals (ndarray): Fecha de cada tarjeta como ordinal (N,)
+        playing_handicaps (ndarray): Hándicap de juego, NaN si no existe (N,)
+        handicap_coefficients (ndarray): Coeficiente de hándicap en porcentaje (N,)
+        course_pars (ndarray): Par por hoyo de cada campo, int8 (C, 18)
+        course_stroke_index (ndarray): Hándicap (stroke index) por hoyo de cada campo, int8 (C, 18)
+        tee_ids (ndarray): ID de la salida de cada tarjeta, 0 si no tiene (N,)
+        par_totals (ndarray): Par total de la salida de cada tarjeta, o del campo si
+            no tiene salida (N,)
+    """
+
+    HOLES = 18
+
+    def __init__(self, ids, player_ids, course_ids, course_index, strokes, points,
+                 date_ordinals, playing_handicaps, handicap_coefficients,
+                 course_pars, course_stroke_index, tee_ids=None, par_totals=None):
+        self.ids = ids
+        self.player_ids = player_ids
+        self.course_ids = course_ids
+        self.course_index = course_index
+        self.strokes = strokes
+        self.points = points
+        self.date_ordinals = date_ordinals
+        self.playing_handicaps = playing_handicaps
+        self.handicap_coefficients = handicap_coefficients
+        self.course_pars = course_pars
+        self.course_stroke_index = course_stroke_index
+        self.tee_ids = tee_ids if tee_ids is not None else np.zeros(len(ids), dtype=np.int64)
+        if par_totals is None:
+            par_totals = course_pars.sum(axis=1, dtype=np.int32)[course_index]
+        self.par_totals = par_totals
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __str__(self):
+        return f"ScorecardBatch({len(self)} tarjetas, {len(self.course_ids)} campos)"
+
+    @classmethod
+    def from_rows(cls, rows, courses):
+        """
+        Crea un lote a partir de filas de la tabla scorecards.
+
+        Args:
+            rows (iterable): Filas con al menos id, player_id, course_id, tee_id, date,
+                strokes, points, handicap_coefficient y playing_handicap
+            courses (dict): Diccionario {course_id: Course} con los campos de las tarjetas
+
+        Returns:
+            ScorecardBatch: Lote con las tarjetas cuyo campo está en ``courses``
+        """
+        holes = cls.HOLES
+        course_ids = sorted(courses)
+        course_lookup = {course_id: i for i, course_id in enumerate(course_ids)}
+        tee_pars = {tee.id: tee.par_total for course in courses.values() for tee in course.tees}
+
+        ids, player_ids, course_index, ordinals, handicaps, coefficients, tee_ids = [], [], [], [], [], [], []
+        par_totals = []
+        strokes_values, points_values = [], []
+        ordinal_cache = {}
+
+        for row in rows:
+            index = course_lookup.get(row['course_id'])
+            if index is None:
+                continue
+
+            day = row['date']
+            ordinal = ordinal_cache.get(day)
+            if ordinal is None:
+                ordinal = ordinal_cache[day] = date_cls.fromisoformat(day).toordinal()
+
+            ids.append(row['id'])
+            player_ids.append(row['player_id'])
+            course_index.append(index)
+            tee_ids.append(row['tee_id'] or 0)
+            par_totals.append(tee_pars.get(row['tee_id'], courses[row['course_id']].par_total))
+            ordinals.append(ordinal)
+            handicaps.append(row['playing_handicap'])
+            coefficients.append(row['handicap_coefficient'])
+            strokes_values.append(row['strokes'])
+            points_values.append(row['points'])
+
+        course_pars = np.zeros((len(course_ids), holes), dtype=np.int8)
+        course_stroke_index = np.zeros((len(course_ids), holes), dtype=np.int8)
+        for i, course_id in enumerate(course_ids):
+            pars = courses[course_id].hole_pars[:holes]
+            stroke_index = courses[course_id].hole_handicaps[:holes]
+            course_pars[i, :len(pars)] = pars
+            course_stroke_index[i, :len(stroke_index)] = stroke_index
+
+        return cls(
+            ids=np.array(ids, dtype=np.int64),
+            player_ids=np.array(player_ids, dtype=np.int64),
+            course_ids=np.array(course_ids, dtype=np.int64),
+            course_index=np.array(course_index, dtype=np.intp),
+            strokes=decode_hole_matrix(strokes_values, holes, 'strokes'),
+            points=decode_hole_matrix(points_values, holes, 'points'),
+            date_ordinals=np.array(ordinals, dtype=np.int32),
+            playing_handicaps=np.array(handicaps, dtype=np.float64),
+            handicap_coefficients=np.array(coefficients, dtype=np.float64),
+            course_pars=course_pars,
+            course_stroke_index=course_stroke_index,
+            tee_ids=np.array(tee_ids, dtype=np.int64),
+            par_totals=np.array(par_totals, dtype=np.int32)
+        )
+
+    def select(self, mask):
+        """
+        Devuelve un nuevo lote con las tarjetas seleccionadas.
+
+        Args:
+            mask (ndarray): Máscara booleana o array de índices sobre las tarjetas
+
+        Returns:
+            ScorecardBatch: Subconjunto del lote (comparte los arrays por campo)
+        """
+        return ScorecardBatch(
+            ids=self.ids[mask],
+            player_ids=self.player_ids[mask],
+            course_ids=self.course_ids,
+            course_index=self.course_index[mask],
+            strokes=self.strokes[mask],
+            points=self.points[mask],
+            date_ordinals=self.date_ordinals[mask],
+            playing_handicaps=self.playing_handicaps[mask],
+            handicap_coefficients=self.handicap_coefficients[mask],
+            course_pars=self.course_pars,
+            course_stroke_index=self.course_stroke_index,
+            tee_ids=self.tee_ids[mask],
+            par_totals=self.par_totals[mask]
+        )
+
+    def played(self):
+        """Retorna la máscara (N, 18) de hoyos con golpes registrados"""
+        return self.strokes > 0
+
+    def hole_pars(self):
+        """Retorna el par de cada hoyo de cada tarjeta (N, 18)"""
+        return self.course_pars[self.course_index]
+
+    def hole_stroke_index(self):
+        """Retorna el stroke index de cada hoyo de cada tarjeta (N, 18)"""
+        return self.course_stroke_index[self.course_index]
+
+    def total_strokes(self):
+        """Retorna el total de golpes de cada tarjeta (N,)"""
+        return self.strokes.sum(axis=1, dtype=np.int32)
+
+    def total_points(self):
+        """Retorna el total de puntos stableford de cada tarjeta (N,)"""
+        return self.points.sum(axis=1, dtype=np.int32)
+
+    def hole_to_par(self):
+        """Retorna el resultado respecto al par de cada hoyo (N, 18); 0 en hoyos no jugados"""
+        diff = self.strokes - self.hole_pars()
+        diff[self.strokes == 0] = 0
+        return diff
+
+    def to_par(self):
+        """
+        Retorna el resultado respecto al par de cada tarjeta (N,).
+
+        Es el total de golpes menos el par total de la salida, igual que en las
+        consultas de la base de datos (filtros, estadísticas de jugador y mejores
+        rondas).
+        """
+        return self.total_strokes() - self.par_totals
+
+    def hole_averages(self):
+        """
+        Calcula la media de golpes por hoyo sobre los hoyos jugados.
+
+        Returns:
+            ndarray: Media de golpes de cada hoyo (18,); NaN si ningún jugador lo jugó
+        """
+        return self._played_average(self.strokes)
+
+    def hole_to_par_averages(self):
+        """
+        Calcula la media del resultado respecto al par de cada hoyo.
+
+        Returns:
+            ndarray: Media respecto al par de cada hoyo (18,); NaN si ningún jugador lo jugó
+        """
+        return self._played_average(self.hole_to_par())
+
+    def score_distribution(self, min_diff=-2, max_diff=3):
+        """
+        Cuenta los resultados respecto al par de cada hoyo.
+
+        Los resultados se agrupan entre ``min_diff`` (eagle o mejor) y ``max_diff``
+        (triple bogey o peor); los hoyos no jugados no se cuentan.
+
+        Args:
+            min_diff (int): Resultado mínimo (los mejores se acumulan aquí)
+            max_diff (int): Resultado máximo (los peores se acumulan aquí)
+
+        Returns:
+            ndarray: Matriz (18, max_diff - min_diff + 1) con el número de hoyos por resultado
+        """
+        bins = max_diff - min_diff + 1
+        buckets = np.clip(self.strokes - self.hole_pars(), min_diff, max_diff) - min_diff
+        # Los hoyos no jugados van a una casilla adicional que se descarta
+        buckets[self.strokes == 0] = bins
+        columns = np.ascontiguousarray(buckets.T).astype(np.intp)
+        return np.stack([np.bincount(column, minlength=bins + 1)[:bins] for column in columns])
+
+    def handicap_strokes(self):
+        """
+        Calcula los golpes de hándicap de cada hoyo de cada tarjeta.
+
+        Equivale a calculate_handicap_strokes con el hándicap de juego de la tarjeta
+        por su coeficiente. Los golpes se leen de la tabla de reparto de cada campo,
+        que solo tiene MAX_ALLOCATED_HANDICAP + 1 filas por campo.
+
+        Returns:
+            ndarray: Golpes recibidos en cada hoyo, int8 (N, 18)
+        """
+        course_handicaps = batch_course_handicaps(self.playing_handicaps, self.handicap_coefficients)
+        tables = stroke_allocation_table(self.course_stroke_index)
+        return tables[self.course_index, np.clip(course_handicaps, 0, MAX_ALLOCATED_HANDICAP)]
+
+    def stableford_points(self):
+        """
+        Calcula los puntos stableford con los pares y hándicaps actuales de los campos.
+
+        Equivale a calculate_points en cada hoyo.
+
+        Returns:
+            ndarray: Puntos de cada hoyo, int8 (N, 18)
+        """
+        return batch_points(self.strokes, self.hole_pars(), self.handicap_strokes())
+
+    def difficulty_rank(self):
+        """
+        Ordena los hoyos por dificultad según su media respecto al par.
+
+        Returns:
+            ndarray: Posición de cada hoyo (18,), 1 para el más difícil; los hoyos
+                sin datos quedan al final y, a igualdad de media, manda el número de hoyo
+        """
+        averages = self.hole_to_par_averages()
+        # lexsort ordena por la última clave: primero los hoyos con datos, luego la media
+        order = np.lexsort((-np.nan_to_num(averages, nan=0.0), np.isnan(averages)))
+        rank = np.empty(self.HOLES, dtype=np.int64)
+        rank[order] = np.arange(1, self.HOLES + 1)
+        return rank
+
+    def _played_average(self, values):
+        """Media por hoyo de ``values`` considerando solo los hoyos jugados."""
+        counts = np.count_nonzero(self.strokes, axis=0)
+        sums = values.sum(axis=0, dtype=np.int64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(counts > 0, sums / counts, np.nan)
@@ -0,0 +1,182 @@
+"""
+Caché en memoria (identity map) para entidades leídas de la base de datos.
+"""
+import itertools
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from src.utils.metrics import CACHE_LOOKUPS
+
+# Cachés vivas, para invalidarlas desde los controladores que escriben
+_caches = weakref.WeakSet()
+
+# Operación en curso (None fuera de ``operation``)
+_operation_ids = itertools.count(1)
+_current_operation = None
+
+
+@contextmanager
+def operation():
+    """
+    Agrupa las lecturas de una acción del usuario en una sola operación.
+
+    Dentro del bloque cada caché comprueba ``PRAGMA data_version`` una sola vez,
+    en su primer acceso; fuera de él lo comprueba en cada ``get``. Los bloques
+    anidados pertenecen a la operación exterior. También sirve como decorador.
+    """
+    global _current_operation
+    outer = _current_operation
+    if outer is None:
+        _current_operation = next(_operation_ids)
+    try:
+        yield
+    finally:
+        _current_operation = outer
+
+
+def invalidate_caches(database, name, key=None):
+    """
+    Invalida una entidad en todas las cachés de la misma base de datos.
+
+    Los controladores lo llaman tras escribir, de modo que las cachés de otros
+    controladores (con la misma u otra conexión) no sirvan la versión anterior.
+
+    Args:
+        database (Database): Base de datos modificada
+        name (str): Nombre de las cachés afectadas ('player', 'course')
+        key (optional): ID de la entidad modificada; sin ID se vacían las cachés
+    """
+    for cache in list(_caches):
+        if cache.name == name and cache.db.db_path == database.db_path:
+            cache.invalidate(key)
+
+
+class IdentityMapCache:
+    """
+    Identity map con política LRU para entidades identificadas por su ID.
+
+    Cada ID se corresponde con una única instancia mientras está en caché. Las
+    escrituras de los controladores invalidan las entradas afectadas con
+    ``invalidate_caches``. Los cambios de otros procesos se detectan con
+    ``PRAGMA data_version``, que se comprueba una vez por ``operation`` y vacía
+    la caché entera si la base de datos ha cambiado.
+    """
+
+    def __init__(self, database, maxsize=256, name='entities'):
+        """
+        Inicializa la caché.
+
+        Args:
+            database (Database): Base de datos cuya versión se vigila
+            maxsize (int): Número máximo de entidades en caché
+            name (str): Nombre de la caché en las métricas
+        """
+        self.db = database
+        self.maxsize = maxsize
+        self.name = name
+        self._entries = OrderedDict()
+        self._data_version = None
+        self._synced_operation = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        _caches.add(self)
+
+    def get(self, key):
+        """
+        Obtiene una entidad de la caché.
+
+        Args:
+            key: ID de la entidad
+
+        Returns:
+            object: La entidad, o None si no está en caché
+        """
+        self.sync()
+        return self.peek(key)
+
+    def peek(self, key):
+        """
+        Obtiene una entidad sin comprobar la versión de la base de datos.
+
+        Útil en operaciones por lotes que ya han llamado a ``sync``.
+
+        Args:
+            key: ID de la entidad
+
+        Returns:
+            object: La entidad, o None si no está en caché
+        """
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            CACHE_LOOKUPS.inc(cache=self.name, result='miss')
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        CACHE_LOOKUPS.inc(cache=self.name, result='hit')
+        return value
+
+    def put(self, key, value):
+        """
+        Guarda una entidad en la caché, expulsando la menos usada si está llena.
+
+        Args:
+            key: ID de la entidad
+            value (object): Entidad a guardar
+        """
+        if value is None:
+            return
+
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key=None):
+        """
+        Elimina una entidad de la caché, o todas si no se indica ID.
+
+        Args:
+            key (optional): ID de la entidad a invalidar
+        """
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+        self.invalidations += 1
+
+    def sync(self):
+        """
+        Vacía la caché si otra conexión ha modificado la base de datos.
+
+        Dentro de una ``operation`` solo se consulta la versión la primera vez.
+        """
+        if _current_operation is not None and self._synced_operation == _current_operation:
+            return
+        self._synced_operation = _current_operation
+
+        version = self.db.get_data_version()
+        if version != self._data_version:
+            if self._data_version is not None and self._entries:
+                self.invalidate()
+            self._data_version = version
+
+    def stats(self):
+        """
+        Obtiene los contadores de uso de la caché.
+
+        Returns:
+            dict: Aciertos, fallos, tasa de aciertos, invalidaciones y tamaño
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'invalidations': self.invalidations,
+            'size': len(self._entries),
+            'maxsize': self.maxsize
+        }
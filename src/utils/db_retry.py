@@ -0,0 +1,189 @@
+"""
+Reintentos de escrituras en SQLite cuando la base de datos está bloqueada.
+
+Con varios procesos escribiendo en el mismo archivo, SQLite devuelve
+SQLITE_BUSY ("database is locked") cuando no consigue el bloqueo a tiempo. El
+busy timeout de la conexión hace que SQLite espere al bloqueo, pero en algunos
+casos (una transacción que leyó antes de escribir mientras otra confirma)
+devuelve el error sin esperar para evitar un interbloqueo. Para esos casos las
+escrituras se deshacen y se repiten enteras con esperas exponenciales acotadas.
+
+La configuración por defecto se puede cambiar con variables de entorno:
+
+    GOLF_DB_BUSY_TIMEOUT   Espera máxima de SQLite por un bloqueo, en ms (5000)
+    GOLF_DB_MAX_RETRIES    Reintentos de una escritura bloqueada (5)
+    GOLF_DB_RETRY_DELAY    Espera antes del primer reintento, en ms (50)
+"""
+import functools
+import os
+import random
+import sqlite3
+import time
+
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_RETRY_DELAY_MS = 50
+
+# Espera máxima entre dos reintentos, en ms
+MAX_RETRY_DELAY_MS = 2000
+
+
+def _env_int(name, default):
+    """Lee un entero no negativo de una variable de entorno, o devuelve el valor por defecto"""
+    value = os.environ.get(name)
+    if value is None or value.strip() == '':
+        return default
+    try:
+        return max(0, int(value))
+    except ValueError:
+        return default
+
+
+def busy_timeout_from_env():
+    """Devuelve el busy timeout configurado, en ms"""
+    return _env_int('GOLF_DB_BUSY_TIMEOUT', DEFAULT_BUSY_TIMEOUT_MS)
+
+
+def max_retries_from_env():
+    """Devuelve el número de reintentos configurado"""
+    return _env_int('GOLF_DB_MAX_RETRIES', DEFAULT_MAX_RETRIES)
+
+
+def retry_delay_from_env():
+    """Devuelve la espera antes del primer reintento configurada, en ms"""
+    return _env_int('GOLF_DB_RETRY_DELAY', DEFAULT_RETRY_DELAY_MS)
+
+
+def is_busy_error(error):
+    """
+    Indica si una excepción es un SQLITE_BUSY o SQLITE_LOCKED.
+
+    Args:
+        error (Exception): Excepción capturada
+
+    Returns:
+        bool: True si la base de datos estaba bloqueada
+    """
+    if not isinstance(error, sqlite3.OperationalError):
+        return False
+    code = getattr(error, 'sqlite_errorcode', None)
+    if code is not None:
+        # Los códigos extendidos conservan el código primario en el byte bajo
+        return code & 0xFF in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+    message = str(error).lower()
+    return 'locked' in message or 'busy' in message
+
+
+def retry_delay(attempt, base_delay_ms):
+    """
+    Calcula la espera antes de un reintento, en segundos.
+
+    La espera se duplica en cada intento hasta MAX_RETRY_DELAY_MS y se elige al
+    azar entre la mitad y el total ("jitter") para que los procesos bloqueados
+    a la vez no vuelvan a chocar.
+
+    Args:
+        attempt (int): Número de reintento, empezando en 0
+        base_delay_ms (int): Espera del primer reintento, en ms
+
+    Returns:
+        float: Segundos de espera
+    """
+    delay = min(MAX_RETRY_DELAY_MS, base_delay_ms * (2 ** attempt))
+    return random.uniform(delay / 2, delay) / 1000
+
+
+class LockWaitMetrics:
+    """
+    Contadores de escrituras bloqueadas de una conexión.
+
+    ``wait_seconds`` incluye el tiempo de los intentos fallidos (en los que
+    SQLite ya ha esperado hasta el busy timeout) y las esperas entre reintentos.
+    """
+
+    def __init__(self):
+        self.writes = 0
+        self.blocked_writes = 0
+        self.busy_errors = 0
+        self.retries = 0
+        self.failures = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record(self, busy_errors, failed, wait_seconds):
+        """
+        Registra el resultado de una escritura.
+
+        Args:
+            busy_errors (int): Veces que la escritura encontró la base de datos bloqueada
+            failed (bool): True si se agotaron los reintentos
+            wait_seconds (float): Tiempo perdido por los bloqueos
+        """
+        self.writes += 1
+        self.blocked_writes += 1 if busy_errors else 0
+        self.busy_errors += busy_errors
+        self.retries += busy_errors - 1 if failed else busy_errors
+        self.failures += 1 if failed else 0
+        self.wait_seconds += wait_seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+    def stats(self):
+        """
+        Obtiene los contadores.
+
+        Returns:
+            dict: Escrituras, escrituras bloqueadas, errores por bloqueo, reintentos,
+                fallos y tiempo de espera total, medio por escritura bloqueada y
+                máximo, en segundos
+        """
+        return {
+            'writes': self.writes,
+            'blocked_writes': self.blocked_writes,
+            'busy_errors': self.busy_errors,
+            'retries': self.retries,
+            'failures': self.failures,
+            'wait_seconds': self.wait_seconds,
+            'avg_wait_seconds': self.wait_seconds / self.blocked_writes if self.blocked_writes else 0.0,
+            'max_wait_seconds': self.max_wait_seconds
+        }
+
+
+def retry_on_busy(method):
+    """
+    Decorador de los métodos de escritura de Database.
+
+    Si el método falla porque la base de datos está bloqueada, deshace la
+    transacción y lo repite hasta ``max_retries`` veces con esperas crecientes;
+    si se agotan los reintentos se propaga el último error. Las llamadas hechas
+    dentro de una transacción ya abierta no se reintentan, porque deshacerla
+    perdería el trabajo anterior: el error se propaga al método que la abrió.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.connection.in_transaction:
+            return method(self, *args, **kwargs)
+
+        busy_errors = 0
+        wait_seconds = 0.0
+        while True:
+            start = time.perf_counter()
+            try:
+                result = method(self, *args, **kwargs)
+            except sqlite3.OperationalError as e:
+                if not is_busy_error(e):
+                    raise
+                if self.connection.in_transaction:
+                    self.connection.rollback()
+                busy_errors += 1
+                wait_seconds += time.perf_counter() - start
+                if busy_errors > self.max_retries:
+                    self.lock_metrics.record(busy_errors, True, wait_seconds)
+                    raise
+                delay = retry_delay(busy_errors - 1, self.retry_delay_ms)
+                time.sleep(delay)
+                wait_seconds += delay
+                continue
+            self.lock_metrics.record(busy_errors, False, wait_seconds)
+            return result
+
+    return wrapper
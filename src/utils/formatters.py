@@ -5,6 +5,8 @@ from datetime import datetime
 from colorama import Fore, Style, init
 from tabulate import tabulate
 
+from src.utils.metrics import FORMAT_ROWS, FORMAT_SECONDS
+
 # Inicializar colorama
 init(autoreset=True)
 
@@ -27,7 +29,10 @@ def format_handicap(handicap):
 
 def format_table(data, headers, tablefmt="grid"):
     """Formatea datos como una tabla usando tabulate"""
-    return tabulate(data, headers=headers, tablefmt=tablefmt)
+    with FORMAT_SECONDS.time(function='format_table'):
+        table = tabulate(data, headers=headers, tablefmt=tablefmt)
+    FORMAT_ROWS.inc(len(data), function='format_table')
+    return table
 
 def format_title(title, width=60):
     """Formatea un título con un estilo atractivo"""
@@ -0,0 +1,158 @@
+"""
+Cálculos del World Handicap System (WHS).
+
+Funciones puras para obtener el resultado bruto ajustado de una ronda, su
+diferencial y el índice de hándicap a partir de los últimos diferenciales.
+"""
+
+# Número máximo de rondas que intervienen en el índice
+WHS_WINDOW = 20
+
+# Índice de hándicap máximo
+MAX_HANDICAP_INDEX = 54.0
+
+# Índice de hándicap mínimo (hándicap "plus")
+MIN_HANDICAP_INDEX = -5.0
+
+# Slope de referencia
+STANDARD_SLOPE = 113
+
+# Mínimo de hoyos jugados para que una ronda de 18 hoyos sea válida para hándicap
+MIN_HOLES_PLAYED = 14
+
+# Diferenciales disponibles -> (diferenciales que se promedian, ajuste)
+WHS_DIFFERENTIALS_TABLE = {
+    3: (1, -2.0),
+    4: (1, -1.0),
+    5: (1, 0.0),
+    6: (2, -1.0),
+    7: (2, 0.0),
+    8: (2, 0.0),
+    9: (3, 0.0),
+    10: (3, 0.0),
+    11: (3, 0.0),
+    12: (4, 0.0),
+    13: (4, 0.0),
+    14: (4, 0.0),
+    15: (5, 0.0),
+    16: (5, 0.0),
+    17: (6, 0.0),
+    18: (6, 0.0),
+    19: (7, 0.0),
+    20: (8, 0.0),
+}
+
+
+def hole_strokes_received(course_handicap, stroke_index):
+    """
+    Calcula los golpes de hándicap que recibe un jugador en un hoyo.
+
+    Los hándicaps positivos reparten ``ch // 18`` golpes en todos los hoyos y
+    uno más en los ``ch % 18`` hoyos más difíciles; los hándicaps "plus"
+    (negativos) devuelven golpes en los hoyos más fáciles.
+
+    Args:
+        course_handicap (int): Hándicap de campo redondeado
+        stroke_index (int): Hándicap (stroke index) del hoyo, de 1 a 18
+
+    Returns:
+        int: Golpes recibidos en el hoyo (negativo para hándicaps plus)
+    """
+    if course_handicap >= 0:
+        return course_handicap // 18 + (1 if stroke_index <= course_handicap % 18 else 0)
+    return -1 if stroke_index > 18 + course_handicap else 0
+
+
+def adjusted_gross_score(strokes, pars, stroke_index, course_handicap=None):
+    """
+    Calcula el resultado bruto ajustado de una ronda.
+
+    Cada hoyo se limita a doble bogey neto (par + 2 + golpes recibidos). Sin
+    hándicap establecido el límite es par + 5. Los hoyos no jugados cuentan
+    como par neto.
+
+    Args:
+        strokes (list): Golpes por hoyo (0 si no se jugó)
+        pars (list): Par de cada hoyo
+        stroke_index (list): Stroke index de cada hoyo
+        course_handicap (float, optional): Hándicap de campo del jugador
+
+    Returns:
+        int: Resultado bruto ajustado, o None si se jugaron menos de MIN_HOLES_PLAYED hoyos
+    """
+    holes = min(len(pars), len(stroke_index))
+    played = sum(1 for value in strokes[:holes] if value and value > 0)
+    if played < min(MIN_HOLES_PLAYED, holes) or not holes:
+        return None
+
+    handicap = round(course_handicap) if course_handicap is not None else None
+    total = 0
+    for i in range(holes):
+        par = pars[i]
+        received = hole_strokes_received(handicap, stroke_index[i]) if handicap is not None else 0
+        value = strokes[i] if i < len(strokes) else 0
+
+        if not value or value <= 0:
+            total += par + received
+        elif handicap is None:
+            total += min(value, par + 5)
+        else:
+            total += min(value, par + 2 + received)
+    return total
+
+
+def score_differential(adjusted_gross, course_rating, slope, pcc=0):
+    """
+    Calcula el diferencial de una ronda: (113 / slope) * (AGS - course rating - PCC).
+
+    Args:
+        adjusted_gross (int): Resultado bruto ajustado
+        course_rating (float): Course rating del campo
+        slope (int): Slope del campo
+        pcc (int): Ajuste por condiciones de juego (playing conditions calculation)
+
+    Returns:
+        float: Diferencial redondeado a un decimal, o None si faltan datos
+    """
+    if adjusted_gross is None or course_rating is None or not slope:
+        return None
+    return round(STANDARD_SLOPE / slope * (adjusted_gross - course_rating - pcc), 1)
+
+
+def round_differential(strokes, course, course_handicap=None):
+    """
+    Calcula el diferencial de una ronda jugada en un campo.
+
+    Args:
+        strokes (list): Golpes por hoyo
+        course (Course): Campo de la ronda
+        course_handicap (float, optional): Hándicap de campo del jugador en la ronda
+
+    Returns:
+        float: Diferencial, o None si la ronda no es válida para hándicap
+    """
+    adjusted = adjusted_gross_score(strokes, course.hole_pars, course.hole_handicaps, course_handicap)
+    return score_differential(adjusted, course.course_rating, course.slope)
+
+
+def handicap_index(differentials):
+    """
+    Calcula el índice de hándicap a partir de los diferenciales más recientes.
+
+    Args:
+        differentials (list): Diferenciales ordenados de la ronda más reciente a la
+            más antigua; solo se usan los WHS_WINDOW primeros
+
+    Returns:
+        float: Índice de hándicap redondeado a un decimal y limitado a
+            [MIN_HANDICAP_INDEX, MAX_HANDICAP_INDEX], o None si hay menos de 3 rondas
+    """
+    values = [d for d in differentials if d is not None][:WHS_WINDOW]
+    rule = WHS_DIFFERENTIALS_TABLE.get(len(values))
+    if rule is None:
+        return None
+
+    count, adjustment = rule
+    best = sorted(values)[:count]
+    index = round(sum(best) / count + adjustment, 1)
+    return max(min(index, MAX_HANDICAP_INDEX), MIN_HANDICAP_INDEX)
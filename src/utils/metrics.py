@@ -0,0 +1,413 @@
+"""
+Registro de métricas en memoria: contadores e histogramas.
+
+Las métricas se registran en el proceso (``REGISTRY``) y se exportan en el
+formato de texto de Prometheus o como JSON. La aplicación instrumenta:
+
+    golf_db_statements_total     Sentencias SQL ejecutadas, por tipo
+    golf_db_seconds              Duración de los métodos públicos de Database
+    golf_controller_seconds      Duración de los métodos públicos de los controladores
+    golf_rows_decoded_total      Filas convertidas en modelos, por modelo
+    golf_cache_lookups_total     Búsquedas en las cachés de entidades, por resultado
+    golf_format_seconds          Duración del formateo de tablas
+    golf_format_rows_total       Filas formateadas en tablas
+    golf_action_seconds          Duración de cada acción del menú
+    golf_action_statements       Sentencias SQL de cada acción del menú
+
+Si la variable de entorno GOLF_METRICS_FILE (o ``python src/main.py --metrics
+FICHERO``) indica un fichero, se reescribe en formato Prometheus después de cada
+acción del menú, por ejemplo para el textfile collector de node_exporter. Para
+obtenerlo como JSON:
+
+    python src/main.py --dump-metrics FICHERO
+"""
+import bisect
+import functools
+import math
+import os
+import re
+import time
+
+# Límites de los histogramas de duración, en segundos
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Límites de los histogramas de número de sentencias
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+def _format_value(value):
+    """Formatea un valor como lo espera Prometheus"""
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labels):
+    """Formatea las etiquetas de una muestra: {a="1",b="2"}"""
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+               for value in labels.values())
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + '}'
+
+
+class Counter:
+    """
+    Contador que solo crece, con etiquetas opcionales.
+    """
+
+    type = 'counter'
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        """
+        Incrementa el contador.
+
+        Args:
+            amount (float): Cantidad a sumar
+            **labels: Valor de cada etiqueta del contador
+        """
+        key = tuple(labels[name] for name in self.labelnames)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        """Valor del contador para unas etiquetas"""
+        return self._values.get(tuple(labels[name] for name in self.labelnames), 0)
+
+    def total(self):
+        """Suma del contador con todas las etiquetas"""
+        return sum(self._values.values())
+
+    def samples(self):
+        """
+        Muestras del contador.
+
+        Returns:
+            list: Tuplas (nombre, etiquetas, valor)
+        """
+        return [(self.name, dict(zip(self.labelnames, key)), value)
+                for key, value in sorted(self._values.items())]
+
+
+class Histogram:
+    """
+    Histograma acumulativo con límites fijos, con etiquetas opcionales.
+    """
+
+    type = 'histogram'
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}
+
+    def observe(self, value, **labels):
+        """
+        Registra una observación.
+
+        Args:
+            value (float): Valor observado
+            **labels: Valor de cada etiqueta del histograma
+        """
+        key = tuple(labels[name] for name in self.labelnames)
+        state = self._values.get(key)
+        if state is None:
+            state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        state[0][bisect.bisect_left(self.buckets, value)] += 1
+        state[1] += value
+        state[2] += 1
+
+    def time(self, **labels):
+        """Context manager que observa la duración del bloque, en segundos"""
+        return _Timer(self, labels)
+
+    def count(self, **labels):
+        """Número de observaciones para unas etiquetas"""
+        state = self._values.get(tuple(labels[name] for name in self.labelnames))
+        return state[2] if state else 0
+
+    def samples(self):
+        """
+        Muestras del histograma: una por límite (acumulativas), la suma y el número.
+
+        Returns:
+            list: Tuplas (nombre, etiquetas, valor)
+        """
+        result = []
+        for key, (counts, total, count) in sorted(self._values.items()):
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                result.append((f'{self.name}_bucket', dict(labels, le=_format_value(bound)), cumulative))
+            result.append((f'{self.name}_sum', labels, total))
+            result.append((f'{self.name}_count', labels, count))
+        return result
+
+
+class _Timer:
+    """Mide la duración de un bloque y la registra en un histograma"""
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+class MetricsRegistry:
+    """
+    Conjunto de métricas del proceso.
+
+    ``counter`` e ``histogram`` devuelven la métrica existente si ya está
+    registrada con ese nombre, de modo que cada módulo puede declarar las suyas
+    al importarse.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+
+    def _register(self, cls, name, help, labelnames, **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(name, help, labelnames, **kwargs)
+        elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+            raise ValueError(f"La métrica {name} ya está registrada con otro tipo o etiquetas")
+        return metric
+
+    def counter(self, name, help, labelnames=()):
+        """Obtiene o registra un contador"""
+        return self._register(Counter, name, help, labelnames)
+
+    def histogram(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        """Obtiene o registra un histograma"""
+        return self._register(Histogram, name, help, labelnames, buckets=buckets)
+
+    def get(self, name):
+        """Obtiene una métrica registrada, o None"""
+        return self._metrics.get(name)
+
+    def reset(self):
+        """Pone a cero todas las métricas, conservando su registro"""
+        for metric in self._metrics.values():
+            metric._values.clear()
+
+    def snapshot(self):
+        """
+        Obtiene el valor actual de todas las métricas.
+
+        Returns:
+            dict: {nombre: {'type', 'help', 'samples': [{'name', 'labels', 'value'}]}}
+        """
+        return {
+            name: {
+                'type': metric.type,
+                'help': metric.help,
+                'samples': [{'name': sample, 'labels': labels, 'value': value}
+                            for sample, labels, value in metric.samples()]
+            }
+            for name, metric in sorted(self._metrics.items())
+        }
+
+    def to_prometheus(self):
+        """
+        Exporta las métricas en el formato de texto de Prometheus.
+
+        Returns:
+            str: Texto de la exposición
+        """
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            lines.append(f'# HELP {name} {metric.help}')
+            lines.append(f'# TYPE {name} {metric.type}')
+            for sample, labels, value in metric.samples():
+                lines.append(f'{sample}{_format_labels(labels)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        """
+        Escribe las métricas en un fichero en formato Prometheus.
+
+        El fichero se sustituye de forma atómica para que un lector no vea
+        nunca una exposición a medias.
+
+        Args:
+            path (str): Ruta del fichero
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        temporary = f'{path}.{os.getpid()}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        os.replace(temporary, path)
+
+
+REGISTRY = MetricsRegistry()
+
+_settings = {'file': os.environ.get('GOLF_METRICS_FILE', '').strip() or None}
+
+
+def configure(file=None):
+    """
+    Indica el fichero Prometheus que se reescribe tras cada acción.
+
+    Args:
+        file (str, optional): Ruta del fichero; None conserva el valor de
+            GOLF_METRICS_FILE
+    """
+    if file is not None:
+        _settings['file'] = file or None
+
+
+def export():
+    """Escribe las métricas en el fichero configurado, si lo hay"""
+    if _settings['file']:
+        try:
+            REGISTRY.write_prometheus(_settings['file'])
+        except OSError as e:
+            print(f"No se pudieron escribir las métricas en {_settings['file']}: {e}")
+
+
+def instrument_methods(histogram):
+    """
+    Decorador de clase que mide los métodos públicos en un histograma.
+
+    Cada método público (los que no empiezan por "_", salvo los estáticos y
+    de clase) se mide con la etiqueta ``method`` igual a Clase.método.
+
+    Args:
+        histogram (Histogram): Histograma con la etiqueta ``method``
+    """
+    def decorator(cls):
+        for attribute, value in list(vars(cls).items()):
+            if attribute.startswith('_') or not callable(value) or isinstance(value, (staticmethod, classmethod)):
+                continue
+            setattr(cls, attribute, _timed(value, histogram, f'{cls.__name__}.{attribute}'))
+        return cls
+
+    return decorator
+
+
+def _timed(method, histogram, label):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            histogram.observe(time.perf_counter() - start, method=label)
+
+    return wrapper
+
+
+STATEMENTS = REGISTRY.counter('golf_db_statements_total', "Sentencias SQL ejecutadas", ('statement',))
+DB_SECONDS = REGISTRY.histogram('golf_db_seconds', "Duración de los métodos de Database, en segundos",
+                                ('method',))
+CONTROLLER_SECONDS = REGISTRY.histogram('golf_controller_seconds',
+                                        "Duración de los métodos de los controladores, en segundos", ('method',))
+ROWS_DECODED = REGISTRY.counter('golf_rows_decoded_total', "Filas de la base de datos convertidas en modelos",
+                                ('model',))
+CACHE_LOOKUPS = REGISTRY.counter('golf_cache_lookups_total', "Búsquedas en las cachés de entidades",
+                                 ('cache', 'result'))
+FORMAT_SECONDS = REGISTRY.histogram('golf_format_seconds', "Duración del formateo de tablas, en segundos",
+                                    ('function',))
+FORMAT_ROWS = REGISTRY.counter('golf_format_rows_total', "Filas formateadas en tablas", ('function',))
+ACTION_SECONDS = REGISTRY.histogram('golf_action_seconds', "Duración de las acciones del menú, en segundos",
+                                    ('action',))
+ACTION_STATEMENTS = REGISTRY.histogram('golf_action_statements', "Sentencias SQL por acción del menú",
+                                       ('action',), buckets=COUNT_BUCKETS)
+
+_STATEMENT_KINDS = {'select', 'insert', 'update', 'delete', 'with', 'create', 'drop', 'alter', 'pragma',
+                    'begin', 'commit', 'rollback'}
+
+
+def count_statement(sql):
+    """
+    Callback de traza de SQLite que cuenta las sentencias por tipo.
+
+    Args:
+        sql (str): Texto de la sentencia
+    """
+    keyword = sql.lstrip()[:8].split(None, 1)
+    kind = keyword[0].lower() if keyword else ''
+    STATEMENTS.inc(statement=kind if kind in _STATEMENT_KINDS else 'other')
+
+
+def track_action(name):
+    """
+    Decorador de las acciones del menú: mide su duración y sus sentencias SQL
+    y, al terminar, escribe las métricas en el fichero configurado.
+
+    Args:
+        name (callable): Función que calcula el nombre de la acción con los
+            argumentos de la llamada
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            action = name(*args, **kwargs)
+            statements = STATEMENTS.total()
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                ACTION_SECONDS.observe(time.perf_counter() - start, action=action)
+                ACTION_STATEMENTS.observe(STATEMENTS.total() - statements, action=action)
+                export()
+
+        return wrapper
+
+    return decorator
+
+
+_SAMPLE_LINE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})?\s+(\S+)$')
+_LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+
+def parse_prometheus(text):
+    """
+    Lee una exposición en formato Prometheus con la estructura de ``snapshot``.
+
+    Args:
+        text (str): Texto de la exposición
+
+    Returns:
+        dict: Métricas por nombre de familia
+    """
+    families = {}
+    for line in text.splitlines():
+        if line.startswith('# HELP ') or line.startswith('# TYPE '):
+            _, kind, name, value = line.split(' ', 3)
+            family = families.setdefault(name, {'type': 'untyped', 'help': '', 'samples': []})
+            family['help' if kind == 'HELP' else 'type'] = value
+            continue
+        match = _SAMPLE_LINE.match(line)
+        if not line or line.startswith('#') or not match:
+            continue
+        sample, labels, value = match.groups()
+        family_name = re.sub(r'_(bucket|sum|count)$', '', sample)
+        if family_name not in families:
+            family_name = sample
+        labels = {key: re.sub(r'\\(.)', lambda m: '\n' if m.group(1) == 'n' else m.group(1), raw)
+                  for key, raw in _LABEL.findall(labels or '')}
+        value = float(value)
+        families.setdefault(family_name, {'type': 'untyped', 'help': '', 'samples': []})['samples'].append(
+            {'name': sample, 'labels': labels, 'value': int(value) if value.is_integer() else value}
+        )
+    return families
+
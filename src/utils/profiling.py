@@ -0,0 +1,197 @@
+"""
+Perfilado opcional de las acciones de los menús.
+
+Cuando está activado, cada acción decorada con ``profile_action`` se ejecuta
+dentro de cProfile y al terminar se escriben en el directorio de perfiles dos
+ficheros por acción:
+
+    <fecha>-<n>-<acción>.prof   Perfil binario (pstats, snakeviz...)
+    <fecha>-<n>-<acción>.txt    Resumen: tiempo total, funciones más costosas
+                                y, si se pide, memoria pico y los puntos del
+                                código que más memoria tienen asignada al final
+
+Las acciones anidadas (una sub-acción de ScorecardView llamada desde el menú)
+se incluyen en el perfil de la acción exterior, cuyo nombre las recoge, porque
+cProfile no admite dos perfiles activos a la vez.
+
+Se activa con ``python src/main.py --profile DIR [--profile-memory]`` o con
+variables de entorno:
+
+    GOLF_PROFILE_DIR       Directorio donde escribir los perfiles
+    GOLF_PROFILE_MEMORY    1 para añadir una instantánea de tracemalloc
+    GOLF_PROFILE_TOP       Funciones y puntos de asignación del resumen (25)
+
+Desactivado, el decorador solo comprueba la configuración en cada llamada.
+"""
+import cProfile
+import functools
+import io
+import itertools
+import os
+import pstats
+import re
+import time
+import tracemalloc
+from datetime import datetime
+
+DEFAULT_TOP = 25
+
+_settings = {'directory': None, 'memory': False, 'top': DEFAULT_TOP}
+_sequence = itertools.count(1)
+_active = []
+
+
+def _env_flag(name):
+    """Indica si una variable de entorno tiene un valor verdadero"""
+    return os.environ.get(name, '').strip().lower() in ('1', 'true', 'yes', 'si', 'sí')
+
+
+def configure(directory=None, memory=None, top=None):
+    """
+    Activa o cambia el perfilado de acciones.
+
+    Los argumentos que se dejan en None conservan su valor actual, que al
+    importar el módulo se toma de las variables de entorno.
+
+    Args:
+        directory (str, optional): Directorio de los perfiles; '' lo desactiva
+        memory (bool, optional): Añadir una instantánea de tracemalloc
+        top (int, optional): Líneas de cada tabla del resumen
+    """
+    if directory is not None:
+        _settings['directory'] = directory or None
+    if memory is not None:
+        _settings['memory'] = memory
+    if top is not None:
+        _settings['top'] = max(1, top)
+
+
+def configure_from_env():
+    """Toma la configuración de las variables de entorno GOLF_PROFILE_*"""
+    top = os.environ.get('GOLF_PROFILE_TOP', '').strip()
+    configure(
+        directory=os.environ.get('GOLF_PROFILE_DIR', '').strip(),
+        memory=_env_flag('GOLF_PROFILE_MEMORY'),
+        top=int(top) if top.isdigit() else DEFAULT_TOP
+    )
+
+
+def is_enabled():
+    """Indica si el perfilado está activado"""
+    return _settings['directory'] is not None
+
+
+class ActionProfile:
+    """
+    Perfil de una acción en curso.
+
+    Guarda el perfil de cProfile, el tiempo y el estado de tracemalloc desde
+    que empieza la acción, y el nombre de las acciones anidadas.
+    """
+
+    def __init__(self, name):
+        self.names = [name]
+        self.memory = _settings['memory']
+        self.started_tracing = False
+        self.profiler = cProfile.Profile()
+
+    def start(self):
+        """Empieza a medir"""
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self.started_tracing = True
+            tracemalloc.reset_peak()
+        self.start_time = time.perf_counter()
+        self.profiler.enable()
+
+    def stop(self):
+        """
+        Deja de medir y escribe el perfil y el resumen.
+
+        Returns:
+            str: Ruta del resumen escrito
+        """
+        self.profiler.disable()
+        elapsed = time.perf_counter() - self.start_time
+        snapshot = peak = None
+        if self.memory:
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+            ))
+            peak = tracemalloc.get_traced_memory()[1]
+            if self.started_tracing:
+                tracemalloc.stop()
+
+        directory = _settings['directory']
+        os.makedirs(directory, exist_ok=True)
+        label = re.sub(r'[^\w.-]+', '_', '-'.join(self.names))
+        base = os.path.join(directory, f"{datetime.now():%Y%m%d-%H%M%S}-{next(_sequence):04d}-{label}")
+        self.profiler.dump_stats(base + '.prof')
+
+        top = _settings['top']
+        stats = pstats.Stats(self.profiler)
+        # Las pantallas esperan al usuario dentro de la acción; ese tiempo se separa
+        waiting = sum(entry[2] for (_, _, function), entry in stats.stats.items()
+                      if function == '<built-in method builtins.input>')
+        stream = io.StringIO()
+        stream.write(f"Acción: {' > '.join(self.names)}\n")
+        stream.write(f"Tiempo total: {elapsed * 1000:.1f} ms "
+                     f"(esperando al usuario: {waiting * 1000:.1f} ms)\n")
+        if peak is not None:
+            stream.write(f"Memoria pico: {peak / 1024:.1f} KiB\n")
+        stream.write("\n")
+        stats.stream = stream
+        stats.sort_stats('cumulative').print_stats(top)
+        if snapshot is not None:
+            stream.write(f"Memoria asignada al terminar por línea (top {top}):\n")
+            for stat in snapshot.statistics('lineno')[:top]:
+                stream.write(f"  {stat}\n")
+
+        with open(base + '.txt', 'w', encoding='utf-8') as f:
+            f.write(stream.getvalue())
+        return base + '.txt'
+
+
+def profile_action(name=None):
+    """
+    Decorador de las acciones de los menús que se pueden perfilar.
+
+    Args:
+        name (str or callable, optional): Nombre de la acción en los ficheros,
+            o función que lo calcula con los argumentos de la llamada. Por
+            defecto, el nombre cualificado del método.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            if not is_enabled():
+                return method(*args, **kwargs)
+
+            action = name(*args, **kwargs) if callable(name) else name or method.__qualname__
+            if _active:
+                # cProfile no admite perfiles anidados: la acción se mide en el exterior
+                if action not in _active[-1].names:
+                    _active[-1].names.append(action)
+                return method(*args, **kwargs)
+
+            profile = ActionProfile(action)
+            _active.append(profile)
+            profile.start()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                _active.pop()
+                try:
+                    profile.stop()
+                except OSError as e:
+                    # Un fallo al escribir el perfil no debe interrumpir la aplicación
+                    print(f"No se pudo escribir el perfil de {action}: {e}")
+
+        return wrapper
+
+    return decorator
+
+
+configure_from_env()
@@ -0,0 +1,106 @@
+"""
+Comprobación del número de sentencias SQL que ejecuta un bloque de código.
+
+Sirve para evitar que vuelvan a aparecer consultas N+1 (una consulta por
+tarjeta mostrada): el número de sentencias de una pantalla debe ser el mismo
+con diez tarjetas que con diez mil.
+
+    with assert_max_queries(db, 6, 'lista de tarjetas'):
+        view.show_scorecards()
+
+Las sentencias se capturan con ``set_trace_callback`` de la conexión de
+Database. Mientras hay un contador activo se siguen contando también en las
+métricas (src.utils.metrics), y al terminar se restaura el callback normal.
+Los contadores se pueden anidar.
+"""
+from collections import Counter as _Counter
+
+from src.utils.metrics import count_statement
+
+# Contadores activos por conexión, del más externo al más interno
+_active = {}
+
+
+class QueryBudgetExceeded(AssertionError):
+    """
+    Un bloque ha ejecutado más sentencias de las permitidas.
+
+    Atributos:
+        statements (list): Sentencias ejecutadas
+        max_queries (int): Máximo permitido
+    """
+
+    def __init__(self, label, statements, max_queries):
+        repeated = _Counter(' '.join(sql.split())[:120] for sql in statements).most_common(5)
+        details = '\n'.join(f"  {count} x {sql}" for sql, count in repeated)
+        super().__init__(
+            f"{label or 'El bloque'} ha ejecutado {len(statements)} sentencias SQL "
+            f"(máximo {max_queries}). Las más repetidas:\n{details}"
+        )
+        self.statements = statements
+        self.max_queries = max_queries
+
+
+def _dispatch(connection, sql):
+    count_statement(sql)
+    for counter in _active.get(connection, ()):
+        counter.statements.append(sql)
+
+
+class QueryCounter:
+    """
+    Context manager que registra las sentencias SQL ejecutadas en una conexión
+    y, opcionalmente, falla si superan un máximo.
+    """
+
+    def __init__(self, database, max_queries=None, label=None):
+        """
+        Args:
+            database (Database): Base de datos cuya conexión se vigila
+            max_queries (int, optional): Máximo de sentencias permitido
+            label (str, optional): Descripción del bloque para el mensaje de error
+        """
+        self.connection = database.connection
+        self.max_queries = max_queries
+        self.label = label
+        self.statements = []
+
+    @property
+    def count(self):
+        """Número de sentencias ejecutadas hasta ahora"""
+        return len(self.statements)
+
+    def __enter__(self):
+        counters = _active.setdefault(self.connection, [])
+        if not counters:
+            connection = self.connection
+            connection.set_trace_callback(lambda sql: _dispatch(connection, sql))
+        counters.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        counters = _active[self.connection]
+        counters.remove(self)
+        if not counters:
+            del _active[self.connection]
+            self.connection.set_trace_callback(count_statement)
+
+        if exc_type is None and self.max_queries is not None and self.count > self.max_queries:
+            raise QueryBudgetExceeded(self.label, self.statements, self.max_queries)
+        return False
+
+
+def assert_max_queries(database, max_queries, label=None):
+    """
+    Falla con QueryBudgetExceeded si el bloque ejecuta más de ``max_queries``
+    sentencias en la conexión de ``database``.
+
+    Args:
+        database (Database): Base de datos cuya conexión se vigila
+        max_queries (int): Máximo de sentencias permitido
+        label (str, optional): Descripción del bloque para el mensaje de error
+
+    Returns:
+        QueryCounter: Contador, con las sentencias en ``statements``
+    """
+    return QueryCounter(database, max_queries, label)
@@ -0,0 +1,155 @@
+"""
+Decodificación centralizada de los datos por hoyo almacenados en la base de datos.
+
+Los golpes, puntos, pares y hándicaps por hoyo se guardan como texto. Las filas
+nuevas usan JSON (``[4, 5, 3, ...]``) y las antiguas una lista separada por comas
+(``4,5,,3``). Este módulo es el único punto donde se interpretan ambos formatos.
+"""
+import json
+import re
+import warnings
+
+import numpy as np
+
+# Separadores del formato antiguo: comas (posiblemente repetidas), punto y coma o espacios
+_LEGACY_SEPARATORS = re.compile(r'[,;\s]+')
+
+# Enteros del formato antiguo: solo dígitos ASCII con signo negativo opcional
+# (int() aceptaría también '+4', '4_0' o dígitos de otros alfabetos)
+_LEGACY_INT = re.compile(r'-?[0-9]+', re.ASCII)
+
+# Texto de una lista JSON de enteros tal y como la escribe json.dumps
+_JSON_INTS = re.compile(r'[0-9, -]*', re.ASCII)
+
+
+class HoleDataError(ValueError):
+    """Error lanzado cuando un valor por hoyo no se puede decodificar."""
+
+
+def decode_hole_list(value, field='valores'):
+    """
+    Decodifica una lista de enteros por hoyo.
+
+    Acepta JSON, el formato antiguo separado por comas, listas ya decodificadas
+    y valores vacíos. Nunca descarta valores en silencio: si algún elemento no
+    es un entero válido se lanza ``HoleDataError``.
+
+    Args:
+        value (str, bytes, list, tuple or None): Valor almacenado
+        field (str): Nombre del campo (para los mensajes de error)
+
+    Returns:
+        list: Lista de enteros
+
+    Raises:
+        HoleDataError: Si el valor no se puede interpretar
+    """
+    if type(value) is not str:
+        if value is None:
+            return []
+        if isinstance(value, (list, tuple)):
+            return [_to_int(x, field, value) for x in value]
+        if isinstance(value, (bytes, bytearray)):
+            return decode_hole_list(bytes(value).decode('utf-8'), field)
+        if not isinstance(value, str):
+            raise HoleDataError(f"Tipo no soportado para {field}: {type(value).__name__}")
+
+    text = value.strip()
+    if not text:
+        return []
+
+    if text[0] == '[':
+        try:
+            data = json.loads(text)
+        except ValueError:
+            raise HoleDataError(f"JSON inválido en {field}: {value!r}") from None
+        if not isinstance(data, list):
+            raise HoleDataError(f"Se esperaba una lista en {field}: {value!r}")
+        # Lo habitual (json.dumps de enteros) no necesita convertir cada elemento
+        if all(type(x) is int for x in data):
+            return data
+        return [_to_int(x, field, value) for x in data]
+
+    # Formato antiguo separado por comas (tolerando comas repetidas o sobrantes)
+    return [_to_int(x, field, value) for x in _LEGACY_SEPARATORS.split(text) if x]
+
+
+def decode_hole_matrix(values, width=18, field='valores', dtype=np.int8):
+    """
+    Decodifica una columna completa de listas por hoyo en una matriz de NumPy.
+
+    Si todos los valores son JSON canónico con ``width`` elementos, se unen en
+    un solo texto y se interpretan de una vez en C; en otro caso se decodifica
+    fila a fila con ``decode_hole_list``. Las listas más cortas se rellenan con
+    ceros y las más largas se truncan.
+
+    Args:
+        values (list): Valores almacenados, uno por tarjeta
+        width (int): Número de columnas de la matriz
+        field (str): Nombre del campo (para los mensajes de error)
+        dtype: Tipo de NumPy de la matriz
+
+    Returns:
+        ndarray: Matriz (len(values), width)
+
+    Raises:
+        HoleDataError: Si algún valor no se puede interpretar
+    """
+    commas = width - 1
+    joined = None
+    if all(type(v) is str and v[:1] == '[' and v[-1:] == ']' and v.count(',') == commas
+           for v in values):
+        joined = ','.join([v[1:-1] for v in values])
+        # np.fromstring es más permisivo que JSON ('+4'): lo demás va por decode_hole_list
+        if not _JSON_INTS.fullmatch(joined):
+            joined = None
+    if joined is not None:
+        try:
+            with warnings.catch_warnings():
+                # Según la versión de NumPy, el texto no numérico avisa o lanza ValueError
+                warnings.simplefilter('ignore', DeprecationWarning)
+                flat = np.fromstring(joined, dtype=np.int64, sep=',')
+        except ValueError:
+            flat = None
+        info = np.iinfo(dtype)
+        if flat is not None and flat.size == len(values) * width and (
+                not flat.size or (flat.min() >= info.min and flat.max() <= info.max)):
+            return flat.astype(dtype).reshape(len(values), width)
+
+    matrix = np.zeros((len(values), width), dtype=dtype)
+    for i, value in enumerate(values):
+        decoded = decode_hole_list(value, field)[:width]
+        try:
+            matrix[i, :len(decoded)] = decoded
+        except OverflowError:
+            raise HoleDataError(f"Valor fuera de rango en {field}: {value!r}") from None
+    return matrix
+
+
+def _to_int(item, field, original):
+    """Convierte un elemento a entero sin aceptar valores con parte decimal."""
+    if isinstance(item, bool):
+        raise HoleDataError(f"Valor no numérico en {field}: {original!r}")
+    if isinstance(item, int):
+        return item
+    if isinstance(item, float) and item.is_integer():
+        return int(item)
+    if isinstance(item, str) and _LEGACY_INT.fullmatch(item.strip()):
+        return int(item)
+    raise HoleDataError(f"Valor no válido {item!r} en {field}: {original!r}")
+
+
+def row_keys(row):
+    """
+    Devuelve el conjunto de columnas de una fila.
+
+    ``sqlite3.Row`` no admite ``'col' in row`` (compara con los valores), por lo
+    que las comprobaciones de columnas deben hacerse sobre sus claves.
+
+    Args:
+        row (sqlite3.Row or dict): Fila de la base de datos
+
+    Returns:
+        set: Nombres de las columnas
+    """
+    return set(row.keys())
@@ -0,0 +1,146 @@
+"""
+Versiones vectorizadas de las funciones de puntuación de helpers_simple.
+
+Trabajan sobre arrays de NumPy con muchas tarjetas a la vez y devuelven los
+mismos resultados que calculate_playing_handicap, calculate_handicap_strokes y
+calculate_points aplicadas tarjeta a tarjeta y hoyo a hoyo.
+"""
+import numpy as np
+
+# Máximo de golpes de hándicap por hoyo que reparte calculate_handicap_strokes
+MAX_HOLE_STROKES = 4
+
+# Hándicap de campo a partir del cual todos los hoyos reciben MAX_HOLE_STROKES
+MAX_ALLOCATED_HANDICAP = 18 * MAX_HOLE_STROKES
+
+# Resultado neto respecto al par mínimo y máximo con puntos distintos
+MIN_NET_DIFF = -3
+MAX_NET_DIFF = 2
+
+# Puntos stableford por resultado neto, desde MIN_NET_DIFF (albatros o mejor)
+# hasta MAX_NET_DIFF (doble bogey o peor)
+POINTS_TABLE = np.array([5, 4, 3, 2, 1, 0], dtype=np.int8)
+
+
+def batch_playing_handicap(exact_handicaps, slopes, course_ratings, pars):
+    """
+    Calcula el hándicap de juego de varios jugadores o campos.
+
+    Equivale a calculate_playing_handicap elemento a elemento, incluido el
+    redondeo a un decimal de round(). Los valores NaN (hándicap o datos del
+    campo desconocidos) dan 0.0.
+
+    Args:
+        exact_handicaps (array): Hándicap exacto de cada jugador
+        slopes (array): Slope del campo (escalar o uno por jugador)
+        course_ratings (array): Course rating del campo (escalar o uno por jugador)
+        pars (array): Par del campo (escalar o uno por jugador)
+
+    Returns:
+        ndarray: Hándicaps de juego redondeados a un decimal, float64
+    """
+    exact_handicaps, slopes, course_ratings, pars = np.broadcast_arrays(
+        *(np.asarray(values, dtype=np.float64) for values in (exact_handicaps, slopes, course_ratings, pars))
+    )
+    playing = exact_handicaps * slopes / 113 + (course_ratings - pars)
+    result = np.array(np.round(playing, 1))
+
+    # np.round multiplica por 10 antes de redondear; en los valores que quedan
+    # a medio camino entre dos décimas se usa round() para obtener el mismo
+    # resultado que la versión escalar
+    tenths = playing * 10
+    ties = np.flatnonzero(np.abs(tenths - np.floor(tenths) - 0.5) < 1e-6)
+    flat_result, flat_playing = result.reshape(-1), playing.reshape(-1)
+    for i in ties:
+        flat_result[i] = round(float(flat_playing[i]), 1)
+
+    result[np.isnan(playing)] = 0.0
+    return result
+
+
+def batch_course_handicaps(playing_handicaps, coefficients=100):
+    """
+    Calcula el hándicap entero con el que se reparten los golpes de cada tarjeta.
+
+    Es ``round(hándicap de juego * coeficiente / 100)``, como en las vistas de
+    tarjetas; un hándicap de juego desconocido (NaN) cuenta como 0.
+
+    Args:
+        playing_handicaps (array): Hándicap de juego de cada tarjeta
+        coefficients (array): Coeficiente de hándicap en porcentaje (escalar o uno por tarjeta)
+
+    Returns:
+        ndarray: Hándicaps redondeados, int16
+    """
+    playing = np.nan_to_num(np.asarray(playing_handicaps, dtype=np.float64))
+    coefficients = np.nan_to_num(np.asarray(coefficients, dtype=np.float64))
+    # np.round redondea al par más cercano, igual que round()
+    return np.round(playing * (coefficients / 100)).astype(np.int16)
+
+
+def batch_handicap_strokes(course_handicaps, stroke_index):
+    """
+    Calcula los golpes de hándicap de cada hoyo de varias tarjetas.
+
+    Usa la fórmula cerrada ``ch // 18 + (si <= ch % 18)``, con un máximo de
+    MAX_HOLE_STROKES golpes por hoyo, ninguno con hándicaps negativos y ninguno
+    en los hoyos sin stroke index (0), como calculate_handicap_strokes.
+
+    Args:
+        course_handicaps (array): Hándicap redondeado de cada tarjeta (N,)
+        stroke_index (array): Stroke index de los hoyos, (18,) para un solo campo
+            o (N, 18) con el del campo de cada tarjeta
+
+    Returns:
+        ndarray: Golpes recibidos en cada hoyo, int8 (N, 18)
+    """
+    course_handicaps = np.maximum(np.asarray(course_handicaps, dtype=np.int16), 0)[:, None]
+    stroke_index = np.asarray(stroke_index, dtype=np.int16)
+    strokes = np.minimum(course_handicaps // 18 + (stroke_index <= course_handicaps % 18), MAX_HOLE_STROKES)
+    return np.where(stroke_index > 0, strokes, 0).astype(np.int8)
+
+
+def stroke_allocation_table(stroke_index):
+    """
+    Precalcula el reparto de golpes de un campo para cada hándicap de campo.
+
+    Como el reparto no cambia por debajo de 0 ni por encima de
+    MAX_ALLOCATED_HANDICAP, basta con una fila por hándicap entre ambos; los
+    golpes de una tarjeta son ``tabla[clip(ch, 0, MAX_ALLOCATED_HANDICAP)]``.
+
+    Args:
+        stroke_index (array): Stroke index de los hoyos, (18,) para un campo o
+            (C, 18) para varios
+
+    Returns:
+        ndarray: Golpes recibidos, int8 (MAX_ALLOCATED_HANDICAP + 1, 18) o
+            (C, MAX_ALLOCATED_HANDICAP + 1, 18)
+    """
+    stroke_index = np.asarray(stroke_index)
+    handicaps = np.arange(MAX_ALLOCATED_HANDICAP + 1)
+    if stroke_index.ndim == 1:
+        return batch_handicap_strokes(handicaps, stroke_index)
+    return np.stack([batch_handicap_strokes(handicaps, row) for row in stroke_index])
+
+
+def batch_points(strokes, pars, handicap_strokes):
+    """
+    Calcula los puntos stableford de cada hoyo de varias tarjetas.
+
+    Los puntos se leen de POINTS_TABLE según el resultado neto (golpes - par -
+    golpes recibidos), limitado a [MIN_NET_DIFF, MAX_NET_DIFF]. Los hoyos sin
+    golpes registrados dan 0 puntos, como en calculate_points.
+
+    Args:
+        strokes (array): Golpes por hoyo (N, 18)
+        pars (array): Par de los hoyos, (18,) o (N, 18)
+        handicap_strokes (array): Golpes recibidos por hoyo (N, 18)
+
+    Returns:
+        ndarray: Puntos de cada hoyo, int8 (N, 18)
+    """
+    strokes = np.asarray(strokes, dtype=np.int16)
+    net = strokes - np.asarray(pars, dtype=np.int16) - np.asarray(handicap_strokes, dtype=np.int16)
+    points = POINTS_TABLE[np.clip(net, MIN_NET_DIFF, MAX_NET_DIFF) - MIN_NET_DIFF]
+    points[strokes <= 0] = 0
+    return points
@@ -38,8 +38,9 @@ class CourseView:
             return
         
         # Mostrar tabla de campos
-        headers = ["ID", "Nombre", "Ubicación", "Par", "Slope", "Rating", "Hoyos"]
-        data = [[c.id, c.name, c.location, c.par_total, c.slope, c.course_rating, len(c.hole_pars)] for c in courses]
+        headers = ["ID", "Nombre", "Ubicación", "Par", "Slope", "Rating", "Hoyos", "Salidas"]
+        data = [[c.id, c.name, c.location, c.par_total, c.slope, c.course_rating, len(c.hole_pars), len(c.tees)]
+                for c in courses]
         
         # Mostrar la tabla
         print(format_table(data, headers))
@@ -48,9 +49,10 @@ class CourseView:
         print(f"{Fore.YELLOW}Opciones:{Style.RESET_ALL}")
         print(format_menu_option("1", "Editar campo"))
         print(format_menu_option("2", "Eliminar campo"))
+        print(format_menu_option("3", "Salidas del campo"))
         print(format_menu_option("0", "Volver"))
         
-        option = get_number_input("Seleccione una opción", default=0, min_value=0, max_value=2, allow_float=False)
+        option = get_number_input("Seleccione una opción", default=0, min_value=0, max_value=3, allow_float=False)
         
         if option == 0:
             return
@@ -66,6 +68,11 @@ class CourseView:
             if course_id is None:
                 return
             self.delete_course(course_id)
+        elif option == 3:
+            course_id = get_number_input("ID del campo", allow_float=False)
+            if course_id is None:
+                return
+            self.manage_tees(course_id)
     
     def add_course(self):
         """Añade un nuevo campo"""
@@ -269,6 +276,80 @@ class CourseView:
         
         pause()
     
+    def manage_tees(self, course_id):
+        """
+        Muestra las salidas de un campo y permite añadirlas o eliminarlas.
+        
+        Args:
+            course_id (int): ID del campo
+        """
+        clear_screen()
+        course = self.controller.get_course(course_id)
+        if not course:
+            print(format_error(f"No se encontró ningún campo con ID {course_id}."))
+            pause()
+            return
+        
+        print(format_title(f"SALIDAS DE {course.name.upper()}"))
+        if course.tees:
+            headers = ["ID", "Salida", "Slope", "Rating", "Par", "Distancia"]
+            data = [[t.id, t.name, t.slope, t.course_rating, t.par_total, t.total_yardage or "-"]
+                    for t in course.tees]
+            print(format_table(data, headers))
+        else:
+            print(format_info("El campo no tiene salidas; las tarjetas usan su slope y su course rating."))
+        
+        print(f"{Fore.YELLOW}Opciones:{Style.RESET_ALL}")
+        print(format_menu_option("1", "Añadir salida"))
+        print(format_menu_option("2", "Eliminar salida"))
+        print(format_menu_option("0", "Volver"))
+        
+        option = get_number_input("Seleccione una opción", default=0, min_value=0, max_value=2, allow_float=False)
+        
+        if option == 1:
+            self._add_tee(course)
+        elif option == 2:
+            tee_id = get_number_input("ID de la salida a eliminar", allow_float=False)
+            if tee_id is None:
+                return
+            success, message = self.controller.delete_tee(tee_id)
+            print(format_success(message) if success else format_error(message))
+            pause()
+    
+    def _add_tee(self, course):
+        """
+        Añade una salida a un campo.
+        
+        Args:
+            course (Course): Campo de la salida
+        """
+        print(format_subtitle("Nueva salida"))
+        name = get_input("Nombre (por ejemplo, Amarillas)")
+        if name is None:
+            return
+        
+        slope = get_number_input("Slope", default=course.slope, min_value=55, max_value=155)
+        if slope is None:
+            return
+        
+        course_rating = get_number_input("Course Rating", default=course.course_rating, min_value=60.0, max_value=80.0)
+        if course_rating is None:
+            return
+        
+        # Las salidas usan los pares por hoyo del campo
+        par_total = course.par_total
+        
+        print(format_info("Las distancias son opcionales: deje el valor vacío para no indicarlas."))
+        yardages = get_list_input("Distancia de los 18 hoyos", validator=int)
+        
+        success, result = self.controller.add_tee(course.id, name, slope, course_rating, par_total, yardages)
+        if success:
+            print(format_success(f"Salida añadida correctamente con ID {result}."))
+        else:
+            print(format_error(f"Error al añadir salida: {result}"))
+        
+        pause()
+    
     def delete_course(self, course_id=None):
         """
         Elimina un campo existente.
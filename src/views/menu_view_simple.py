@@ -8,8 +8,11 @@ from tabulate import tabulate
 from src.views.player_view import PlayerView
 from src.views.course_view import CourseView
 from src.views.scorecard_view import ScorecardView
+from src.utils.cache import operation
 from src.utils.formatters import format_title, format_menu_option, format_info
 from src.utils.helpers_simple import clear_screen, get_input, get_number_input
+from src.utils.metrics import track_action
+from src.utils.profiling import profile_action
 
 # Inicializar colorama
 init(autoreset=True)
@@ -19,11 +22,18 @@ class MenuViewSimple:
     Vista para el menú principal de la aplicación (versión simplificada).
     """
     
-    def __init__(self):
-        """Inicializa la vista del menú"""
-        self.player_view = PlayerView()
-        self.course_view = CourseView()
-        self.scorecard_view = ScorecardView()
+    def __init__(self, player_view=None, course_view=None, scorecard_view=None):
+        """
+        Inicializa la vista del menú.
+        
+        Args:
+            player_view (PlayerView, optional): Vista de jugadores
+            course_view (CourseView, optional): Vista de campos
+            scorecard_view (ScorecardView, optional): Vista de tarjetas
+        """
+        self.player_view = player_view or PlayerView()
+        self.course_view = course_view or CourseView()
+        self.scorecard_view = scorecard_view or ScorecardView()
         self.running = True
     
     def display_header(self):
@@ -67,7 +77,8 @@ class MenuViewSimple:
             ["-" * 33, "-" * 33],
             [format_menu_option('5', 'Tarjetas'), format_menu_option('q', 'Salir')],
             [format_menu_option('6', 'Añadir tarjeta'), ""],
-            [format_menu_option('7', 'Filtrar tarjetas'), ""]
+            [format_menu_option('7', 'Filtrar tarjetas'), ""],
+            [format_menu_option('8', 'Estadísticas'), ""]
         ]
         
         # Mostrar tablas sin bordes y con alineación perfecta
@@ -76,10 +87,16 @@ class MenuViewSimple:
         print(tabulate(tarjetas_sistema, tablefmt="plain", colalign=("left", "left")))
         print(f"{'-' * width}\n")
     
+    @track_action(lambda self, option: f'menu-{option}')
+    @profile_action(lambda self, option: f'menu-{option}')
+    @operation()
     def handle_option(self, option):
         """
         Maneja la opción seleccionada por el usuario.
         
+        Cada opción es una operación: las cachés de entidades comprueban una sola
+        vez si otro proceso ha modificado la base de datos.
+        
         Args:
             option (int or str): Opción seleccionada
         """
@@ -102,6 +119,8 @@ class MenuViewSimple:
             self.scorecard_view.add_scorecard()
         elif option == 7:
             self.scorecard_view.filter_scorecards()
+        elif option == 8:
+            self.scorecard_view.show_statistics()
         
         # Opciones de sistema
         elif option == 'q' :
@@ -138,7 +157,7 @@ class MenuViewSimple:
                     # Convertir a número si es posible
                     if option.isdigit():
                         option = int(option)
-                        if 1 <= option <= 7:
+                        if 1 <= option <= 8:
                             self.handle_option(option)
                         elif option == 0:
                             self.handle_option('q')
@@ -2,6 +2,7 @@
 Vista para gestionar la interacción con jugadores.
 """
 from src.controllers.player_controller import PlayerController
+from src.controllers.handicap_controller import HandicapController
 from colorama import Fore, Style
 from src.utils.formatters import (
     format_title, format_subtitle, format_table, 
@@ -48,9 +49,10 @@ class PlayerView:
         print(f"\n{Fore.YELLOW}Opciones:{Style.RESET_ALL}")
         print(format_menu_option("1", "Editar jugador"))
         print(format_menu_option("2", "Eliminar jugador"))
+        print(format_menu_option("3", "Recalcular hándicaps (WHS)"))
         print(format_menu_option("0", "Volver"))
         
-        option = get_number_input("Seleccione una opción", default=0, min_value=0, max_value=2, allow_float=False)
+        option = get_number_input("Seleccione una opción", default=0, min_value=0, max_value=3, allow_float=False)
         
         if option == 0:
             return
@@ -66,6 +68,18 @@ class PlayerView:
             if player_id is None:
                 return
             self.delete_player(player_id)
+        elif option == 3:
+            self.recalculate_handicaps()
+    
+    def recalculate_handicaps(self):
+        """Recalcula el índice de hándicap WHS de todos los jugadores"""
+        print(format_info("Recalculando hándicaps..."))
+        try:
+            handicaps = HandicapController(self.controller.db).recalculate_all()
+            print(format_success(f"Hándicap actualizado para {len(handicaps)} jugadores."))
+        except Exception as e:
+            print(format_error(f"Error al recalcular hándicaps: {str(e)}"))
+        pause()
     
     def edit_player(self, player_id=None):
         """
@@ -59,16 +59,17 @@ class ScorecardDisplayView:
         headers = ["ID", "Fecha", "Jugador", "Campo", "Ubicación", "Golpes", "Resultado", "Puntos"]
         data = []
         
-        for sc in recent_scorecards:
-            scorecard_data = ScorecardUtils.prepare_scorecard_data(
-                sc, self.player_controller, self.course_controller
-            )
+        scorecards_data = ScorecardUtils.prepare_scorecards_data(
+            recent_scorecards, self.player_controller, self.course_controller
+        )
+        
+        for scorecard_data in scorecards_data:
             data.append([
                 scorecard_data['id'],
                 scorecard_data['date'],
                 scorecard_data['player_name'],
                 scorecard_data['course_name'],
-                scorecard_data['course_location'],
+                scorecard_data.get('course_location', ''),
                 scorecard_data['total_strokes'],
                 scorecard_data['result_str'],
                 scorecard_data['total_points']
@@ -194,6 +195,9 @@ class ScorecardDisplayView:
         # Información básica
         print(f"{Fore.CYAN}Jugador:{Style.RESET_ALL} {player.first_name} {player.surname}")
         print(f"{Fore.CYAN}Campo:{Style.RESET_ALL} {scorecard.course_name} - {scorecard.course_location}")
+        if scorecard.tee_name:
+            print(f"{Fore.CYAN}Salida:{Style.RESET_ALL} {scorecard.tee_name} "
+                  f"(Slope {scorecard.course_slope} - CR {scorecard.course_rating})")
         print(f"{Fore.CYAN}Fecha:{Style.RESET_ALL} {scorecard.date}")
         print(f"{Fore.CYAN}Hándicap de juego:{Style.RESET_ALL} {scorecard.playing_handicap}")
         print(f"{Fore.CYAN}Coeficiente aplicado:{Style.RESET_ALL} {scorecard.handicap_coefficient}%")
@@ -202,13 +206,17 @@ class ScorecardDisplayView:
         playing_handicap = scorecard.playing_handicap or 0  # Si es None, usar 0
         playing_coefficient = playing_handicap * (scorecard.handicap_coefficient / 100)
         
-        # Usar los datos del curso almacenados en la tarjeta
-        handicap_strokes = calculate_handicap_strokes(
-            playing_coefficient, 
-            scorecard.course_slope, 
-            scorecard.course_rating, 
-            scorecard.course_hole_handicaps
-        )
+        # El reparto de golpes se lee de la tabla del campo, que se guarda en caché
+        course = self.course_controller.get_course(scorecard.course_id)
+        if course:
+            handicap_strokes = course.handicap_strokes(playing_coefficient)
+        else:
+            handicap_strokes = calculate_handicap_strokes(
+                playing_coefficient, 
+                scorecard.course_slope, 
+                scorecard.course_rating, 
+                scorecard.course_hole_handicaps
+            )
         
         # Mostrar tabla de resultados
         print("\n" + format_subtitle("Resultados por hoyo"))
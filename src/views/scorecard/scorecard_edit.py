@@ -6,13 +6,13 @@ from datetime import datetime
 from src.controllers.scorecard_controller import ScorecardController
 from src.controllers.player_controller import PlayerController
 from src.controllers.course_controller import CourseController
+from src.database import ScorecardConflictError
 from src.models.scorecard import Scorecard
 from src.utils.formatters import (
     format_title, format_subtitle, format_info, format_error, format_success, format_menu_option
 )
 from src.utils.helpers_simple import (
-    clear_screen, pause, get_number_input, get_date_input, calculate_points, calculate_handicap_strokes, 
-    calculate_playing_handicap
+    clear_screen, pause, get_number_input, get_date_input, calculate_points
 )
 from colorama import Fore, Style
 
@@ -77,6 +77,22 @@ class ScorecardEditView:
         course = courses[course_option - 1]
         print(f"Campo seleccionado: {course.name}")
         
+        # Seleccionar salida: el hándicap de juego y el diferencial usan su slope y su rating
+        tee_id = None
+        if course.tees:
+            print(format_subtitle("Seleccione la salida"))
+            print(format_menu_option("0", f"Sin salida (Slope {course.slope} - CR {course.course_rating})"))
+            for i, tee in enumerate(course.tees, 1):
+                print(format_menu_option(str(i), str(tee)))
+            
+            tee_option = get_number_input("Seleccione una salida", default=0, min_value=0, max_value=len(course.tees))
+            if tee_option is None:
+                return
+            if tee_option:
+                tee_id = course.tees[tee_option - 1].id
+                course = course.for_tee(tee_id)
+                print(f"Salida seleccionada: {course.tee.name}")
+        
         # Ingresar fecha
         print(format_subtitle("Fecha de la ronda"))
         date = get_date_input("Fecha (YYYY-MM-DD)", default=datetime.now().strftime("%Y-%m-%d"))
@@ -87,9 +103,7 @@ class ScorecardEditView:
         print(format_subtitle("Hándicap de juego"))
         
         # Calcular hándicap de juego según la fórmula: (Hcp exacto * Slope / 113) + (CR - Par)
-        calculated_handicap = calculate_playing_handicap(
-            player.handicap, course.slope, course.course_rating, course.par
-        )
+        calculated_handicap = course.playing_handicap(player.handicap)
         
         print(f"Hándicap exacto: {player.handicap}")
         print(f"Slope: {course.slope}")
@@ -129,18 +143,14 @@ class ScorecardEditView:
                 print(format_error("No se pudo obtener la información del campo."))
                 pause()
                 return
+            course = course.for_tee(tee_id)
         
         pars = course.hole_pars
         handicaps = course.hole_handicaps
         
         # Calcular golpes de hándicap por hoyo
         playing_coefficient = playing_handicap * (handicap_coefficient / 100)
-        handicap_strokes = calculate_handicap_strokes(
-            playing_coefficient, 
-            course.slope, 
-            course.course_rating, 
-            handicaps
-        )
+        handicap_strokes = course.handicap_strokes(playing_coefficient)
         
         # Ingresar resultados
         print(format_subtitle("Ingrese los resultados"))
@@ -196,7 +206,8 @@ class ScorecardEditView:
             strokes,
             points,
             handicap_coefficient,
-            playing_handicap
+            playing_handicap,
+            tee_id
         )
         
         if result:
@@ -251,7 +262,7 @@ class ScorecardEditView:
         print("[3] Resultados por hoyo")
         print("[0] Cancelar")
         
-        option = get_number_input("> Seleccione una opción (0-3): ", 0, 3)
+        option = get_number_input("Seleccione una opción", default=0, min_value=0, max_value=3, allow_float=False)
         
         if option == 0:
             return
@@ -263,7 +274,7 @@ class ScorecardEditView:
             
         elif option == 2:
             # Modificar hándicap de juego
-            new_handicap = get_number_input("Ingrese el nuevo hándicap de juego: ", 0, 54, allow_float=True, allow_none=True)
+            new_handicap = get_number_input("Nuevo hándicap de juego", min_value=0, max_value=54, allow_float=True, allow_empty=True)
             scorecard.playing_handicap = new_handicap
             
         elif option == 3:
@@ -284,12 +295,7 @@ class ScorecardEditView:
             # Calcular golpes de hándicap por hoyo
             playing_handicap = scorecard.playing_handicap or 0  # Si es None, usar 0
             playing_coefficient = playing_handicap * (scorecard.handicap_coefficient / 100)
-            handicap_strokes = calculate_handicap_strokes(
-                playing_coefficient, 
-                course.slope, 
-                course.course_rating, 
-                handicaps
-            )
+            handicap_strokes = course.handicap_strokes(playing_coefficient)
             
             # Ingresar nuevos resultados
             new_strokes = []
@@ -343,17 +349,22 @@ class ScorecardEditView:
             pause()
             return
         
-        # Guardar cambios
-        success = self.scorecard_controller.update_scorecard(
-            scorecard.id,
-            scorecard.player_id,
-            scorecard.course_id,
-            scorecard.date,
-            scorecard.strokes,
-            scorecard.points,
-            scorecard.handicap_coefficient,
-            scorecard.playing_handicap
-        )
+        # Guardar cambios solo si nadie ha modificado la tarjeta mientras se editaba
+        try:
+            success = self.scorecard_controller.update_scorecard(
+                scorecard.id,
+                scorecard.player_id,
+                scorecard.course_id,
+                scorecard.date,
+                scorecard.strokes,
+                scorecard.points,
+                scorecard.handicap_coefficient,
+                scorecard.playing_handicap,
+                expected_version=scorecard.version
+            )
+        except ScorecardConflictError:
+            self._handle_edit_conflict(scorecard_id)
+            return
         
         if success:
             print(format_success("Tarjeta actualizada correctamente."))
@@ -361,3 +372,35 @@ class ScorecardEditView:
             print(format_error("Error al actualizar la tarjeta."))
         
         pause()
+    
+    def _handle_edit_conflict(self, scorecard_id):
+        """
+        Informa de que otro usuario ha modificado la tarjeta durante la edición.
+        
+        Muestra los datos actuales de la tarjeta y permite volver a editarla
+        sobre ellos; los cambios no guardados se descartan.
+        
+        Args:
+            scorecard_id (int): ID de la tarjeta
+        """
+        print(format_error("Otro usuario ha modificado la tarjeta mientras la editaba. No se han guardado los cambios."))
+        
+        current = self.scorecard_controller.get_scorecard(scorecard_id)
+        if not current:
+            print(format_info("La tarjeta ya no existe."))
+            pause()
+            return
+        
+        print(format_subtitle("Datos actuales"))
+        print(f"Fecha: {current.date}")
+        print(f"Hándicap de juego: {current.playing_handicap}")
+        print(f"Coeficiente aplicado: {current.handicap_coefficient}%")
+        print(f"Total golpes: {current.total_strokes()}")
+        print(f"Total puntos: {current.total_points()}")
+        
+        print()
+        retry = input("¿Volver a editar la tarjeta con los datos actuales? (s/n): ").lower()
+        if retry == 's':
+            self.modify_scorecard(scorecard_id)
+        else:
+            pause()
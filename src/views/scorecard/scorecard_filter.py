@@ -22,6 +22,9 @@ class ScorecardFilterView:
     Vista para filtrar tarjetas de puntuación.
     """
     
+    # Número máximo de tarjetas que se muestran de cada búsqueda
+    PAGE_SIZE = 50
+    
     def __init__(self, controller=None, player_controller=None, course_controller=None):
         """
         Inicializa la vista con controladores.
@@ -37,12 +40,16 @@ class ScorecardFilterView:
         self.current_filter_description = "Sin filtros"
         self.filtered_scorecards = None
         
-    def filter_scorecards(self, scorecards=None, previous_filter_description=None):
+    def filter_scorecards(self, filters=None, previous_filter_description=None):
         """
         Filtra tarjetas según criterios.
         
+        Los filtros se acumulan en un diccionario y se evalúan en la base de datos
+        sobre todo el historial mediante search_scorecards, que solo devuelve las
+        PAGE_SIZE tarjetas más recientes.
+        
         Args:
-            scorecards (list, optional): Lista de tarjetas previamente filtradas
+            filters (dict, optional): Filtros aplicados previamente
             previous_filter_description (str, optional): Descripción del filtro previo
         """
         clear_screen()
@@ -55,12 +62,10 @@ class ScorecardFilterView:
         else:
             print(format_title("FILTRAR TARJETAS"))
             
-        # Si no se proporcionan tarjetas, obtener todas
-        if scorecards is None:
-            scorecards = self.controller.get_scorecards()
+        # Sin filtros previos se parte de todas las tarjetas
+        if filters is None:
+            filters = {}
             self.current_filter_description = "Sin filtros"
-        else:
-            self.filtered_scorecards = scorecards
         
         print(format_menu_option("1", "Filtrar por jugador"))
         print(format_menu_option("2", "Filtrar por campo"))
@@ -77,17 +82,8 @@ class ScorecardFilterView:
             display_view.show_scorecards()
             return
         
-        # Obtener todas las tarjetas
-        if scorecards is None:
-            scorecards = self.controller.get_scorecards()
-        
-        if not scorecards:
-            print(format_info("No hay tarjetas registradas."))
-            pause()
-            return
-        
         # Aplicar filtro según la opción seleccionada
-        filtered_scorecards = []
+        new_filters = dict(filters)
         
         if option == 1:
             # Filtrar por jugador
@@ -108,7 +104,7 @@ class ScorecardFilterView:
                 pause()
                 return
             
-            filtered_scorecards = [sc for sc in scorecards if sc.player_id == player_id]
+            new_filters['player_id'] = player_id
             filter_description = f"Jugador: {player.first_name} {player.surname}"
             
         elif option == 2:
@@ -130,7 +126,7 @@ class ScorecardFilterView:
                 pause()
                 return
             
-            filtered_scorecards = [sc for sc in scorecards if sc.course_id == course_id]
+            new_filters['course_id'] = course_id
             filter_description = f"Campo: {course.name}"
             
         elif option == 3:
@@ -144,11 +140,11 @@ class ScorecardFilterView:
             
             # Si ambas fechas son None, mostrar todas las tarjetas
             if start_date is None and end_date is None:
-                filtered_scorecards = scorecards
                 filter_description = "Todas las fechas"
             else:
                 # Las fechas ya vienen en formato YYYY-MM-DD, no necesitan conversión
-                filtered_scorecards = [sc for sc in scorecards if start_date <= sc.date <= end_date]
+                new_filters['start_date'] = start_date
+                new_filters['end_date'] = end_date
                 
                 # Convertir a formato DD/MM/YYYY para mostrar
                 if start_date and end_date:
@@ -178,50 +174,38 @@ class ScorecardFilterView:
             if result_option == 0:
                 return
             
-            # Preparar datos para filtrar
-            scorecard_data_list = []
-            for sc in scorecards:
-                course = self.course_controller.get_course(sc.course_id)
-                if not course:
-                    continue
-                
-                scorecard_data = ScorecardUtils.prepare_scorecard_data(
-                    sc, self.player_controller, self.course_controller, None, course
-                )
-                
-                # Añadir información para filtrado
-                scorecard_data['par_diff'] = scorecard_data['total_strokes'] - course.par_total
-                scorecard_data['scorecard'] = sc
-                
-                scorecard_data_list.append(scorecard_data)
+            # El filtro se evalúa en SQL sobre los totales de cada ronda
+            new_filters.pop('to_par_min', None)
+            new_filters.pop('to_par_max', None)
             
-            # Aplicar filtro según resultado
             if result_option == 1:
                 # Bajo par
-                filtered_data = [data for data in scorecard_data_list if data['par_diff'] < 0]
+                new_filters['to_par_max'] = -1
                 filter_description = "Resultado: Bajo par"
             elif result_option == 2:
                 # Par
-                filtered_data = [data for data in scorecard_data_list if data['par_diff'] == 0]
+                new_filters['to_par_min'] = 0
+                new_filters['to_par_max'] = 0
                 filter_description = "Resultado: Par"
             elif result_option == 3:
                 # Sobre par
-                filtered_data = [data for data in scorecard_data_list if data['par_diff'] > 0]
+                new_filters['to_par_min'] = 1
                 filter_description = "Resultado: Sobre par"
-            
-            # Extraer tarjetas filtradas
-            filtered_scorecards = [data['scorecard'] for data in filtered_data]
+        
+        # Se pide una tarjeta más para saber si hay resultados sin mostrar
+        filtered_scorecards = self.controller.search_scorecards(new_filters, limit=self.PAGE_SIZE + 1)
         
         # Mostrar resultados
-        self._show_filtered_scorecards(filtered_scorecards, filter_description)
+        self._show_filtered_scorecards(filtered_scorecards, filter_description, new_filters)
     
-    def _show_filtered_scorecards(self, scorecards, filter_description):
+    def _show_filtered_scorecards(self, scorecards, filter_description, filters=None):
         """
         Muestra las tarjetas filtradas.
         
         Args:
             scorecards (list): Lista de tarjetas filtradas
             filter_description (str): Descripción del filtro aplicado
+            filters (dict, optional): Filtros que han producido la lista
         """
         clear_screen()
         print(format_title("TARJETAS FILTRADAS"))
@@ -243,6 +227,11 @@ class ScorecardFilterView:
             self.filter_scorecards()
             return
         
+        if len(scorecards) > self.PAGE_SIZE:
+            scorecards = scorecards[:self.PAGE_SIZE]
+            print(format_info(f"Se muestran las {self.PAGE_SIZE} tarjetas más recientes. "
+                              "Añada filtros para acotar la búsqueda."))
+        
         # Guardar las tarjetas filtradas para uso posterior
         self.filtered_scorecards = scorecards
         
@@ -250,10 +239,11 @@ class ScorecardFilterView:
         headers = ["ID", "Fecha", "Jugador", "Campo", "Golpes", "Resultado", "Puntos"]
         data = []
         
-        for sc in scorecards:
-            scorecard_data = ScorecardUtils.prepare_scorecard_data(
-                sc, self.player_controller, self.course_controller
-            )
+        scorecards_data = ScorecardUtils.prepare_scorecards_data(
+            scorecards, self.player_controller, self.course_controller
+        )
+        
+        for scorecard_data in scorecards_data:
             data.append([
                 scorecard_data['id'],
                 scorecard_data['date'],
@@ -283,18 +273,18 @@ class ScorecardFilterView:
             # Ver detalles de tarjeta
             scorecard_id = get_number_input("ID de la tarjeta a ver", allow_float=False)
             if scorecard_id is None:
-                self._show_filtered_scorecards(scorecards, self.current_filter_description)
+                self._show_filtered_scorecards(scorecards, self.current_filter_description, filters)
                 return
                 
             from src.views.scorecard.scorecard_display import ScorecardDisplayView
             display_view = ScorecardDisplayView(self.controller, self.player_controller, self.course_controller)
             display_view.view_scorecard_details(scorecard_id)
             # Volver a mostrar los resultados filtrados
-            self._show_filtered_scorecards(scorecards, self.current_filter_description)
+            self._show_filtered_scorecards(scorecards, self.current_filter_description, filters)
             return
         elif option == 2:
             # Filtrar estos resultados
-            self.filter_scorecards(scorecards, self.current_filter_description)
+            self.filter_scorecards(filters, self.current_filter_description)
             return
         elif option == 3:
             # Nuevo filtro desde cero
@@ -10,7 +10,7 @@ from src.utils.formatters import (
     format_menu_option
 )
 from src.utils.helpers_simple import (
-    clear_screen, pause, get_number_input
+    clear_screen, pause, get_number_input, get_date_range_input
 )
 from src.views.scorecard.scorecard_utils import ScorecardUtils
 from src.views.player_view import PlayerView
@@ -84,78 +84,41 @@ class ScorecardStatsView:
             self.show_statistics()
             return
         
-        # Obtener tarjetas del jugador
-        scorecards = self.controller.get_scorecards()
-        player_scorecards = [sc for sc in scorecards if sc.player_id == player_id]
+        # Las estadísticas se calculan en la base de datos sobre todo el historial
+        date_range = get_date_range_input("Periodo de las estadísticas")
+        stats = self.controller.get_player_stats(player_id, date_range)
         
-        if not player_scorecards:
+        if not stats['total_rounds']:
             print(format_info(f"No hay tarjetas registradas para {player.first_name} {player.surname}."))
             pause()
             self.show_statistics()
             return
         
-        # Preparar datos para estadísticas
-        scorecard_data_list = []
-        for sc in player_scorecards:
-            course = self.course_controller.get_course(sc.course_id)
-            if not course:
-                continue
-            
-            scorecard_data = ScorecardUtils.prepare_scorecard_data(
-                sc, self.player_controller, self.course_controller, player, course
-            )
-            
-            # Añadir información para estadísticas
-            scorecard_data['par_diff'] = scorecard_data['total_strokes'] - course.par_total
-            scorecard_data['scorecard'] = sc
-            
-            scorecard_data_list.append(scorecard_data)
-        
-        # Calcular estadísticas
-        total_rounds = len(scorecard_data_list)
-        avg_strokes = sum(data['total_strokes'] for data in scorecard_data_list) / total_rounds if total_rounds > 0 else 0
-        avg_points = sum(data['total_points'] for data in scorecard_data_list) / total_rounds if total_rounds > 0 else 0
-        avg_par_diff = sum(data['par_diff'] for data in scorecard_data_list) / total_rounds if total_rounds > 0 else 0
-        
-        # Encontrar mejores y peores resultados
-        if scorecard_data_list:
-            best_result = min(scorecard_data_list, key=lambda x: x['par_diff'])
-            worst_result = max(scorecard_data_list, key=lambda x: x['par_diff'])
-            best_points = max(scorecard_data_list, key=lambda x: x['total_points'])
-            worst_points = min(scorecard_data_list, key=lambda x: x['total_points'])
-        else:
-            best_result = worst_result = best_points = worst_points = None
-        
         # Mostrar estadísticas
         print(format_subtitle(f"Estadísticas de {player.first_name} {player.surname}"))
         print(f"Hándicap actual: {player.handicap}")
-        print(f"Total de rondas: {total_rounds}")
-        print(f"Media de golpes: {avg_strokes:.1f}")
-        print(f"Media respecto al par: {avg_par_diff:+.1f}")
-        print(f"Media de puntos stableford: {avg_points:.1f}")
-        
-        if best_result:
-            print(format_subtitle("Mejor resultado (golpes)"))
-            print(f"Fecha: {best_result['date']}")
-            print(f"Campo: {best_result['course_name']}")
-            print(f"Golpes: {best_result['total_strokes']}")
-            print(f"Resultado: {best_result['result_str']}")
-            
-            print(format_subtitle("Peor resultado (golpes)"))
-            print(f"Fecha: {worst_result['date']}")
-            print(f"Campo: {worst_result['course_name']}")
-            print(f"Golpes: {worst_result['total_strokes']}")
-            print(f"Resultado: {worst_result['result_str']}")
-            
-            print(format_subtitle("Mejor resultado (stableford)"))
-            print(f"Fecha: {best_points['date']}")
-            print(f"Campo: {best_points['course_name']}")
-            print(f"Puntos stableford: {best_points['total_points']}")
-            
-            print(format_subtitle("Peor resultado (stableford)"))
-            print(f"Fecha: {worst_points['date']}")
-            print(f"Campo: {worst_points['course_name']}")
-            print(f"Puntos stableford: {worst_points['total_points']}")
+        print(f"Total de rondas: {stats['total_rounds']}")
+        print(f"Media de golpes: {stats['avg_strokes']:.1f}")
+        print(f"Media respecto al par: {stats['avg_to_par']:+.1f}")
+        print(f"Media de puntos stableford: {stats['avg_points']:.1f}")
+        
+        extremes = [
+            ('best_gross', "Mejor resultado (golpes)"),
+            ('worst_gross', "Peor resultado (golpes)"),
+            ('best_to_par', "Mejor resultado (respecto al par)"),
+            ('worst_to_par', "Peor resultado (respecto al par)"),
+            ('best_points', "Mejor resultado (stableford)"),
+            ('worst_points', "Peor resultado (stableford)")
+        ]
+        for key, title in extremes:
+            round_data = stats[key]
+            print(format_subtitle(title))
+            print(f"Tarjeta: {round_data['scorecard_id']}")
+            print(f"Fecha: {ScorecardUtils.format_date(round_data['date'])}")
+            print(f"Campo: {round_data['course_name']}")
+            print(f"Golpes: {round_data['total_strokes']}")
+            print(f"Resultado: {ScorecardUtils.format_par_diff(round_data['to_par'])}")
+            print(f"Puntos stableford: {round_data['total_points']}")
         
         pause()
         self.show_statistics()
@@ -181,68 +144,75 @@ class ScorecardStatsView:
             self.show_statistics()
             return
         
-        # Obtener tarjetas del campo
-        scorecards = self.controller.get_scorecards()
-        course_scorecards = [sc for sc in scorecards if sc.course_id == course_id]
+        # Las estadísticas se calculan sobre todo el historial del campo
+        date_range = get_date_range_input("Periodo de las estadísticas")
+        stats = self.controller.get_course_stats(course_id, date_range)
         
-        if not course_scorecards:
+        if not stats['total_rounds']:
             print(format_info(f"No hay tarjetas registradas para el campo {course.name}."))
             pause()
             self.show_statistics()
             return
         
-        # Preparar datos para estadísticas
-        scorecard_data_list = []
-        for sc in course_scorecards:
-            player = self.player_controller.get_player(sc.player_id)
-            if not player:
-                continue
-            
-            scorecard_data = ScorecardUtils.prepare_scorecard_data(
-                sc, self.player_controller, self.course_controller, player, course
-            )
-            
-            # Añadir información para estadísticas
-            scorecard_data['par_diff'] = scorecard_data['total_strokes'] - course.par_total
-            scorecard_data['scorecard'] = sc
-            
-            scorecard_data_list.append(scorecard_data)
-        
-        # Calcular estadísticas
-        total_rounds = len(scorecard_data_list)
-        avg_strokes = sum(data['total_strokes'] for data in scorecard_data_list) / total_rounds if total_rounds > 0 else 0
-        avg_points = sum(data['total_points'] for data in scorecard_data_list) / total_rounds if total_rounds > 0 else 0
-        avg_par_diff = sum(data['par_diff'] for data in scorecard_data_list) / total_rounds if total_rounds > 0 else 0
-        
-        # Encontrar mejor y peor resultado
-        if scorecard_data_list:
-            best_result = min(scorecard_data_list, key=lambda x: x['par_diff'])
-            worst_result = max(scorecard_data_list, key=lambda x: x['par_diff'])
-        else:
-            best_result = worst_result = None
-        
         # Mostrar estadísticas
         print(format_subtitle(f"Estadísticas de {course.name}"))
         print(f"Par del campo: {course.par_total}")
         print(f"Slope: {course.slope}")
         print(f"Course Rating: {course.course_rating}")
-        print(f"Total de rondas: {total_rounds}")
-        print(f"Media de golpes: {avg_strokes:.1f}")
-        print(f"Media respecto al par: {avg_par_diff:+.1f}")
-        print(f"Media de puntos stableford: {avg_points:.1f}")
-        
-        if best_result:
-            print(format_subtitle("Mejor resultado"))
-            print(f"Jugador: {best_result['player_name']}")
-            print(f"Fecha: {best_result['date']}")
-            print(f"Golpes: {best_result['total_strokes']}")
-            print(f"Resultado: {best_result['result_str']}")
-            
-            print(format_subtitle("Peor resultado"))
-            print(f"Jugador: {worst_result['player_name']}")
-            print(f"Fecha: {worst_result['date']}")
-            print(f"Golpes: {worst_result['total_strokes']}")
-            print(f"Resultado: {worst_result['result_str']}")
+        print(f"Total de rondas: {stats['total_rounds']}")
+        print(f"Media de golpes: {stats['avg_strokes']:.1f}")
+        print(f"Media respecto al par: {stats['avg_to_par']:+.1f}")
+        print(f"Media de puntos stableford: {stats['avg_points']:.1f}")
+        
+        players = self.player_controller.get_players_by_ids(
+            [stats['best_round']['player_id'], stats['worst_round']['player_id']]
+        )
+        for key, title in (('best_round', "Mejor resultado"), ('worst_round', "Peor resultado")):
+            round_data = stats[key]
+            player = players.get(round_data['player_id'])
+            print(format_subtitle(title))
+            print(f"Jugador: {f'{player.first_name} {player.surname}' if player else 'Desconocido'}")
+            print(f"Fecha: {ScorecardUtils.format_date(round_data['date'])}")
+            print(f"Golpes: {round_data['total_strokes']}")
+            print(f"Resultado: {ScorecardUtils.format_par_diff(round_data['to_par'])}")
+        
+        # Desglose por salida, si el campo tiene rondas jugadas desde alguna
+        if any(tee['tee_id'] is not None for tee in stats['tees']):
+            print(format_subtitle("Estadísticas por salida"))
+            headers = ["Salida", "Slope", "Rating", "Rondas", "Media", "+/- Rating", "Puntos"]
+            data = [[
+                tee['name'] or "Sin salida",
+                tee['slope'],
+                tee['course_rating'],
+                tee['rounds'],
+                f"{tee['avg_strokes']:.1f}",
+                f"{tee['avg_over_rating']:+.1f}",
+                f"{tee['avg_points']:.1f}"
+            ] for tee in stats['tees']]
+            print(format_table(data, headers))
+        
+        # Estadísticas por hoyo
+        print(format_subtitle("Estadísticas por hoyo"))
+        headers = ["Hoyo", "Par", "Hcp", "Media", "+/- Par", "Eagle-", "Birdie", "Par", 
+                   "Bogey", "Doble", "Triple+", "Dificultad"]
+        data = []
+        for hole in stats['holes']:
+            distribution = hole['distribution']
+            data.append([
+                hole['hole'],
+                hole['par'],
+                hole['stroke_index'],
+                f"{hole['avg_strokes']:.2f}" if hole['avg_strokes'] is not None else "-",
+                f"{hole['avg_to_par']:+.2f}" if hole['avg_to_par'] is not None else "-",
+                distribution['eagle'],
+                distribution['birdie'],
+                distribution['par'],
+                distribution['bogey'],
+                distribution['double_bogey'],
+                distribution['triple_bogey'],
+                hole['difficulty_rank']
+            ])
+        print(format_table(data, headers))
         
         pause()
         self.show_statistics()
@@ -254,45 +224,17 @@ class ScorecardStatsView:
         clear_screen()
         print(format_title("MEJORES RESULTADOS"))
         
-        # Obtener todas las tarjetas
-        scorecards = self.controller.get_scorecards()
+        # Cada clasificación es una consulta top-N sobre todo el historial
+        best_results = self.controller.top_rounds('to_par', 10)
         
-        if not scorecards:
+        if not best_results:
             print(format_info("No hay tarjetas registradas."))
             pause()
             self.show_statistics()
             return
         
-        # Preparar datos para estadísticas
-        scorecard_data_list = []
-        for sc in scorecards:
-            player = self.player_controller.get_player(sc.player_id)
-            course = self.course_controller.get_course(sc.course_id)
-            
-            if not player or not course:
-                continue
-            
-            scorecard_data = ScorecardUtils.prepare_scorecard_data(
-                sc, self.player_controller, self.course_controller, player, course
-            )
-            
-            # Añadir información para estadísticas
-            scorecard_data['par_diff'] = scorecard_data['total_strokes'] - course.par_total
-            scorecard_data['scorecard'] = sc
-            
-            scorecard_data_list.append(scorecard_data)
-        
-        if not scorecard_data_list:
-            print(format_info("No hay datos suficientes para mostrar estadísticas."))
-            pause()
-            self.show_statistics()
-            return
-        
-        # Ordenar por resultado respecto al par (mejor a peor)
-        best_results = sorted(scorecard_data_list, key=lambda x: x['par_diff'])[:10]
-        
-        # Ordenar por puntos stableford (mejor a peor)
-        best_points = sorted(scorecard_data_list, key=lambda x: x['total_points'], reverse=True)[:10]
+        best_net = self.controller.top_rounds('net', 10)
+        best_points = self.controller.top_rounds('stableford', 10)
         
         # Mostrar mejores resultados respecto al par
         print(format_subtitle("Mejores resultados respecto al par"))
@@ -304,22 +246,41 @@ class ScorecardStatsView:
             data.append([
                 result['player_name'],
                 result['course_name'],
-                result['date'],
+                ScorecardUtils.format_date(result['date']),
                 result['total_strokes'],
-                result['result_str']
+                ScorecardUtils.format_par_diff(result['to_par'])
             ])
         
         print(format_table(data, headers))
         
+        # Mostrar mejores resultados netos
+        if best_net:
+            print(format_subtitle("Mejores resultados netos"))
+            
+            headers = ["Jugador", "Campo", "Fecha", "Golpes", "Neto"]
+            data = []
+            
+            for result in best_net:
+                data.append([
+                    result['player_name'],
+                    result['course_name'],
+                    ScorecardUtils.format_date(result['date']),
+                    result['total_strokes'],
+                    f"{result['net']:.1f}"
+                ])
+            
+            print(format_table(data, headers))
+        
         # Mostrar mejores resultados stableford
         print(format_subtitle("Mejores resultados stableford"))
         
-        headers = ["Fecha", "Campo", "Golpes", "Puntos"]
+        headers = ["Jugador", "Fecha", "Campo", "Golpes", "Puntos"]
         data = []
         
         for result in best_points:
             data.append([
-                result['date'],
+                result['player_name'],
+                ScorecardUtils.format_date(result['date']),
                 result['course_name'],
                 result['total_strokes'],
                 result['total_points']
@@ -351,47 +312,47 @@ class ScorecardStatsView:
             self.show_statistics()
             return
         
-        # Obtener tarjetas del jugador
-        scorecards = self.controller.get_scorecards()
-        player_scorecards = [sc for sc in scorecards if sc.player_id == player_id]
+        # Diferenciales WHS e índice vigente al jugar cada una de las últimas rondas
+        evolution = self.controller.handicap_controller.get_handicap_evolution(player_id)
         
-        if not player_scorecards:
+        if not evolution:
             print(format_info(f"No hay tarjetas registradas para {player.first_name} {player.surname}."))
             pause()
             self.show_statistics()
             return
         
-        # Ordenar tarjetas por fecha
-        player_scorecards.sort(key=lambda x: x.date)
-        
         # Preparar datos para la tabla
-        headers = ["Fecha", "Campo", "Golpes", "Puntos", "Hándicap"]
+        headers = ["Fecha", "Campo", "Golpes", "Diferencial", "Hcp en la ronda"]
         data = []
         
-        for sc in player_scorecards:
-            course = self.course_controller.get_course(sc.course_id)
-            if not course:
-                continue
-            
-            scorecard_data = ScorecardUtils.prepare_scorecard_data(
-                sc, self.player_controller, self.course_controller, player, course
-            )
-            
-            # Calcular hándicap de juego
-            handicap_coefficient = sc.handicap_coefficient
-            base_handicap = round((handicap_coefficient * 113) / course.slope, 1)
+        for entry in evolution:
+            differential = entry['differential']
+            index = entry['handicap_index']
             
             data.append([
-                scorecard_data['date'],
-                scorecard_data['course_name'],
-                scorecard_data['total_strokes'],
-                scorecard_data['total_points'],
-                base_handicap
+                ScorecardUtils.format_date(entry['date']),
+                entry['course_name'],
+                entry['total_strokes'],
+                f"{differential:.1f}{' *' if entry['counted'] else ''}" if differential is not None else "-",
+                f"{index:.1f}" if index is not None else "-"
             ])
         
         # Mostrar tabla
         print(format_subtitle(f"Evolución de hándicap de {player.first_name} {player.surname}"))
         print(format_table(data, headers))
+        print("* Diferenciales que cuentan para el índice actual")
+        
+        # Revisiones del índice desde la primera ronda mostrada
+        revisions = self.controller.handicap_controller.get_handicap_history(
+            player_id, start_date=evolution[0]['date']
+        )
+        if revisions:
+            print(format_subtitle("Revisiones del índice"))
+            print(format_table(
+                [[ScorecardUtils.format_date(effective_date), f"{index:.1f}"]
+                 for effective_date, index in revisions],
+                ["Desde", "Índice"]
+            ))
         
         # Mostrar hándicap actual
         print(f"Hándicap actual: {player.handicap}")
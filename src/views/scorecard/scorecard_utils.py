@@ -128,6 +128,23 @@ class ScorecardUtils:
                 return "N/A"
         return "N/A"
     
+    @staticmethod
+    def format_par_diff(diff):
+        """
+        Formatea un resultado respecto al par ("3 bajo par", "Par", "5 sobre par").
+        
+        Args:
+            diff (int): Golpes respecto al par
+            
+        Returns:
+            str: El resultado formateado
+        """
+        if diff < 0:
+            return f"{abs(diff)} bajo par"
+        if diff == 0:
+            return "Par"
+        return f"{diff} sobre par"
+    
     @staticmethod
     def prepare_scorecard_data(scorecard, player_controller=None, course_controller=None, player=None, course=None):
         """
@@ -172,18 +189,48 @@ class ScorecardUtils:
         if course:
             data['course_name'] = course.name
             data['course_location'] = course.location
+            # El resultado se calcula con el par de la salida de la tarjeta
+            rated = course.for_tee(scorecard.tee_id)
+            data['par_total'] = rated.par_total
             
             # Calcular resultado en relación al par
-            if hasattr(course, 'par') and course.par and scorecard.strokes:
-                total_par = course.par
+            if rated.par_total and scorecard.strokes:
                 total_strokes = sum(scorecard.strokes)
-                diff = total_strokes - total_par
-                
-                if diff < 0:
-                    data['result_str'] = f"{abs(diff)} bajo par"
-                elif diff == 0:
-                    data['result_str'] = "Par"
-                else:
-                    data['result_str'] = f"{diff} sobre par"
+                data['result_str'] = ScorecardUtils.format_par_diff(total_strokes - rated.par_total)
         
         return data
+    
+    @staticmethod
+    def prepare_scorecards_data(scorecards, player_controller=None, course_controller=None, players=None, courses=None):
+        """
+        Prepara los datos de varias tarjetas para su visualización.
+        
+        Los jugadores y campos se obtienen con una consulta por tipo en lugar de
+        una por tarjeta.
+        
+        Args:
+            scorecards (list): Tarjetas a preparar
+            player_controller (PlayerController, optional): Controlador de jugadores
+            course_controller (CourseController, optional): Controlador de campos
+            players (dict, optional): Jugadores ya obtenidos {id: Player}
+            courses (dict, optional): Campos ya obtenidos {id: Course}
+            
+        Returns:
+            list: Datos preparados para visualización, en el mismo orden que las tarjetas
+        """
+        if players is None:
+            players = player_controller.get_players_by_ids(
+                sc.player_id for sc in scorecards
+            ) if player_controller else {}
+        
+        if courses is None:
+            courses = course_controller.get_courses_by_ids(
+                sc.course_id for sc in scorecards
+            ) if course_controller else {}
+        
+        return [
+            ScorecardUtils.prepare_scorecard_data(
+                sc, player=players.get(sc.player_id), course=courses.get(sc.course_id)
+            )
+            for sc in scorecards
+        ]
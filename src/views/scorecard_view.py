@@ -8,6 +8,7 @@ from src.controllers.player_controller import PlayerController
 from src.controllers.course_controller import CourseController
 from src.views.player_view import PlayerView
 from src.views.course_view import CourseView
+from src.utils.profiling import profile_action
 
 # Importar componentes especializados
 from src.views.scorecard.scorecard_display import ScorecardDisplayView
@@ -50,34 +51,42 @@ class ScorecardView:
             self.controller, self.player_controller, self.course_controller
         )
     
+    @profile_action('scorecard.show_menu')
     def show_menu(self):
         """Muestra el menú principal de tarjetas de puntuación."""
         return self.display_view.show_scorecards()
     
+    @profile_action('scorecard.show_scorecards')
     def show_scorecards(self):
         """Muestra la lista de tarjetas."""
         return self.display_view.show_scorecards()
     
+    @profile_action('scorecard.add_scorecard')
     def add_scorecard(self):
         """Añade una nueva tarjeta."""
         return self.edit_view.add_scorecard()
     
+    @profile_action('scorecard.modify_scorecard')
     def modify_scorecard(self, scorecard_id):
         """Modifica una tarjeta existente."""
         return self.edit_view.modify_scorecard(scorecard_id)
     
+    @profile_action('scorecard.delete_scorecard')
     def delete_scorecard(self, scorecard_id):
         """Elimina una tarjeta existente."""
         return self.edit_view.delete_scorecard(scorecard_id)
     
+    @profile_action('scorecard.view_scorecard_details')
     def view_scorecard_details(self, scorecard_id):
         """Muestra los detalles de una tarjeta."""
         return self.display_view.view_scorecard_details(scorecard_id)
     
+    @profile_action('scorecard.filter_scorecards')
     def filter_scorecards(self):
         """Filtra tarjetas según criterios."""
         return self.filter_view.filter_scorecards()
     
+    @profile_action('scorecard.show_statistics')
     def show_statistics(self):
         """Muestra estadísticas de tarjetas."""
         return self.stats_view.show_statistics()
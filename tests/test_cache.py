@@ -0,0 +1,73 @@
+"""
+Pruebas de la invalidación de la caché de entidades (src/utils/cache.py).
+"""
+import pytest
+
+from src.controllers.player_controller import PlayerController
+from src.controllers.scorecard_controller import ScorecardController
+from src.database import Database
+from src.utils.cache import operation
+from src.utils.query_budget import QueryCounter
+
+PARS = [4] * 18
+HANDICAPS = list(range(1, 19))
+
+
+@pytest.fixture
+def players(tmp_path):
+    db = Database(str(tmp_path / 'golf.db'))
+    player_id = db.add_player('Ana', 'García', 18.0)
+    yield PlayerController(db), player_id
+    db.connection.close()
+
+
+def test_controller_write_invalidates_other_caches(players):
+    controller, player_id = players
+    other = PlayerController(controller.db)
+    assert other.get_player(player_id).handicap == 18.0
+
+    success, _ = controller.update_player(player_id, 'Ana', 'García', 12.5)
+
+    assert success
+    assert other.get_player(player_id).handicap == 12.5
+
+
+def test_handicap_update_invalidates_player(players):
+    controller, player_id = players
+    db = controller.db
+    course_id = db.add_course('Campo', 'Madrid', 113, 72.0, 72, PARS, HANDICAPS)
+    assert controller.get_player(player_id).handicap == 18.0
+
+    scorecards = ScorecardController(db)
+    for day in (1, 2, 3):
+        success, _ = scorecards.add_scorecard(player_id, course_id, f'2024-05-0{day}', [5] * 18, [2] * 18, 100, 0)
+        assert success
+
+    assert controller.get_player(player_id).handicap != 18.0
+
+
+def test_data_version_checked_once_per_operation(players):
+    controller, player_id = players
+    controller.get_player(player_id)
+
+    with operation():
+        with QueryCounter(controller.db) as counter:
+            for _ in range(3):
+                controller.get_player(player_id)
+
+    assert counter.statements == ['PRAGMA data_version']
+
+
+def test_other_connection_seen_in_next_operation(players):
+    controller, player_id = players
+    other = Database(controller.db.db_path)
+
+    with operation():
+        controller.get_player(player_id)
+        other.update_player(player_id, 'Ana', 'García', 10.0)
+        # Dentro de la operación se sigue usando la entidad en caché
+        assert controller.get_player(player_id).handicap == 18.0
+
+    with operation():
+        assert controller.get_player(player_id).handicap == 10.0
+    other.connection.close()
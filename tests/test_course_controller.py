@@ -0,0 +1,66 @@
+"""
+Pruebas del recálculo de las tarjetas al modificar un campo.
+"""
+import pytest
+
+from src.controllers.course_controller import CourseController
+from src.controllers.scorecard_controller import ScorecardController
+from src.database import Database
+
+PARS = [4] * 18
+HANDICAPS = list(range(1, 19))
+
+
+@pytest.fixture
+def card(tmp_path):
+    """Una tarjeta de 5 golpes por hoyo con un golpe de hándicap (en el hoyo de hándicap 1)."""
+    db = Database(str(tmp_path / 'golf.db'))
+    courses = CourseController(db)
+    scorecards = ScorecardController(db)
+    player_id = db.add_player('Ana', 'García', 1.0)
+    _, course_id = courses.add_course('Campo', 'Madrid', 113, 72.0, 72, PARS, HANDICAPS)
+    points = [2] + [1] * 17
+    success, scorecard_id = scorecards.add_scorecard(
+        player_id, course_id, '2024-05-01', [5] * 18, points, 100, 1
+    )
+    assert success
+    yield courses, scorecards, course_id, scorecard_id
+    db.connection.close()
+
+
+def _update(courses, course_id, pars, handicaps):
+    success, message = courses.update_course(
+        course_id, 'Campo', 'Madrid', 113, 72.0, sum(pars), pars, handicaps
+    )
+    assert success, message
+    return message
+
+
+def test_par_change_recomputes_points(card):
+    courses, scorecards, course_id, scorecard_id = card
+    pars = [5] + [4] * 17
+
+    message = _update(courses, course_id, pars, HANDICAPS)
+
+    scorecard = scorecards.get_scorecard(scorecard_id)
+    assert scorecard.points == [3] + [1] * 17
+    assert "1 tarjetas" in message
+
+
+def test_stroke_index_change_recomputes_points(card):
+    courses, scorecards, course_id, scorecard_id = card
+    handicaps = [2, 1] + list(range(3, 19))
+
+    _update(courses, course_id, PARS, handicaps)
+
+    # El golpe de hándicap pasa al segundo hoyo
+    assert scorecards.get_scorecard(scorecard_id).points == [1, 2] + [1] * 16
+
+
+def test_unchanged_holes_keep_points(card):
+    courses, scorecards, course_id, scorecard_id = card
+
+    message = _update(courses, course_id, PARS, HANDICAPS)
+
+    assert scorecards.get_scorecard(scorecard_id).points == [2] + [1] * 17
+    assert "recalculado" not in message
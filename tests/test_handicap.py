@@ -0,0 +1,141 @@
+"""
+Pruebas del cálculo del índice de hándicap y de su historial.
+"""
+from datetime import date, timedelta
+
+import pytest
+
+from src.controllers.course_controller import CourseController
+from src.controllers.handicap_controller import HandicapController
+from src.controllers.scorecard_controller import ScorecardController
+from src.database import Database
+from src.utils.handicap import MAX_HANDICAP_INDEX, MIN_HANDICAP_INDEX, handicap_index
+
+PARS = [4] * 18
+HANDICAPS = list(range(1, 19))
+
+
+@pytest.fixture
+def controller(tmp_path):
+    db = Database(str(tmp_path / 'golf.db'))
+    yield ScorecardController(db)
+    db.connection.close()
+
+
+def _add_round(controller, player_id, course_id, date, stroke):
+    success, scorecard_id = controller.add_scorecard(
+        player_id, course_id, date, [stroke] * 18, [2] * 18, 100, 0
+    )
+    assert success, scorecard_id
+    return scorecard_id
+
+
+def _handicap(db, player_id):
+    return db.connection.execute(
+        'SELECT handicap FROM players WHERE id = ?', (player_id,)
+    ).fetchone()['handicap']
+
+
+@pytest.mark.parametrize('differentials, expected', [
+    ([-20.0] * 3, MIN_HANDICAP_INDEX),
+    ([80.0] * 3, MAX_HANDICAP_INDEX),
+    ([10.0, 12.0, 14.0], 8.0),
+    ([10.0, None], None),
+])
+def test_handicap_index_limits(differentials, expected):
+    assert handicap_index(differentials) == expected
+
+
+def test_deleted_round_resets_index(controller):
+    db = controller.db
+    player_id = db.add_player('Ana', 'García', 18.0)
+    course_id = db.add_course('Campo', 'Madrid', 113, 72.0, 72, PARS, HANDICAPS)
+    scorecard_ids = [
+        _add_round(controller, player_id, course_id, f'2024-05-0{day}', 5)
+        for day in (1, 2, 3)
+    ]
+    assert _handicap(db, player_id) != 18.0
+    assert db.get_handicap_as_of(player_id, '2024-05-04') is not None
+
+    controller.delete_scorecard(scorecard_ids[-1])
+
+    # Sin rondas suficientes se eliminan las revisiones calculadas y el jugador
+    # vuelve a su hándicap manual
+    assert [row['handicap_index'] for row in db.get_handicap_history(player_id)] == [18.0]
+    assert _handicap(db, player_id) == 18.0
+
+
+def test_manual_handicap_kept_without_index(controller):
+    db = controller.db
+    player_id = db.add_player('Luis', 'Pérez', 24.5)
+    course_id = db.add_course('Campo', 'Madrid', 113, 72.0, 72, PARS, HANDICAPS)
+    scorecard_id = _add_round(controller, player_id, course_id, '2024-05-01', 5)
+    _add_round(controller, player_id, course_id, '2024-05-02', 5)
+
+    controller.delete_scorecard(scorecard_id)
+
+    assert _handicap(db, player_id) == 24.5
+    assert [row['handicap_index'] for row in db.get_handicap_history(player_id)] == [24.5]
+
+
+def test_revisions_are_journaled(controller):
+    db = controller.db
+    player_id = db.add_player('Marta', 'Ruiz', 12.0)
+    course_id = db.add_course('Campo', 'Madrid', 113, 72.0, 72, PARS, HANDICAPS)
+    seq = db.changes_since()[-1]['seq']
+    for day in (1, 2, 3):
+        _add_round(controller, player_id, course_id, f'2024-05-0{day}', 5)
+
+    changes = [(row['table_name'], row['row_id']) for row in db.changes_since(seq)]
+    assert ('handicap_history', player_id) in changes
+
+
+def test_current_index_uses_last_rounds_window(controller):
+    db = controller.db
+    player_id = db.add_player('Pablo', 'Sanz', 30.0)
+    course_id = db.add_course('Campo', 'Madrid', 113, 72.0, 72, PARS, HANDICAPS)
+    first = date(2024, 1, 1)
+    # Seis rondas muy buenas que quedan fuera de la ventana de las 20 últimas
+    for day in range(25):
+        stroke = 4 if day < 6 else 5 + day % 2
+        _add_round(controller, player_id, course_id, (first + timedelta(days=day)).isoformat(), stroke)
+    # Una ronda de 10 hoyos dentro de la ventana: no cuenta para hándicap
+    success, scorecard_id = controller.add_scorecard(
+        player_id, course_id, (first + timedelta(days=25)).isoformat(), [5] * 10 + [0] * 8, [2] * 18, 100, 0
+    )
+    assert success, scorecard_id
+    assert db.get_recent_player_rounds(player_id, 1)[0]['score_differential'] is None
+
+    expected = HandicapController(db).calculate_handicap_index(player_id)
+    assert _handicap(db, player_id) == expected
+    assert db.get_handicap_as_of(player_id, (first + timedelta(days=26)).isoformat()) == expected
+
+
+def test_as_of_today_matches_current_index(controller):
+    db = controller.db
+    player_id = db.add_player('Elena', 'Gil', 20.0)
+    course_id = db.add_course('Campo', 'Madrid', 113, 72.0, 72, PARS, HANDICAPS)
+    # Sin rondas, el hándicap inicial está vigente en cualquier fecha
+    assert db.get_handicap_as_of(player_id, '2024-01-01') == 20.0
+    for day in (1, 2, 3):
+        _add_round(controller, player_id, course_id, f'2024-05-0{day}', 5)
+
+    today = date.today().isoformat()
+    assert db.get_handicap_as_of(player_id, today) == _handicap(db, player_id) != 20.0
+
+
+def test_deleting_course_recomputes_handicaps(controller):
+    db = controller.db
+    player_id = db.add_player('Jorge', 'Díaz', 22.0)
+    course_id = db.add_course('Campo', 'Madrid', 113, 72.0, 72, PARS, HANDICAPS)
+    other_id = db.add_course('Otro', 'Toledo', 113, 72.0, 72, PARS, HANDICAPS)
+    _add_round(controller, player_id, other_id, '2024-04-01', 5)
+    for day in (1, 2, 3):
+        _add_round(controller, player_id, course_id, f'2024-05-0{day}', 5)
+    assert _handicap(db, player_id) != 22.0
+
+    success, _ = CourseController(db).delete_course(course_id, delete_scorecards=True)
+
+    assert success
+    assert _handicap(db, player_id) == 22.0
+    assert [row['handicap_index'] for row in db.get_handicap_history(player_id)] == [22.0]
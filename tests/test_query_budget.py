@@ -0,0 +1,157 @@
+"""
+Pruebas del contador de sentencias SQL (src/utils/query_budget.py) y del número
+de consultas de cada pantalla de listas, filtros y estadísticas.
+
+Las pantallas se muestran sin terminal contra una base de datos generada con
+miles de tarjetas: una pantalla que vuelva a consultar el jugador o el campo de
+cada tarjeta supera su máximo en cuanto hay más de un puñado de tarjetas.
+"""
+import builtins
+import contextlib
+import io
+import os
+from datetime import date, timedelta
+
+import pytest
+
+from generate_data import generate
+from src.controllers.course_controller import CourseController
+from src.controllers.player_controller import PlayerController
+from src.controllers.scorecard_controller import ScorecardController
+from src.database import Database
+from src.utils.metrics import STATEMENTS
+from src.utils.query_budget import QueryBudgetExceeded, QueryCounter, _active, assert_max_queries
+from src.views.course_view import CourseView
+from src.views.player_view import PlayerView
+from src.views.scorecard_view import ScorecardView
+
+SCREEN_ROUNDS = 5_000
+
+# (nombre, vista, método, teclas, máximo de sentencias); las teclas pueden
+# referirse a los datos de _screen_context con {player}, {course}, {start} y {end}
+SCREENS = [
+    ('lista de jugadores', 'players', 'show_players', ['0'], 3),
+    ('lista de campos', 'courses', 'show_courses', ['0'], 3),
+    ('lista de tarjetas', 'scorecards', 'show_scorecards', ['0'], 6),
+    ('filtro por jugador', 'scorecards', 'filter_scorecards', ['1', '{player}', '0'], 8),
+    ('filtro por campo', 'scorecards', 'filter_scorecards', ['2', '{course}', '0'], 8),
+    ('filtro por fecha', 'scorecards', 'filter_scorecards', ['3', '3', '{start}', '{end}', '0'], 6),
+    ('filtro por resultado', 'scorecards', 'filter_scorecards', ['4', '3', '0'], 6),
+    ('filtro por campo y fecha', 'scorecards', 'filter_scorecards',
+     ['2', '{course}', '2', '3', '3', '{start}', '{end}', '0'], 12),
+    ('estadísticas de jugador', 'scorecards', 'show_statistics', ['1', '{player}', '4', '', '0'], 8),
+    ('estadísticas de campo', 'scorecards', 'show_statistics', ['2', '{course}', '4', '', '0'], 8),
+    ('mejores resultados', 'scorecards', 'show_statistics', ['3', '', '0'], 6),
+    ('evolución de hándicap', 'scorecards', 'show_statistics', ['4', '{player}', '', '0'], 8),
+]
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(str(tmp_path / 'golf.db'))
+    yield database
+    database.connection.close()
+
+
+def _screen_context(db):
+    """El jugador y el campo con más rondas y el último año con datos."""
+    connection = db.connection
+    player_id = connection.execute(
+        'SELECT player_id FROM scorecards GROUP BY player_id ORDER BY COUNT(*) DESC LIMIT 1'
+    ).fetchone()[0]
+    course_id = connection.execute(
+        'SELECT course_id FROM scorecards GROUP BY course_id ORDER BY COUNT(*) DESC LIMIT 1'
+    ).fetchone()[0]
+    end = date.fromisoformat(connection.execute('SELECT MAX(date) FROM scorecards').fetchone()[0])
+    return {
+        'player': str(player_id),
+        'course': str(course_id),
+        'start': (end - timedelta(days=365)).strftime('%d/%m/%Y'),
+        'end': end.strftime('%d/%m/%Y'),
+    }
+
+
+@pytest.fixture(scope='module')
+def screens(tmp_path_factory):
+    database = Database(str(tmp_path_factory.mktemp('screens') / 'golf.db'))
+    generate(database, SCREEN_ROUNDS // 100, 5, SCREEN_ROUNDS, seed=42, log=lambda message: None)
+    database.connection.execute('ANALYZE')
+    player_controller, course_controller = PlayerController(database), CourseController(database)
+    views = {
+        'players': PlayerView(player_controller),
+        'courses': CourseView(course_controller),
+        'scorecards': ScorecardView(ScorecardController(database), player_controller, course_controller),
+    }
+    yield database, views, _screen_context(database)
+    database.connection.close()
+
+
+def _render(method, keys, monkeypatch):
+    """Muestra una pantalla con un guion de teclas, descartando la salida."""
+    script = iter(keys)
+
+    def replay(prompt=''):
+        key = next(script, None)
+        if key is None:
+            pytest.fail(f"La pantalla ha pedido más teclas que {keys}")
+        return key
+
+    monkeypatch.setattr(builtins, 'input', replay)
+    monkeypatch.setattr(os, 'system', lambda command: 0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        method()
+
+
+def test_counts_statements(db):
+    with QueryCounter(db) as counter:
+        db.connection.execute('SELECT 1')
+        db.connection.execute('SELECT 2')
+    assert counter.count == 2
+    assert counter.statements == ['SELECT 1', 'SELECT 2']
+
+
+def test_budget_exceeded(db):
+    with pytest.raises(QueryBudgetExceeded) as excinfo:
+        with assert_max_queries(db, 1, 'bloque'):
+            for _ in range(3):
+                db.connection.execute('SELECT 1')
+    assert excinfo.value.max_queries == 1
+    assert len(excinfo.value.statements) == 3
+    assert '3 x SELECT 1' in str(excinfo.value)
+
+
+def test_nested_counters(db):
+    with QueryCounter(db) as outer:
+        db.connection.execute('SELECT 1')
+        with QueryCounter(db) as inner:
+            db.connection.execute('SELECT 2')
+        db.connection.execute('SELECT 3')
+    assert outer.statements == ['SELECT 1', 'SELECT 2', 'SELECT 3']
+    assert inner.statements == ['SELECT 2']
+
+
+def test_restores_trace_callback(db):
+    with QueryCounter(db) as counter:
+        with QueryCounter(db):
+            pass
+        # Al salir del contador interno el externo sigue registrando
+        db.connection.execute('SELECT 1')
+    assert counter.count == 1
+    assert db.connection not in _active
+
+    # Fuera de los contadores solo se cuentan las sentencias en las métricas
+    before = STATEMENTS.value(statement='select')
+    db.connection.execute('SELECT 1')
+    assert STATEMENTS.value(statement='select') == before + 1
+    assert counter.count == 1
+
+
+@pytest.mark.parametrize('name, view, method, keys, budget', SCREENS, ids=[screen[0] for screen in SCREENS])
+def test_screen_query_budget(screens, monkeypatch, name, view, method, keys, budget):
+    database, views, context = screens
+    # Cada pantalla parte de cachés vacías, como al abrirla por primera vez
+    views['scorecards'].player_controller.cache.invalidate()
+    views['scorecards'].course_controller.cache.invalidate()
+    keys = [key.format(**context) for key in keys]
+    with assert_max_queries(database, budget, name):
+        _render(getattr(views[view], method), keys, monkeypatch)
@@ -0,0 +1,109 @@
+"""
+Pruebas del decodificador de datos por hoyo (src/utils/row_decoder.py).
+"""
+import json
+import random
+
+import numpy as np
+import pytest
+
+from src.utils.row_decoder import HoleDataError, decode_hole_list, decode_hole_matrix
+
+STROKES = [4, 5, 3, 4, 6, 4, 5, 3, 4, 4, 5, 3, 4, 7, 4, 5, 3, 4]
+
+
+def _random_strokes(rng):
+    """Genera 18 golpes aleatorios."""
+    return [rng.randint(1, 12) for _ in range(18)]
+
+
+def _legacy_encoding(values, rng):
+    """Codifica una lista con el formato antiguo, incluyendo comas sobrantes."""
+    parts = []
+    for value in values:
+        parts.append(str(value))
+        parts.append(',' * rng.randint(1, 3))
+    text = ''.join(parts)
+    return (',' if rng.random() < 0.3 else '') + text
+
+
+@pytest.mark.parametrize('encoded', [
+    json.dumps(STROKES),
+    json.dumps(STROKES, separators=(',', ':')),
+    ','.join(map(str, STROKES)),
+    ',,' + ',,'.join(map(str, STROKES)) + ',',
+    ' '.join(map(str, STROKES)),
+    json.dumps([float(v) for v in STROKES]),
+    json.dumps(STROKES).encode('utf-8'),
+    STROKES,
+    tuple(STROKES),
+])
+def test_decodifica_todos_los_formatos(encoded):
+    assert decode_hole_list(encoded) == STROKES
+
+
+@pytest.mark.parametrize('encoded', [None, '', '   ', '[]'])
+def test_valores_vacios(encoded):
+    assert decode_hole_list(encoded) == []
+
+
+@pytest.mark.parametrize('encoded', [
+    '[+4, 3]',
+    '[4, ٣]',
+    '+4,3',
+    '4,٣',
+    '4_0,3',
+    '[4.5, 3]',
+    '[true, 3]',
+    '[null, 3]',
+    '[4, "x"]',
+    '{"a": 4}',
+    '[4, 3',
+    '4,x,3',
+    12,
+])
+def test_valores_no_validos_lanzan_error(encoded):
+    with pytest.raises(HoleDataError):
+        decode_hole_list(encoded)
+
+
+def test_ninguna_tarjeta_se_pierde_con_entradas_aleatorias():
+    """Cada lista se decodifica completa y las corruptas fallan de forma explícita"""
+    rng = random.Random(42)
+    for _ in range(2000):
+        values = _random_strokes(rng)
+        for encoded in (json.dumps(values), json.dumps(values, separators=(',', ':')),
+                        _legacy_encoding(values, rng), json.dumps([float(v) for v in values])):
+            assert decode_hole_list(encoded) == values, encoded
+
+        broken = list(map(str, values))
+        broken[rng.randrange(18)] = rng.choice(['x', '4.5', '"', '{}', '[]', 'null', '+4', '٣', '4_0'])
+        for encoded in ('[' + ','.join(broken) + ']', ','.join(broken)):
+            with pytest.raises(HoleDataError):
+                decode_hole_list(encoded)
+
+
+def test_matriz_con_json_canonico():
+    rng = random.Random(7)
+    values = [_random_strokes(rng) for _ in range(50)]
+    matrix = decode_hole_matrix([json.dumps(v) for v in values])
+    assert matrix.dtype == np.int8
+    assert matrix.tolist() == values
+
+
+def test_matriz_con_formatos_mezclados_rellena_y_trunca():
+    matrix = decode_hole_matrix([json.dumps(STROKES), '4,5,3', json.dumps(STROKES + [9]), None])
+    assert matrix[0].tolist() == STROKES
+    assert matrix[1].tolist() == [4, 5, 3] + [0] * 15
+    assert matrix[2].tolist() == STROKES
+    assert matrix[3].tolist() == [0] * 18
+
+
+@pytest.mark.parametrize('corrupt', [
+    '[' + ','.join(['+4'] + ['4'] * 17) + ']',
+    '[' + ','.join(['x'] + ['4'] * 17) + ']',
+    '[' + ','.join(['300'] + ['4'] * 17) + ']',
+])
+def test_matriz_no_acepta_valores_no_validos(corrupt):
+    with pytest.raises(HoleDataError):
+        decode_hole_matrix([json.dumps(STROKES), corrupt])
@@ -0,0 +1,93 @@
+"""
+Pruebas de las escrituras de tarjetas del controlador.
+"""
+import pytest
+
+from src.controllers.scorecard_controller import ScorecardController
+from src.database import Database, ScorecardConflictError
+
+PARS = [4] * 18
+HANDICAPS = list(range(1, 19))
+STROKES = [5] * 18
+POINTS = [1] * 18
+
+
+@pytest.fixture
+def setup(tmp_path):
+    db = Database(str(tmp_path / 'golf.db'))
+    player_id = db.add_player('Ana', 'García', 18.0)
+    course_id = db.add_course('Campo', 'Madrid', 113, 72.0, 72, PARS, HANDICAPS)
+    yield ScorecardController(db), player_id, course_id
+    db.connection.close()
+
+
+def _count(controller):
+    return controller.db.connection.execute('SELECT COUNT(*) FROM scorecards').fetchone()[0]
+
+
+def test_duplicate_round_is_rejected(setup):
+    controller, player_id, course_id = setup
+    success, scorecard_id = controller.add_scorecard(player_id, course_id, '2024-05-01', STROKES, POINTS, 100)
+    assert success
+
+    success, message = controller.add_scorecard(player_id, course_id, '2024-05-01', STROKES, POINTS, 100)
+    assert not success
+    assert str(scorecard_id) in message
+    assert _count(controller) == 1
+
+
+def test_upsert_is_idempotent(setup):
+    controller, player_id, course_id = setup
+    success, first = controller.upsert_scorecard(player_id, course_id, '2024-05-01', STROKES, POINTS, 100)
+    assert success
+    success, second = controller.upsert_scorecard(player_id, course_id, '2024-05-01', STROKES, POINTS, 95)
+    assert success and second == first
+    assert _count(controller) == 1
+    assert controller.get_scorecard(first).handicap_coefficient == 95
+
+
+def test_import_skips_existing_rounds(setup):
+    controller, player_id, course_id = setup
+    cards = [{
+        'player_id': player_id, 'course_id': course_id, 'date': f'2024-05-0{day}',
+        'strokes': STROKES, 'points': POINTS, 'handicap_coefficient': 100
+    } for day in (1, 2, 3)]
+
+    assert controller.import_scorecards(cards[:2]) == (2, 0)
+    # Reintentar la importación completa solo añade la ronda nueva
+    assert controller.import_scorecards(cards) == (1, 2)
+    assert _count(controller) == 3
+
+
+def test_stale_version_raises_conflict(setup):
+    controller, player_id, course_id = setup
+    _, scorecard_id = controller.add_scorecard(player_id, course_id, '2024-05-01', STROKES, POINTS, 100)
+    read = controller.get_scorecard(scorecard_id)
+
+    # Otro usuario guarda la tarjeta entre la lectura y la escritura
+    assert controller.update_scorecard(scorecard_id, handicap_coefficient=95)
+    with pytest.raises(ScorecardConflictError) as excinfo:
+        controller.update_scorecard(scorecard_id, handicap_coefficient=90, expected_version=read.version)
+
+    assert excinfo.value.current_version == read.version + 1
+    assert controller.get_scorecard(scorecard_id).handicap_coefficient == 95
+
+
+def test_current_version_updates(setup):
+    controller, player_id, course_id = setup
+    _, scorecard_id = controller.add_scorecard(player_id, course_id, '2024-05-01', STROKES, POINTS, 100)
+    read = controller.get_scorecard(scorecard_id)
+
+    assert controller.update_scorecard(scorecard_id, handicap_coefficient=90, expected_version=read.version)
+    assert controller.get_scorecard(scorecard_id).version == read.version + 1
+
+
+def test_search_limit_returns_most_recent(setup):
+    controller, player_id, course_id = setup
+    for day in (1, 2, 3):
+        controller.add_scorecard(player_id, course_id, f'2024-05-0{day}', STROKES, POINTS, 100)
+
+    found = controller.search_scorecards({'player_id': player_id}, limit=2)
+    assert [scorecard.date for scorecard in found] == ['2024-05-03', '2024-05-02']
+    found = controller.search_scorecards({'player_id': player_id}, limit=2, offset=2)
+    assert [scorecard.date for scorecard in found] == ['2024-05-01']
@@ -0,0 +1,98 @@
+"""
+Pruebas del resultado respecto al par con salidas de distinto par.
+"""
+import pytest
+
+from src.controllers.course_controller import CourseController
+from src.controllers.player_controller import PlayerController
+from src.controllers.scorecard_controller import ScorecardController
+from src.database import Database
+from src.views.scorecard.scorecard_utils import ScorecardUtils
+
+PARS = [4] * 18
+HANDICAPS = list(range(1, 19))
+
+
+@pytest.fixture
+def rounds(tmp_path):
+    """
+    Un campo de par 72 con una salida de par 70 y tres rondas de un jugador:
+    74 golpes sin salida (+2), 73 desde la salida (+3) y 71 desde la salida (+1).
+
+    La salida se guarda directamente en la base de datos, como las creadas antes
+    de exigir que su par sea el del campo.
+    """
+    db = Database(str(tmp_path / 'golf.db'))
+    controller = ScorecardController(db)
+    player_id = db.add_player('Ana', 'García', 18.0)
+    course_id = db.add_course('Campo', 'Madrid', 113, 72.0, 72, PARS, HANDICAPS)
+    tee_id = db.add_course_tee(course_id, 'Rojas', 113, 70.0, 70)
+    ids = {}
+    for to_par, day, tee, strokes in ((2, 1, None, 74), (3, 2, tee_id, 73), (1, 3, tee_id, 71)):
+        holes = [4 + strokes - 72] + [4] * 17
+        success, scorecard_id = controller.add_scorecard(
+            player_id, course_id, f'2024-05-0{day}', holes, [2] * 18, 100, 0, tee
+        )
+        assert success, scorecard_id
+        ids[to_par] = scorecard_id
+    yield controller, player_id, ids
+    db.connection.close()
+
+
+def test_top_rounds_to_par_uses_tee_par(rounds):
+    controller, _, ids = rounds
+    top = controller.top_rounds('to_par', 3)
+    assert [row['to_par'] for row in top] == [1, 2, 3]
+    assert [row['scorecard_id'] for row in top] == [ids[1], ids[2], ids[3]]
+
+
+def test_to_par_filter_uses_tee_par(rounds):
+    controller, _, ids = rounds
+    found = controller.db.search_scorecards({'to_par_min': 3, 'to_par_max': 3})
+    assert [row['id'] for row in found] == [ids[3]]
+
+
+def test_player_stats_use_tee_par(rounds):
+    controller, player_id, ids = rounds
+    stats = controller.get_player_stats(player_id)
+    assert stats['best_to_par']['scorecard_id'] == ids[1]
+    assert stats['worst_to_par']['to_par'] == 3
+    assert stats['avg_to_par'] == pytest.approx(2.0)
+
+
+def test_scorecard_list_uses_tee_par(rounds):
+    controller, _, ids = rounds
+    db = controller.db
+    scorecard = controller.get_scorecard(ids[1])
+    data = ScorecardUtils.prepare_scorecard_data(scorecard, PlayerController(db), CourseController(db))
+    assert data['par_total'] == 70
+    assert data['result_str'] == "1 sobre par"
+
+
+def test_course_stats_use_tee_par(rounds):
+    controller, _, ids = rounds
+    course_id = controller.get_scorecard(ids[1]).course_id
+    stats = controller.get_course_stats(course_id)
+    assert stats['avg_to_par'] == pytest.approx(2.0)
+    assert stats['best_round']['scorecard_id'] == ids[1]
+    assert stats['best_round']['to_par'] == 1
+    assert stats['worst_round']['to_par'] == 3
+
+
+def test_tee_par_must_match_course(tmp_path):
+    db = Database(str(tmp_path / 'golf.db'))
+    courses = CourseController(db)
+    success, course_id = courses.add_course('Campo', 'Madrid', 113, 72.0, 72, PARS, HANDICAPS)
+    assert success
+
+    success, message = courses.add_tee(course_id, 'Rojas', 113, 70.0, 70)
+    assert not success and 'par' in message
+    success, tee_id = courses.add_tee(course_id, 'Rojas', 113, 70.0, 72)
+    assert success
+
+    # Al cambiar los pares del campo, sus salidas toman el nuevo par
+    pars = [3] + [4] * 17
+    success, _ = courses.update_course(course_id, 'Campo', 'Madrid', 113, 72.0, 71, pars, HANDICAPS)
+    assert success
+    assert courses.get_course(course_id).get_tee(tee_id).par_total == 71
+    db.connection.close()